@@ -2,99 +2,482 @@
 """
 Script para analisar e categorizar todos os console.logs no projeto
 """
+import argparse
+import functools
+import heapq
+import json
 import os
 import re
 from collections import defaultdict
 from pathlib import Path
 
+from feature_store import CONSOLE_METHODS, STORE_PATH as FEATURES_PATH, load_features
+from file_cache import FileCache, content_hash, make_cache_key
+from instrumentation import Profiler, add_profile_arguments
+from js_lexer import scan_console_calls
+from parallel import resolve_jobs, run_bounded, run_sharded
+from source_files import LineCounter, iter_source_files, open_bytes
+
 PROJECT_ROOT = Path("/home/ubuntu/github_repos/travel-hr-buddy")
 SRC_DIR = PROJECT_ROOT / "src"
 
 # Padrões para detectar console.*
 CONSOLE_PATTERN = re.compile(r'console\.(log|error|warn|info|debug|trace|table|dir|group|groupEnd)')
 
+# Versão da lógica de análise: incrementar invalida o cache junto com CONSOLE_PATTERN
+ANALYZER_VERSION = 2
+
+# Cache incremental de ocorrências por arquivo
+CACHE_PATH = PROJECT_ROOT / ".analysis-cache" / "console_analysis.json"
+
+def new_stats():
+    """Cria um acumulador de estatísticas vazio"""
+    return {
+        'by_type': defaultdict(int),
+        'by_directory': defaultdict(int),
+        'by_file': defaultdict(list),
+        'in_catch': 0,
+        'total': 0
+    }
+
 # Estatísticas
-stats = {
-    'by_type': defaultdict(int),
-    'by_directory': defaultdict(int),
-    'by_file': defaultdict(list),
-    'total': 0
-}
+stats = new_stats()
+
+# Tamanhos dos rankings exibidos no terminal
+TOP_DIRECTORIES = 15
+TOP_FILES = 10
 
 # Diretórios de produção prioritários
 PRODUCTION_DIRS = ['pages', 'components', 'modules', 'lib', 'utils', 'hooks', 'services', 'store']
 
-def analyze_file(file_path):
-    """Analisa um arquivo e encontra todos os console.*"""
+def cache_key():
+    """Chave do cache: muda sempre que o padrão ou a lógica de análise mudam"""
+    return make_cache_key(CONSOLE_PATTERN.pattern, str(ANALYZER_VERSION))
+
+def scan_text(text):
+    """
+    Retorna a lista de ocorrências de console.* do conteúdo de um arquivo
+
+    Só conta chamadas reais (fora de comentários, strings e regex), com o
+    flag in_catch calculado pela pilha de escopos e a função nomeada que
+    envolve a chamada.
+    """
+    occurrences = []
+    lines = LineCounter(text)
+    for call in scan_console_calls(text):
+        if not CONSOLE_PATTERN.fullmatch(f"console.{call.member}"):
+            continue
+        
+        # Números de linha calculados de forma incremental até cada chamada
+        line_num = lines.line_at(call.start)
+        line_start = text.rfind('\n', 0, call.start) + 1
+        line_end = text.find('\n', call.start)
+        if line_end == -1:
+            line_end = len(text)
+        
+        occurrences.append({
+            'line': line_num,
+            'type': call.member,
+            'content': text[line_start:line_end].strip(),
+            'in_catch': call.in_catch,
+            'function': call.function
+        })
+    return occurrences
+
+def record_occurrences(stats, rel_path, occurrences):
+    """Soma as ocorrências de um arquivo nas estatísticas"""
+    main_dir = directory_key(rel_path)
+    for occ in occurrences:
+        stats['by_type'][occ['type']] += 1
+        stats['total'] += 1
+        if occ['in_catch']:
+            stats['in_catch'] += 1
+        
+        # Diretório principal (src/pages, src/components, etc)
+        if main_dir:
+            stats['by_directory'][main_dir] += 1
+        
+        stats['by_file'][rel_path].append(occ)
+
+def read_occurrences(file_path, cached=None, hashed=True):
+    """
+    Lê um arquivo e devolve (hash, ocorrências de console.*)
+
+    Se `cached` (entrada anterior do cache) tiver o mesmo hash de conteúdo,
+    as ocorrências dele são reaproveitadas. Com hashed=False (nada vai para
+    o cache) o hash só é calculado se houver entrada para comparar; senão
+    volta None.
+    """
+    with open_bytes(file_path) as data:
+        if data.find(b'console.') == -1:
+            # Caminho rápido: a maioria dos arquivos não tem console.* e nem
+            # chega a ser decodificada; o hash só é pago se for para o cache
+            return (content_hash(data) if hashed else None), []
+        digest = content_hash(data) if hashed or cached else None
+        if cached and cached['hash'] == digest:
+            return digest, cached['value']
+        return digest, scan_text(data[:].decode('utf-8'))
+
+def analyze_file(file_path, stats=stats, cached=None, hashed=True):
+    """
+    Analisa um arquivo e encontra todos os console.*
+
+    Se `cached` (entrada anterior do cache) tiver o mesmo hash de conteúdo,
+    as ocorrências são reaproveitadas sem rodar o regex novamente.
+
+    Returns:
+        (hash, ocorrências) para atualizar o cache, ou None em caso de erro
+    """
+    rel_path = file_path.relative_to(PROJECT_ROOT).as_posix()
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-            
-        for line_num, line in enumerate(lines, 1):
-            matches = CONSOLE_PATTERN.finditer(line)
-            for match in matches:
-                console_type = match.group(1)
-                rel_path = file_path.relative_to(PROJECT_ROOT)
-                
-                # Verificar se está em bloco catch (contexto limitado)
-                in_catch = 'catch' in lines[max(0, line_num-5):line_num]
-                
-                stats['by_type'][console_type] += 1
-                stats['total'] += 1
-                
-                # Diretório principal (src/pages, src/components, etc)
-                parts = rel_path.parts
-                if len(parts) > 1:
-                    main_dir = f"{parts[0]}/{parts[1]}"
-                    stats['by_directory'][main_dir] += 1
-                
-                stats['by_file'][str(rel_path)].append({
-                    'line': line_num,
-                    'type': console_type,
-                    'content': line.strip(),
-                    'in_catch': in_catch
-                })
+        digest, occurrences = read_occurrences(file_path, cached, hashed)
     except Exception as e:
         print(f"Erro ao analisar {file_path}: {e}")
-
-def main():
-    print("🔍 Analisando console.* no projeto...\n")
+        return None
     
-    # Procurar todos os arquivos TypeScript/JavaScript
-    for ext in ['**/*.ts', '**/*.tsx', '**/*.js', '**/*.jsx']:
-        for file_path in SRC_DIR.glob(ext):
-            if 'node_modules' not in str(file_path):
-                analyze_file(file_path)
+    record_occurrences(stats, rel_path, occurrences)
+    return digest, occurrences
+
+def analyze_files(items, hashed=True):
+    """
+    Analisa uma fatia de arquivos e retorna as estatísticas parciais (worker)
+
+    Cada item é (arquivo, entrada do cache, entrada ainda válida?). Entradas
+    válidas são somadas direto; as demais são relidas e, se mudaram, reanalisadas.
+    Com hashed=False (--no-cache) os hashes não são calculados.
+
+    Returns:
+        (estatísticas parciais, [(arquivo, (hash, ocorrências)), ...] para o cache)
+    """
+    partial = new_stats()
+    updates = []
+    for file_path, entry, fresh in items:
+        if fresh:
+            record_occurrences(partial, file_path.relative_to(PROJECT_ROOT).as_posix(), entry['value'])
+            continue
+        result = analyze_file(file_path, partial, entry, hashed)
+        if result is not None:
+            updates.append((file_path, result))
+    return partial, updates
+
+def merge_stats(target, partial):
+    """
+    Soma estatísticas parciais no acumulador
+
+    As fatias são mescladas na ordem dos arquivos, então a ordem de inserção
+    das chaves (usada no desempate das ordenações) é a mesma da execução serial.
+    """
+    for console_type, count in partial['by_type'].items():
+        target['by_type'][console_type] += count
+    for directory, count in partial['by_directory'].items():
+        target['by_directory'][directory] += count
+    for file_path, occurrences in partial['by_file'].items():
+        target['by_file'][file_path].extend(occurrences)
+    target['in_catch'] += partial['in_catch']
+    target['total'] += partial['total']
+
+def directory_key(rel_path):
+    """Diretório principal (src/pages, src/components, etc) ou None"""
+    parts = rel_path.split('/')
+    if len(parts) > 1:
+        return f"{parts[0]}/{parts[1]}"
+    return None
+
+def new_stream_stats(top_k):
+    """
+    Acumulador do modo streaming: só contadores e um heap com os top-K arquivos
+
+    Não guarda ocorrências; o tamanho não cresce com o número de console.*.
+    """
+    return {
+        'by_type': defaultdict(int),
+        'by_directory': defaultdict(int),
+        'top_files': [],  # min-heap de (ocorrências, -ordem, arquivo)
+        'top_k': top_k,
+        'files_affected': 0,
+        'in_catch': 0,
+        'total': 0
+    }
+
+def record_stream(summary, rel_path, occurrences, out):
+    """Grava as ocorrências de um arquivo em JSON Lines e atualiza os contadores"""
+    if not occurrences:
+        return
+    main_dir = directory_key(rel_path)
+    for occ in occurrences:
+        out.write(json.dumps({'file': rel_path, **occ}, ensure_ascii=False))
+        out.write('\n')
+        summary['by_type'][occ['type']] += 1
+        if occ['in_catch']:
+            summary['in_catch'] += 1
+        if main_dir:
+            summary['by_directory'][main_dir] += 1
+    summary['total'] += len(occurrences)
     
-    # Imprimir estatísticas
+    # Cada arquivo chega uma única vez, então a contagem já é final; a ordem
+    # de chegada desempata como no sorted() estável do modo normal
+    summary['files_affected'] += 1
+    item = (len(occurrences), -summary['files_affected'], rel_path)
+    if len(summary['top_files']) < summary['top_k']:
+        heapq.heappush(summary['top_files'], item)
+    else:
+        heapq.heappushpop(summary['top_files'], item)
+
+def scan_files(paths):
+    """
+    Analisa uma fatia de arquivos no modo streaming (worker)
+
+    Returns:
+        [(caminho relativo, ocorrências), ...] na ordem dos arquivos
+    """
+    results = []
+    for file_path in paths:
+        try:
+            _, occurrences = read_occurrences(file_path, hashed=False)
+        except Exception as e:
+            print(f"Erro ao analisar {file_path}: {e}")
+            continue
+        results.append((file_path.relative_to(PROJECT_ROOT).as_posix(), occurrences))
+    return results
+
+def iter_stream_results(jobs):
+    """
+    Resultados por arquivo na ordem da varredura
+
+    No modo serial cada arquivo é processado e descartado antes do próximo.
+    Com jobs > 1 a varredura alimenta os workers sob demanda (run_bounded):
+    só uma janela de ~2 fatias por worker fica em andamento ou aguardando o
+    consumidor, então a memória não cresce com o tamanho da árvore.
+    """
+    if jobs <= 1:
+        for file_path in iter_source_files(SRC_DIR):
+            yield from scan_files([file_path])
+    else:
+        for results in run_bounded(scan_files, iter_source_files(SRC_DIR), jobs):
+            yield from results
+
+def print_summary(summary):
+    """Imprime o resumo no terminal a partir dos agregados"""
     print("=" * 80)
     print("📊 ESTATÍSTICAS DE CONSOLE.* NO PROJETO")
     print("=" * 80)
-    print(f"\n✨ Total de ocorrências: {stats['total']}\n")
+    print(f"\n✨ Total de ocorrências: {summary['total']}")
+    print(f"   Em blocos catch/finally: {summary['in_catch']}")
+    print(f"   Fora de catch: {summary['total'] - summary['in_catch']}\n")
     
     print("📈 Por tipo:")
-    for console_type, count in sorted(stats['by_type'].items(), key=lambda x: x[1], reverse=True):
+    for console_type, count in summary['by_type']:
         print(f"   console.{console_type}: {count}")
     
-    print("\n📁 Por diretório (top 15):")
-    sorted_dirs = sorted(stats['by_directory'].items(), key=lambda x: x[1], reverse=True)[:15]
-    for directory, count in sorted_dirs:
+    print(f"\n📁 Por diretório (top {TOP_DIRECTORIES}):")
+    for directory, count in summary['top_directories']:
         print(f"   {directory}: {count}")
     
-    print(f"\n📄 Total de arquivos afetados: {len(stats['by_file'])}")
+    print(f"\n📄 Total de arquivos afetados: {summary['files_affected']}")
     
     # Arquivos com mais console.*
-    print("\n🔥 Top 10 arquivos com mais console.*:")
-    sorted_files = sorted(stats['by_file'].items(), key=lambda x: len(x[1]), reverse=True)[:10]
-    for file_path, occurrences in sorted_files:
-        print(f"   {file_path}: {len(occurrences)} ocorrências")
+    print(f"\n🔥 Top {TOP_FILES} arquivos com mais console.*:")
+    for file_path, count in summary['top_files'][:TOP_FILES]:
+        print(f"   {file_path}: {count} ocorrências")
+
+def run_streaming(args, jobs):
+    """
+    Modo streaming: ocorrências vão direto para um arquivo JSON Lines
+
+    A memória fica limitada aos contadores e aos heaps de top-K; o relatório
+    em texto é montado só a partir desses agregados.
+    """
+    top_k = max(args.top, TOP_FILES)
+    summary = new_stream_stats(top_k)
+    jsonl_path = Path(args.stream)
+    
+    with open(jsonl_path, 'w', encoding='utf-8') as out:
+        for rel_path, occurrences in iter_stream_results(jobs):
+            record_stream(summary, rel_path, occurrences, out)
+    
+    # heapq.nlargest equivale a sorted(reverse=True)[:n], com o mesmo desempate
+    by_type = sorted(summary['by_type'].items(), key=lambda x: x[1], reverse=True)
+    by_directory = heapq.nlargest(top_k, summary['by_directory'].items(), key=lambda x: x[1])
+    top_files = [(path, count) for count, _, path in sorted(summary['top_files'], reverse=True)]
+    
+    print_summary({
+        'total': summary['total'],
+        'in_catch': summary['in_catch'],
+        'by_type': by_type,
+        'top_directories': by_directory[:TOP_DIRECTORIES],
+        'files_affected': summary['files_affected'],
+        'top_files': top_files
+    })
+    
+    report_path = PROJECT_ROOT / "console_analysis_report.txt"
+    with open(report_path, 'w', encoding='utf-8') as f:
+        f.write("RELATÓRIO DE CONSOLE.* NO PROJETO (MODO STREAMING)\n")
+        f.write("=" * 80 + "\n\n")
+        f.write(f"Total: {summary['total']} ocorrências em {summary['files_affected']} arquivos\n")
+        f.write(f"  Em blocos catch/finally: {summary['in_catch']}\n")
+        f.write(f"  Fora de catch: {summary['total'] - summary['in_catch']}\n")
+        f.write(f"Ocorrências detalhadas: {jsonl_path}\n\n")
+        
+        f.write("POR TIPO:\n")
+        for console_type, count in by_type:
+            f.write(f"  console.{console_type}: {count}\n")
+        
+        f.write(f"\n\nPOR DIRETÓRIO (top {top_k}):\n")
+        for directory, count in by_directory:
+            f.write(f"  {directory}: {count}\n")
+        
+        f.write(f"\n\nPOR ARQUIVO (top {top_k}):\n")
+        for file_path, count in top_files:
+            f.write(f"  {file_path}: {count} ocorrências\n")
+    
+    print(f"\n✅ Ocorrências salvas em: {jsonl_path}")
+    print(f"✅ Relatório resumido salvo em: {report_path}")
+
+def run_from_features(jobs):
+    """
+    Modo --features: resumo calculado só das colunas do store de features
+
+    O store é atualizado de forma incremental (só arquivos alterados são
+    relidos). Não há ocorrências individuais, só contagens por arquivo.
+    """
+    store, reused, reanalyzed = load_features(SRC_DIR, PROJECT_ROOT, jobs, PROJECT_ROOT / FEATURES_PATH)
+    print(f"♻️  Features: {reused} arquivos reaproveitados, {reanalyzed} relidos\n")
+    
+    console = store.columns['console']
+    per_file = console.sum(axis=1)
+    by_type = {
+        method: int(count) for method, count in zip(CONSOLE_METHODS, console.sum(axis=0)) if count
+    }
+    by_directory = defaultdict(int)
+    by_file = {}
+    for rel_path, count in zip(store.paths, per_file):
+        if not count:
+            continue
+        by_file[rel_path] = int(count)
+        main_dir = directory_key(rel_path)
+        if main_dir:
+            by_directory[main_dir] += int(count)
+    
+    print_summary({
+        'total': int(per_file.sum()),
+        'in_catch': int(store.columns['console_in_catch'].sum()),
+        'by_type': sorted(by_type.items(), key=lambda x: x[1], reverse=True),
+        'top_directories': heapq.nlargest(TOP_DIRECTORIES, by_directory.items(), key=lambda x: x[1]),
+        'files_affected': len(by_file),
+        'top_files': heapq.nlargest(TOP_FILES, by_file.items(), key=lambda x: x[1])
+    })
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Analisa e categoriza console.* em src/")
+    parser.add_argument(
+        '--jobs', '-j', type=int, default=1,
+        help="Processos paralelos (0 = todos os núcleos, padrão: 1)"
+    )
+    parser.add_argument(
+        '--no-cache', action='store_true',
+        help="Ignora o cache incremental e reanalisa todos os arquivos"
+    )
+    parser.add_argument(
+        '--clear-cache', action='store_true',
+        help="Descarta o cache antes de analisar (ex.: após mudar CONSOLE_PATTERN)"
+    )
+    parser.add_argument(
+        '--stream', metavar='ARQUIVO.jsonl',
+        help="Grava as ocorrências em JSON Lines conforme são encontradas, com "
+             "memória limitada (não usa o cache, que guarda todas as ocorrências)"
+    )
+    parser.add_argument(
+        '--top', type=int, default=100,
+        help="Arquivos e diretórios listados no relatório do modo --stream (padrão: 100)"
+    )
+    parser.add_argument(
+        '--features', action='store_true',
+        help="Só o resumo, calculado a partir do store de features por arquivo "
+             "(relê apenas arquivos alterados; requer numpy)"
+    )
+    add_profile_arguments(parser)
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    jobs = resolve_jobs(args.jobs)
+    profiler = Profiler.from_args(args, 'analyze_console_logs')
+    print("🔍 Analisando console.* no projeto...\n")
+    
+    if args.stream:
+        profiler.mark("streaming")
+        run_streaming(args, jobs)
+        profiler.finish()
+        return
+    
+    if args.features:
+        profiler.mark("store de features")
+        run_from_features(jobs)
+        profiler.finish()
+        return
+    
+    profiler.mark("varredura e consulta ao cache")
+    cache = FileCache(CACHE_PATH, cache_key())
+    if not args.no_cache and not args.clear_cache:
+        cache.load()
+    
+    # Procurar todos os arquivos TypeScript/JavaScript e consultar o cache (só stat)
+    items = []
+    file_stats = {}
+    for file_path in iter_source_files(SRC_DIR):
+        rel_path = file_path.relative_to(PROJECT_ROOT).as_posix()
+        try:
+            st = file_path.stat()
+        except OSError as e:
+            print(f"Erro ao analisar {file_path}: {e}")
+            continue
+        file_stats[rel_path] = st
+        entry = cache.lookup(rel_path, st)
+        if entry is not None:
+            items.append((file_path, entry, True))
+        else:
+            items.append((file_path, cache.stale(rel_path), False))
+    profiler.count(len(items))
+    
+    profiler.mark("análise")
+    # Cada worker devolve agregados parciais; o merge segue a ordem das fatias
+    reanalyzed = 0
+    # Com --no-cache nada é gravado: os workers não calculam hashes
+    worker = functools.partial(analyze_files, hashed=not args.no_cache)
+    for partial, updates in run_sharded(worker, items, jobs):
+        merge_stats(stats, partial)
+        for file_path, (digest, occurrences) in updates:
+            rel_path = file_path.relative_to(PROJECT_ROOT).as_posix()
+            cache.store(rel_path, file_stats[rel_path], digest, occurrences)
+            reanalyzed += 1
+    profiler.count(len(items))
+    
+    if not args.no_cache:
+        profiler.mark("gravação do cache")
+        cache.prune(file_stats)
+        cache.save()
+        print(f"♻️  Cache: {len(items) - reanalyzed} arquivos reaproveitados, {reanalyzed} relidos\n")
+    
+    # Imprimir estatísticas
+    profiler.mark("resumo e relatório")
+    print_summary({
+        'total': stats['total'],
+        'in_catch': stats['in_catch'],
+        'by_type': sorted(stats['by_type'].items(), key=lambda x: x[1], reverse=True),
+        'top_directories': heapq.nlargest(TOP_DIRECTORIES, stats['by_directory'].items(), key=lambda x: x[1]),
+        'files_affected': len(stats['by_file']),
+        'top_files': [(path, len(occs)) for path, occs in
+                      heapq.nlargest(TOP_FILES, stats['by_file'].items(), key=lambda x: len(x[1]))]
+    })
     
     # Salvar relatório detalhado
     report_path = PROJECT_ROOT / "console_analysis_report.txt"
     with open(report_path, 'w', encoding='utf-8') as f:
         f.write("RELATÓRIO DETALHADO DE CONSOLE.* NO PROJETO\n")
         f.write("=" * 80 + "\n\n")
-        f.write(f"Total: {stats['total']} ocorrências\n\n")
+        f.write(f"Total: {stats['total']} ocorrências\n")
+        f.write(f"  Em blocos catch/finally: {stats['in_catch']}\n")
+        f.write(f"  Fora de catch: {stats['total'] - stats['in_catch']}\n\n")
         
         f.write("POR TIPO:\n")
         for console_type, count in sorted(stats['by_type'].items(), key=lambda x: x[1], reverse=True):
@@ -108,11 +491,15 @@ def main():
         for file_path, occurrences in sorted(stats['by_file'].items(), key=lambda x: len(x[1]), reverse=True):
             f.write(f"\n{file_path} ({len(occurrences)} ocorrências):\n")
             for occ in occurrences[:5]:  # Mostrar apenas as primeiras 5 de cada arquivo
-                f.write(f"  Linha {occ['line']}: console.{occ['type']} - {occ['content'][:80]}\n")
+                context = f" [{occ['function']}]" if occ['function'] else ""
+                if occ['in_catch']:
+                    context += " [catch]"
+                f.write(f"  Linha {occ['line']}: console.{occ['type']}{context} - {occ['content'][:80]}\n")
             if len(occurrences) > 5:
                 f.write(f"  ... e mais {len(occurrences) - 5} ocorrências\n")
     
     print(f"\n✅ Relatório detalhado salvo em: {report_path}")
+    profiler.finish()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""
+Store de backups endereçado por conteúdo, com journal por execução
+
+Antes de um script alterar, mover ou substituir um arquivo, o conteúdo
+original vira um blob em objects/<hash[:2]>/<hash>. Blobs iguais são
+guardados uma única vez. O blob é criado por reflink (cópia copy-on-write)
+ou, se o sistema de arquivos não suportar, por cópia.
+
+Hard link (só metadados, sem cópia) é usado apenas quando o chamador avisa
+que o caminho vai ser substituído por rename (write_text_atomic) e o inode
+antigo nunca mais será escrito: backup(path, replaced=True). Um arquivo que
+continua vivo em outro lugar (shutil.move) nunca é ligado ao blob, e o
+rollback restaura sempre por reflink ou cópia. Tamanho e mtime de cada blob
+são gravados na criação (<hash>.stat); um blob já existente só é relido e
+tem o hash conferido se o stat não confere. O journal também guarda tamanho
+e mtime, e o rollback recusa blobs que mudaram desde o backup.
+
+Cada execução grava um journal (JSON Lines) em journals/<execução>.jsonl:
+
+    {"op": "replace", "path": ..., "blob": ..., "size": ..., "mtime_ns": ..., "mode": ...}
+    {"op": "create", "path": ...}
+
+O rollback percorre o journal de trás para frente: 'replace' volta o blob
+para o caminho (link + rename) e 'create' remove o arquivo criado. O custo
+por arquivo é constante, independente do tamanho.
+
+Uso:
+    python scripts/backup_store.py list
+    python scripts/backup_store.py rollback [EXECUÇÃO]
+    python scripts/backup_store.py prune --keep 5
+"""
+
+import argparse
+import errno
+import json
+import os
+import shutil
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+from file_cache import content_hash
+
+try:
+    import fcntl
+except ImportError:  # fora do Linux/Unix: sem reflink
+    fcntl = None
+
+STORE_DIR = ".backup-store"
+
+# Tamanho e mtime do blob na criação, ao lado dele
+STAT_SUFFIX = ".stat"
+
+# ioctl do Linux que clona um arquivo (reflink) em btrfs, XFS, etc.
+FICLONE = 0x40049409
+
+
+def _reflink(src: str, dst: str) -> None:
+    """Clona src em dst (copy-on-write); OSError se o sistema de arquivos não suportar"""
+    if fcntl is None:
+        raise OSError(errno.EOPNOTSUPP, "reflink indisponível")
+    with open(src, 'rb') as source, open(dst, 'xb') as target:
+        try:
+            fcntl.ioctl(target.fileno(), FICLONE, source.fileno())
+        except OSError:
+            os.unlink(dst)
+            raise
+
+
+def link_or_copy(src: str, dst: str, hardlink: bool = False) -> str:
+    """
+    Cria dst com o conteúdo de src pelo meio mais barato disponível
+
+    Args:
+        hardlink: permite compartilhar o inode de src; só é seguro se src
+            nunca mais for escrito no lugar
+
+    Returns:
+        'reflink', 'hardlink' ou 'copy'
+    """
+    try:
+        _reflink(src, dst)
+        return 'reflink'
+    except OSError:
+        pass
+    if hardlink:
+        try:
+            os.link(src, dst)
+            return 'hardlink'
+        except OSError as e:
+            if e.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP, errno.EOPNOTSUPP):
+                raise
+    shutil.copy2(src, dst)
+    return 'copy'
+
+
+class BackupRun:
+    """
+    Uma execução de um script: cria blobs e registra as operações no journal
+
+    Só guarda caminhos, então pode ser passada para workers de outros
+    processos; cada linha do journal é gravada com uma única escrita em
+    modo append.
+    """
+
+    def __init__(self, store_dir: str, run_id: str):
+        self.store_dir = store_dir
+        self.run_id = run_id
+        self.journal_path = os.path.join(store_dir, 'journals', f"{run_id}.jsonl")
+
+    def _append(self, entry: dict) -> None:
+        line = (json.dumps(entry, ensure_ascii=False) + '\n').encode('utf-8')
+        fd = os.open(self.journal_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
+
+    def backup(self, path: str, data: Optional[bytes] = None, replaced: bool = False) -> str:
+        """
+        Guarda o conteúdo atual de `path` antes de ele ser alterado ou movido
+
+        Args:
+            data: conteúdo já lido pelo chamador (evita reler o arquivo para o hash)
+            replaced: `path` vai ser substituído por rename e o inode atual não
+                será mais escrito; permite criar o blob por hard link
+
+        Returns:
+            Hash do blob
+        """
+        path = os.fspath(path)
+        if data is None:
+            with open(path, 'rb') as f:
+                data = f.read()
+        digest = content_hash(data)
+        blob = blob_path(self.store_dir, digest)
+        st = _verified_stat(blob, digest)
+        if st is None:
+            os.makedirs(os.path.dirname(blob), exist_ok=True)
+            # Criado com outro nome e renomeado: outro worker nunca vê um blob pela metade
+            tmp_blob = f"{blob}.tmp-{os.getpid()}"
+            if os.path.lexists(tmp_blob):
+                os.unlink(tmp_blob)
+            link_or_copy(path, tmp_blob, hardlink=replaced)
+            os.replace(tmp_blob, blob)
+            st = os.stat(blob)
+            _record_stat(blob, st)
+        self._append({
+            'op': 'replace', 'path': path, 'blob': digest,
+            'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'mode': os.stat(path).st_mode & 0o7777,
+        })
+        return digest
+
+    def created(self, path: str) -> None:
+        """Registra um arquivo novo (o rollback o remove)"""
+        self._append({'op': 'create', 'path': os.fspath(path)})
+
+
+def blob_path(store_dir: str, digest: str) -> str:
+    return os.path.join(store_dir, 'objects', digest[:2], digest)
+
+
+def _record_stat(blob: str, st: os.stat_result) -> None:
+    tmp_path = f"{blob}{STAT_SUFFIX}.tmp-{os.getpid()}"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(f"{st.st_size} {st.st_mtime_ns}")
+    os.replace(tmp_path, blob + STAT_SUFFIX)
+
+
+def _verified_stat(blob: str, digest: str) -> Optional[os.stat_result]:
+    """
+    stat de um blob existente que ainda tem o conteúdo do hash
+
+    Se tamanho e mtime conferem com os gravados na criação, basta o stat;
+    senão o blob é relido. Um blob alterado no lugar é removido.
+
+    Returns:
+        stat do blob, ou None se ele não existe (ou foi removido)
+    """
+    try:
+        st = os.stat(blob)
+    except FileNotFoundError:
+        return None
+    try:
+        with open(blob + STAT_SUFFIX, 'r', encoding='utf-8') as f:
+            if f.read() == f"{st.st_size} {st.st_mtime_ns}":
+                return st
+    except OSError:
+        pass
+    with open(blob, 'rb') as f:
+        matches = content_hash(f.read()) == digest
+    if not matches:
+        os.unlink(blob)
+        return None
+    _record_stat(blob, st)
+    return st
+
+
+class BackupStore:
+    """Blobs por conteúdo + journals de cada execução"""
+
+    def __init__(self, store_dir: str = STORE_DIR):
+        self.store_dir = store_dir
+        self.journals_dir = os.path.join(store_dir, 'journals')
+
+    def start_run(self, command: str) -> BackupRun:
+        """Abre uma execução nova; o id é a data/hora (com sufixo se já existir)"""
+        os.makedirs(self.journals_dir, exist_ok=True)
+        base = datetime.now().strftime('%Y%m%d_%H%M%S')
+        run_id = base
+        suffix = 1
+        while True:
+            try:
+                fd = os.open(os.path.join(self.journals_dir, f"{run_id}.jsonl"),
+                             os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+                break
+            except FileExistsError:
+                suffix += 1
+                run_id = f"{base}_{suffix}"
+        header = {'run': run_id, 'command': command, 'started': datetime.now().isoformat(timespec='seconds')}
+        os.write(fd, (json.dumps(header, ensure_ascii=False) + '\n').encode('utf-8'))
+        os.close(fd)
+        return BackupRun(self.store_dir, run_id)
+
+    def runs(self) -> List[str]:
+        """Execuções registradas, da mais antiga para a mais recente"""
+        try:
+            names = os.listdir(self.journals_dir)
+        except OSError:
+            return []
+        return sorted(name[:-len('.jsonl')] for name in names if name.endswith('.jsonl'))
+
+    def read_journal(self, run_id: str) -> Iterator[dict]:
+        with open(os.path.join(self.journals_dir, f"{run_id}.jsonl"), 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def describe(self, run_id: str) -> Dict[str, object]:
+        """Cabeçalho, contagem de operações e se já houve rollback"""
+        info: Dict[str, object] = {'run': run_id, 'replace': 0, 'create': 0, 'rolled_back': None}
+        for entry in self.read_journal(run_id):
+            op = entry.get('op')
+            if op in ('replace', 'create'):
+                info[op] += 1
+            elif op == 'rollback':
+                info['rolled_back'] = entry['at']
+            elif 'command' in entry:
+                info.update(command=entry['command'], started=entry['started'])
+        return info
+
+    def rollback(self, run_id: str, force: bool = False) -> Dict[str, int]:
+        """
+        Desfaz uma execução (operações em ordem inversa)
+
+        Um blob cujo tamanho/mtime não confere com o journal foi alterado no
+        lugar depois do backup (hard link) e não é restaurado, a menos que
+        force=True.
+
+        Returns:
+            {'restored': n, 'removed': n, 'skipped': n}
+        """
+        entries = [entry for entry in self.read_journal(run_id) if entry.get('op') in ('replace', 'create')]
+        result = {'restored': 0, 'removed': 0, 'skipped': 0}
+        for entry in reversed(entries):
+            path = entry['path']
+            if entry['op'] == 'create':
+                try:
+                    os.unlink(path)
+                    result['removed'] += 1
+                except FileNotFoundError:
+                    pass
+                continue
+
+            blob = blob_path(self.store_dir, entry['blob'])
+            try:
+                st = os.stat(blob)
+            except FileNotFoundError:
+                print(f"  ❌ Blob ausente para {path}")
+                result['skipped'] += 1
+                continue
+            if not force and (st.st_size != entry['size'] or st.st_mtime_ns != entry['mtime_ns']):
+                print(f"  ⚠️  Blob de {path} mudou depois do backup (use --force para restaurar mesmo assim)")
+                result['skipped'] += 1
+                continue
+
+            directory = os.path.dirname(path) or '.'
+            os.makedirs(directory, exist_ok=True)
+            tmp_path = os.path.join(directory, f".tmp-restore-{os.getpid()}-{os.path.basename(path)}")
+            if os.path.lexists(tmp_path):
+                os.unlink(tmp_path)
+            # Nunca por hard link: editar ou dar chmod no arquivo restaurado alteraria o blob
+            link_or_copy(blob, tmp_path)
+            os.replace(tmp_path, path)
+            if (os.stat(path).st_mode & 0o7777) != entry['mode']:
+                os.chmod(path, entry['mode'])
+            result['restored'] += 1
+
+        run = BackupRun(self.store_dir, run_id)
+        run._append({'op': 'rollback', 'at': datetime.now().isoformat(timespec='seconds'), **result})
+        return result
+
+    def prune(self, keep: int) -> Dict[str, int]:
+        """Remove os journals mais antigos (mantém `keep`) e os blobs que ficaram sem referência"""
+        runs = self.runs()
+        dropped = runs[:-keep] if keep > 0 else runs
+        for run_id in dropped:
+            os.unlink(os.path.join(self.journals_dir, f"{run_id}.jsonl"))
+
+        referenced = {
+            entry['blob'] for run_id in self.runs() for entry in self.read_journal(run_id)
+            if entry.get('op') == 'replace'
+        }
+        removed = 0
+        objects_dir = os.path.join(self.store_dir, 'objects')
+        for prefix in (os.listdir(objects_dir) if os.path.isdir(objects_dir) else []):
+            for name in os.listdir(os.path.join(objects_dir, prefix)):
+                if name.endswith(STAT_SUFFIX):
+                    if name[:-len(STAT_SUFFIX)] not in referenced:
+                        os.unlink(os.path.join(objects_dir, prefix, name))
+                elif name not in referenced:
+                    os.unlink(os.path.join(objects_dir, prefix, name))
+                    removed += 1
+        return {'journals': len(dropped), 'blobs': removed}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Backups por conteúdo e rollback das execuções")
+    parser.add_argument('command', choices=['list', 'rollback', 'prune'],
+                        help="list = execuções registradas; rollback = desfaz uma execução; "
+                             "prune = remove execuções antigas e blobs sem uso")
+    parser.add_argument('run', nargs='?', help="Para rollback: id da execução (padrão: a mais recente)")
+    parser.add_argument('--store', default=STORE_DIR, help=f"Diretório do store (padrão: {STORE_DIR})")
+    parser.add_argument('--force', action='store_true',
+                        help="Restaura mesmo blobs alterados depois do backup")
+    parser.add_argument('--keep', type=int, default=10, help="Para prune: execuções mantidas (padrão: 10)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    store = BackupStore(args.store)
+    runs = store.runs()
+
+    if args.command == 'list':
+        if not runs:
+            print("Nenhuma execução registrada")
+        for run_id in runs:
+            info = store.describe(run_id)
+            status = f" (rollback em {info['rolled_back']})" if info['rolled_back'] else ""
+            print(f"  {run_id}  {info.get('command', '?'):<32} "
+                  f"{info['replace']} backups, {info['create']} criados{status}")
+    elif args.command == 'rollback':
+        run_id = args.run or (runs[-1] if runs else None)
+        if run_id not in runs:
+            print(f"❌ Execução não encontrada: {run_id}")
+            return
+        result = store.rollback(run_id, args.force)
+        print(f"↩️  {run_id}: {result['restored']} restaurados, {result['removed']} removidos, "
+              f"{result['skipped']} ignorados")
+    else:
+        result = store.prune(args.keep)
+        print(f"🧹 {result['journals']} execuções e {result['blobs']} blobs removidos")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark: analisador de console.* por tokens vs. passada de regex por linha
+
+Mede, sobre o mesmo corpus já carregado em memória, o custo da passada de
+regex linha a linha (implementação antiga de analyze_file) e o da varredura
+por tokens com pilha de escopos (scan_text). Falha (exit 1) se a varredura
+por tokens custar mais do que --max-ratio vezes a passada de regex.
+
+Uso:
+    python3 scripts/benchmarks/bench_console_analysis.py [--root src] [--repeat 5]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analyze_console_logs import CONSOLE_PATTERN, SRC_DIR, scan_text  # noqa: E402
+from source_files import iter_source_files  # noqa: E402
+
+
+def regex_pass(text):
+    """Passada antiga: regex em cada linha + janela de 5 linhas para 'catch'"""
+    lines = text.splitlines(True)
+    occurrences = []
+    for line_num, line in enumerate(lines, 1):
+        for match in CONSOLE_PATTERN.finditer(line):
+            in_catch = 'catch' in lines[max(0, line_num-5):line_num]
+            occurrences.append((line_num, match.group(1), line.strip(), in_catch))
+    return occurrences
+
+
+def best_time(func, texts, repeat):
+    """Melhor tempo (s) de `repeat` execuções de func sobre todo o corpus"""
+    best = float('inf')
+    found = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        found = sum(len(func(text)) for text in texts)
+        best = min(best, time.perf_counter() - start)
+    return best, found
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do analisador de console.*")
+    parser.add_argument('--root', default=str(SRC_DIR), help="Diretório do corpus (padrão: src/)")
+    parser.add_argument('--repeat', type=int, default=5, help="Repetições (usa o melhor tempo)")
+    parser.add_argument('--max-ratio', type=float, default=1.0,
+                        help="Razão máxima tokens/regex aceita (padrão: 1.0)")
+    args = parser.parse_args()
+
+    texts = []
+    for file_path in iter_source_files(args.root):
+        with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+            texts.append(f.read())
+    size_mb = sum(len(t) for t in texts) / (1024 * 1024)
+    print(f"📚 Corpus: {len(texts)} arquivos, {size_mb:.1f} MB ({args.root})\n")
+
+    regex_time, regex_found = best_time(regex_pass, texts, args.repeat)
+    lexer_time, lexer_found = best_time(scan_text, texts, args.repeat)
+    ratio = lexer_time / regex_time if regex_time else float('inf')
+
+    print(f"{'Passada':<22} {'Tempo (ms)':>12} {'MB/s':>10} {'Ocorrências':>12}")
+    print("-" * 60)
+    print(f"{'regex por linha':<22} {regex_time * 1000:>12.1f} {size_mb / regex_time:>10.1f} {regex_found:>12}")
+    print(f"{'tokens + escopos':<22} {lexer_time * 1000:>12.1f} {size_mb / lexer_time:>10.1f} {lexer_found:>12}")
+    print(f"\nRazão tokens/regex: {ratio:.2f} (máximo: {args.max_ratio:.2f})")
+
+    if ratio > args.max_ratio:
+        print("❌ Varredura por tokens mais cara que a passada de regex")
+        sys.exit(1)
+    print("✅ Varredura por tokens dentro do orçamento da passada de regex")
+
+
+if __name__ == "__main__":
+    main()
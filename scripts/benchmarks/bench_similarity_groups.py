@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Benchmark: agrupamento guloso O(n²) vs. blocagem + union-find
+
+Gera módulos sintéticos (caminhos em árvores de diretórios, nomes com
+sufixos de versão, tamanhos variados) com semente fixa e mede os dois modos
+de create-similarity-matrix.py. Também confere que o modo com blocagem é
+determinístico (mesmo resultado com a entrada embaralhada) e que não perde
+nenhum par que o modo guloso agrupou (recall).
+
+Uso:
+    python3 scripts/benchmarks/bench_similarity_groups.py [--sizes 1000,10000] [--thresholds 50,75]
+"""
+
+import argparse
+import importlib.util
+import os
+import random
+import sys
+import time
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRIPTS_DIR)
+
+# O nome do script tem hífen, então é carregado pelo caminho
+_spec = importlib.util.spec_from_file_location(
+    'similarity_matrix', os.path.join(SCRIPTS_DIR, 'create-similarity-matrix.py')
+)
+similarity_matrix = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(similarity_matrix)
+
+AREAS = ['pages', 'components', 'modules', 'features', 'services', 'hooks']
+TOPICS = ['fleet', 'crew', 'maritime', 'analytics', 'finance', 'safety', 'training',
+          'compliance', 'weather', 'logistics', 'maintenance', 'reports']
+NAMES = ['Dashboard', 'CommandCenter', 'Overview', 'Panel', 'Monitor', 'Hub',
+         'Manager', 'Tracker', 'Console', 'Center', 'Insights', 'Board']
+SUFFIXES = ['', '', '', '-v2', '-new', '-enhanced', '-professional', '-unified']
+
+
+def synthetic_modules(count, seed=42):
+    """Módulos no formato dos relatórios ({'path', 'lines'})"""
+    rng = random.Random(seed)
+    modules = []
+    for index in range(count):
+        depth = rng.randint(1, 3)
+        parts = ['src', rng.choice(AREAS)] + [rng.choice(TOPICS) for _ in range(depth)]
+        name = f"{rng.choice(TOPICS).title()}{rng.choice(NAMES)}{index % 97}{rng.choice(SUFFIXES)}"
+        modules.append({
+            'path': '/'.join(parts + [f"{name}.tsx"]),
+            'lines': rng.randint(20, 1500),
+        })
+    return modules
+
+
+def greedy_recall(greedy, blocked, threshold):
+    """
+    Fração dos pares casados pelo modo guloso que ficam no mesmo grupo com blocagem
+
+    Os pares casados são (semente, membro) acima do limiar. Grupos com o
+    mesmo nome base se fundem na mesma chave; nessa lista, um módulo abaixo
+    do limiar em relação à semente atual é uma nova semente.
+    """
+    group_of = {id(module): name for name, members in blocked.items() for module in members}
+    matched = found = 0
+    for members in greedy.values():
+        seed = members[0]
+        for module in members[1:]:
+            if similarity_matrix.calculate_similarity(seed, module) < threshold:
+                seed = module
+                continue
+            matched += 1
+            if id(module) in group_of and group_of.get(id(seed)) == group_of[id(module)]:
+                found += 1
+    return found / matched if matched else 1.0
+
+
+def timed(func, modules, threshold):
+    start = time.perf_counter()
+    groups = func(modules, threshold=threshold)
+    return time.perf_counter() - start, groups
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do agrupamento por similaridade")
+    parser.add_argument('--sizes', default="1000,10000",
+                        help="Quantidades de módulos, separadas por vírgula (padrão: 1000,10000)")
+    parser.add_argument('--thresholds', default="50,75",
+                        help="Limiares (padrão: 50,75). Com 50 o guloso absorve quase tudo em "
+                             "poucos grupos; com limiares altos ele se aproxima do O(n²)")
+    parser.add_argument('--skip-greedy-above', type=int, default=10000,
+                        help="Não roda o modo guloso acima deste tamanho (padrão: 10000)")
+    args = parser.parse_args()
+
+    print(f"{'Limiar':>6} {'Módulos':>8} {'Guloso (s)':>12} {'Blocos (s)':>12} {'Ganho':>8} "
+          f"{'Grupos g/b':>12} {'Recall':>8}")
+    print("-" * 72)
+    lost = []
+    for threshold in (float(t) for t in args.thresholds.split(',')):
+        for size in (int(s) for s in args.sizes.split(',')):
+            modules = synthetic_modules(size)
+
+            blocked_time, blocked = timed(similarity_matrix.find_similar_groups_blocked, modules, threshold)
+            shuffled = modules[:]
+            random.Random(7).shuffle(shuffled)
+            _, reshuffled = timed(similarity_matrix.find_similar_groups_blocked, shuffled, threshold)
+            if blocked != reshuffled:
+                print(f"❌ Resultado do modo com blocagem depende da ordem de entrada ({size} módulos)")
+                sys.exit(1)
+
+            if size <= args.skip_greedy_above:
+                greedy_time, greedy = timed(similarity_matrix.find_similar_groups, modules, threshold)
+                gain = f"{greedy_time / blocked_time:.0f}x"
+                recall = greedy_recall(greedy, blocked, threshold)
+                if recall < 1.0:
+                    lost.append((threshold, size, recall))
+                print(f"{threshold:>6.0f} {size:>8} {greedy_time:>12.2f} {blocked_time:>12.2f} {gain:>8} "
+                      f"{f'{len(greedy)}/{len(blocked)}':>12} {recall:>8.1%}")
+            else:
+                print(f"{threshold:>6.0f} {size:>8} {'-':>12} {blocked_time:>12.2f} {'-':>8} "
+                      f"{f'-/{len(blocked)}':>12} {'-':>8}")
+
+    print("\n✅ Modo com blocagem determinístico em todos os tamanhos")
+    if lost:
+        for threshold, size, recall in lost:
+            print(f"❌ Blocagem perdeu pares do modo guloso: limiar {threshold:.0f}, {size} módulos, recall {recall:.1%}")
+        sys.exit(1)
+    print("✅ Nenhum par do modo guloso perdido pela blocagem")
+
+
+if __name__ == "__main__":
+    main()
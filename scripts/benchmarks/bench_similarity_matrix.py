@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark: matriz de similaridade escalar vs. vetorizada (NumPy)
+
+Calcula a matriz completa com calculate_similarity par a par e com
+similarity_engine em blocos, e exige igualdade EXATA dos scores. Roda sobre
+módulos sintéticos e, se existir, sobre o relatório de dashboards.
+
+Uso:
+    python3 scripts/benchmarks/bench_similarity_matrix.py [--size 1500]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRIPTS_DIR)
+
+import numpy as np  # noqa: E402
+
+from bench_similarity_groups import similarity_matrix, synthetic_modules  # noqa: E402
+from similarity_engine import ModuleArrays, iter_similarity_blocks  # noqa: E402
+
+
+def scalar_matrix(modules):
+    return np.array([[similarity_matrix.calculate_similarity(a, b) for b in modules] for a in modules])
+
+
+def vector_matrix(modules, memory_mb):
+    arrays = ModuleArrays(modules)
+    matrix = np.empty((len(arrays), len(arrays)))
+    for start, block in iter_similarity_blocks(arrays, memory_mb):
+        matrix[start:start + len(block)] = block
+    return matrix
+
+
+def compare(label, modules, memory_mb):
+    start = time.perf_counter()
+    expected = scalar_matrix(modules)
+    scalar_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = vector_matrix(modules, memory_mb)
+    vector_time = time.perf_counter() - start
+
+    exact = np.array_equal(expected, actual)
+    print(f"{label:<24} {len(modules):>7} {scalar_time:>12.2f} {vector_time:>12.3f} "
+          f"{scalar_time / vector_time:>7.0f}x {'sim' if exact else 'NÃO':>8}")
+    return exact
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da matriz de similaridade vetorizada")
+    parser.add_argument('--size', type=int, default=1500, help="Módulos sintéticos (padrão: 1500)")
+    parser.add_argument('--memory-mb', type=int, default=8,
+                        help="Orçamento por bloco (pequeno para exercitar vários blocos)")
+    parser.add_argument('--report', default='dashboard_analysis_report.json',
+                        help="Relatório real opcional (padrão: dashboard_analysis_report.json)")
+    args = parser.parse_args()
+
+    print(f"{'Entrada':<24} {'Módulos':>7} {'Escalar (s)':>12} {'NumPy (s)':>12} {'Ganho':>8} {'Exato':>8}")
+    print("-" * 76)
+    exact = compare("sintético", synthetic_modules(args.size), args.memory_mb)
+    if os.path.exists(args.report):
+        with open(args.report, 'r') as f:
+            exact &= compare(os.path.basename(args.report)[:24], json.load(f).get('files', []), args.memory_mb)
+
+    if not exact:
+        print("\n❌ Scores vetorizados diferem da função escalar")
+        sys.exit(1)
+    print("\n✅ Scores idênticos à função escalar")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Suíte de benchmarks: a função principal de cada script sobre um corpus sintético
+
+Gera (ou reaproveita) um corpus com corpus.py e mede, para cada caso, o
+melhor tempo de --repeat execuções, a vazão (arquivos/s e MB/s) e o pico de
+memória alocada pelo Python (tracemalloc, em uma execução à parte, fora da
+medição de tempo). Casos que alteram arquivos rodam sobre uma cópia do
+corpus, refeita antes de cada execução.
+
+Os resultados são comparados com o baseline gravado (por tamanho de corpus):
+tempo ou pico de memória acima de baseline * (1 + --tolerance) é regressão,
+e o script sai com código 1.
+
+Uso:
+    python3 scripts/benchmarks/bench_suite.py --sizes 1000,10000
+    python3 scripts/benchmarks/bench_suite.py --sizes 1000 --save-baseline
+    python3 scripts/benchmarks/bench_suite.py --cases remove_console_from_file,migrate_file
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, SCRIPTS_DIR)
+
+import analyze_console_logs  # noqa: E402
+import fix_eslint_errors  # noqa: E402
+import remove_console_logs  # noqa: E402
+from backup_store import BackupStore  # noqa: E402
+from bench_similarity_groups import similarity_matrix  # noqa: E402
+from corpus import add_corpus_arguments, corpus_params, generate_corpus  # noqa: E402
+from migrate_to_unified_components import MigrationEngine, migrate_file  # noqa: E402
+
+BASELINE_PATH = os.path.join(BENCH_DIR, 'baseline.json')
+CORPUS_CACHE = os.path.join(os.path.dirname(SCRIPTS_DIR), '.analysis-cache', 'bench')
+
+DEFAULT_TOLERANCE = 0.25
+# Diferenças de memória abaixo disto (MB) não contam como regressão
+MIN_MEMORY_DELTA_MB = 1.0
+
+
+def run_read_occurrences(work_dir: str, files: List[str]) -> int:
+    for path in files:
+        analyze_console_logs.read_occurrences(Path(path))
+    return len(files)
+
+
+def run_remove_console(work_dir: str, files: List[str]) -> int:
+    # remove_console_from_file registra os caminhos relativos a PROJECT_ROOT
+    remove_console_logs.PROJECT_ROOT = Path(work_dir)
+    for path in files:
+        remove_console_logs.remove_console_from_file(Path(path))
+    return len(files)
+
+
+def run_apply_fixers(work_dir: str, files: List[str]) -> int:
+    names = tuple(fix_eslint_errors.FIXERS)
+    for path in files:
+        fix_eslint_errors.apply_fixers(path, names)
+    return len(files)
+
+
+def run_migrate_file(work_dir: str, files: List[str]) -> int:
+    engine = MigrationEngine.from_file(src_root=os.path.join(work_dir, 'src'))
+    backup = BackupStore(os.path.join(work_dir, '.backup-store')).start_run('bench')
+    for path in files:
+        migrate_file(path, engine, backup)
+    return len(files)
+
+
+def run_backup(work_dir: str, files: List[str]) -> int:
+    backup = BackupStore(os.path.join(work_dir, '.backup-store')).start_run('bench')
+    for path in files:
+        backup.backup(path)
+    return len(files)
+
+
+def report_modules(files: List[str]) -> List[dict]:
+    """Módulos no formato dos relatórios de dashboards/command centers"""
+    modules = []
+    for path in files:
+        name = os.path.basename(path).lower()
+        if 'dashboard' in name or 'center' in name:
+            with open(path, 'rb') as f:
+                modules.append({'path': path, 'lines': f.read().count(b'\n')})
+    return modules
+
+
+def run_groups_blocked(work_dir: str, files: List[str]) -> int:
+    modules = report_modules(files)
+    similarity_matrix.find_similar_groups_blocked(modules)
+    return len(modules)
+
+
+def run_groups_greedy(work_dir: str, files: List[str]) -> int:
+    modules = report_modules(files)
+    similarity_matrix.find_similar_groups(modules)
+    return len(modules)
+
+
+# nome do caso -> (função, altera arquivos?, lê o conteúdo dos arquivos (MB/s)?, limite de arquivos ou None)
+CASES: Dict[str, tuple] = {
+    'read_occurrences': (run_read_occurrences, False, True, None),
+    'remove_console_from_file': (run_remove_console, True, True, None),
+    'apply_fixers': (run_apply_fixers, True, True, None),
+    'migrate_file': (run_migrate_file, True, True, None),
+    'backup': (run_backup, True, True, None),
+    'find_similar_groups_blocked': (run_groups_blocked, False, False, None),
+    # O(n²): acima do limite o caso é pulado
+    'find_similar_groups': (run_groups_greedy, False, False, 10000),
+}
+
+
+def prepare(corpus_dir: str, work_dir: str, mutates: bool) -> List[str]:
+    """Arquivos do caso: os do corpus ou os de uma cópia nova em work_dir"""
+    root = corpus_dir
+    if mutates:
+        shutil.rmtree(work_dir, ignore_errors=True)
+        shutil.copytree(os.path.join(corpus_dir, 'src'), os.path.join(work_dir, 'src'))
+        root = work_dir
+    return sorted(
+        os.path.join(directory, name)
+        for directory, _, names in os.walk(os.path.join(root, 'src'))
+        for name in names
+    )
+
+
+def measure(func: Callable, corpus_dir: str, work_dir: str, mutates: bool, per_byte: bool, repeat: int) -> dict:
+    """Melhor tempo de `repeat` execuções e pico de memória de uma execução extra"""
+    best = float('inf')
+    items = 0
+    size = 0
+    for _ in range(repeat):
+        files = prepare(corpus_dir, work_dir, mutates)
+        size = sum(os.path.getsize(path) for path in files)
+        start = time.perf_counter()
+        items = func(work_dir if mutates else corpus_dir, files)
+        best = min(best, time.perf_counter() - start)
+
+    files = prepare(corpus_dir, work_dir, mutates)
+    tracemalloc.start()
+    func(work_dir if mutates else corpus_dir, files)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'seconds': round(best, 4),
+        'items': items,
+        'items_per_s': round(items / best, 1) if best else None,
+        'mb_per_s': round(size / (1024 * 1024) / best, 2) if best and per_byte else None,
+        'peak_mb': round(peak / (1024 * 1024), 2),
+    }
+
+
+def load_baseline(path: str) -> dict:
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def compare(result: dict, base: Optional[dict], tolerance: float) -> List[str]:
+    """Regressões do caso em relação ao baseline (lista vazia se estiver ok)"""
+    if not base:
+        return []
+    problems = []
+    if result['seconds'] > base['seconds'] * (1 + tolerance):
+        problems.append(f"tempo {result['seconds']:.3f}s > {base['seconds']:.3f}s")
+    if (result['peak_mb'] > base['peak_mb'] * (1 + tolerance)
+            and result['peak_mb'] - base['peak_mb'] > MIN_MEMORY_DELTA_MB):
+        problems.append(f"memória {result['peak_mb']:.1f} MB > {base['peak_mb']:.1f} MB")
+    return problems
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmarks dos scripts sobre um corpus sintético")
+    add_corpus_arguments(parser)
+    parser.set_defaults(files=None)
+    parser.add_argument('--sizes', default="1000",
+                        help="Tamanhos do corpus, separados por vírgula (padrão: 1000); --files tem prioridade")
+    parser.add_argument('--cases', default=','.join(CASES),
+                        help=f"Casos a rodar (padrão: todos: {', '.join(CASES)})")
+    parser.add_argument('--repeat', type=int, default=3, help="Repetições (usa o melhor tempo, padrão: 3)")
+    parser.add_argument('--corpus-dir', default=CORPUS_CACHE,
+                        help="Onde gerar/reaproveitar os corpora (padrão: .analysis-cache/bench)")
+    parser.add_argument('--baseline', default=BASELINE_PATH, help="Arquivo de baseline (padrão: baseline.json)")
+    parser.add_argument('--save-baseline', action='store_true', help="Grava os resultados como novo baseline")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help=f"Folga antes de acusar regressão (padrão: {DEFAULT_TOLERANCE * 100:.0f}%%)")
+    parser.add_argument('--json', help="Grava os resultados neste arquivo JSON")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    cases = [name.strip() for name in args.cases.split(',') if name.strip()]
+    unknown = [name for name in cases if name not in CASES]
+    if unknown:
+        print(f"❌ Casos desconhecidos: {', '.join(unknown)}")
+        sys.exit(2)
+    sizes = [args.files] if args.files else [int(s) for s in args.sizes.split(',')]
+
+    baseline = load_baseline(args.baseline)
+    results = {'python': platform.python_version(), 'machine': platform.machine(), 'corpora': {}}
+    regressions = []
+    work_root = tempfile.mkdtemp(prefix='bench-')
+    try:
+        for size in sizes:
+            params = dict(corpus_params(args), files=size)
+            corpus_dir = os.path.join(args.corpus_dir, f"corpus-{size}")
+            manifest = generate_corpus(corpus_dir, **params)
+            key = str(size)
+            base_corpus = baseline.get('corpora', {}).get(key, {})
+            if base_corpus and base_corpus.get('params') != params:
+                print(f"⚠️  Baseline de {size} arquivos usa outros parâmetros de corpus: sem comparação")
+                base_corpus = {}
+
+            print(f"\n📚 Corpus: {manifest['files']} arquivos, {manifest['bytes'] / (1024 * 1024):.1f} MB")
+            print(f"{'Caso':<30} {'Tempo (s)':>10} {'itens/s':>10} {'MB/s':>8} {'Pico MB':>8}  Baseline")
+            print("-" * 84)
+            corpus_results = {'params': params, 'cases': {}}
+            for name in cases:
+                func, mutates, per_byte, limit = CASES[name]
+                if limit is not None and size > limit:
+                    print(f"{name:<30} {'-':>10} (acima de {limit} arquivos)")
+                    continue
+                result = measure(func, corpus_dir, os.path.join(work_root, name), mutates, per_byte, args.repeat)
+                corpus_results['cases'][name] = result
+                base = base_corpus.get('cases', {}).get(name)
+                problems = compare(result, base, args.tolerance)
+                if problems:
+                    regressions.append(f"{name} ({size} arquivos): {'; '.join(problems)}")
+                status = "❌ " + "; ".join(problems) if problems else ("✅" if base else "-")
+                mb_per_s = f"{result['mb_per_s']:.1f}" if result['mb_per_s'] is not None else "-"
+                print(f"{name:<30} {result['seconds']:>10.3f} {result['items_per_s'] or 0:>10.0f} "
+                      f"{mb_per_s:>8} {result['peak_mb']:>8.1f}  {status}")
+            results['corpora'][key] = corpus_results
+    finally:
+        shutil.rmtree(work_root, ignore_errors=True)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.save_baseline:
+        baseline.setdefault('corpora', {}).update(results['corpora'])
+        baseline.update(python=results['python'], machine=results['machine'])
+        with open(args.baseline, 'w') as f:
+            json.dump(baseline, f, indent=2)
+        print(f"\n💾 Baseline gravado em {args.baseline}")
+
+    if regressions:
+        print(f"\n❌ {len(regressions)} regressões (tolerância {args.tolerance:.0%}):")
+        for line in regressions:
+            print(f"   - {line}")
+        sys.exit(1)
+    print("\n✅ Nenhuma regressão em relação ao baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Gerador determinístico de corpus TS/TSX para os benchmarks
+
+Produz N arquivos parecidos com os de src/: componentes React com hooks,
+handlers com try/catch, chamadas console.* (algumas em várias linhas),
+imports de Skeleton/NotificationCenter que têm regra em migration_rules.json
+e famílias de dashboards quase duplicados (-v2, -new, ...).
+
+Cada arquivo é gerado com uma semente própria (semente global + índice),
+então o corpus de 10k arquivos começa com os mesmos 1k arquivos do corpus
+de 1k. O manifesto corpus.json guarda os parâmetros: gerar de novo com os
+mesmos parâmetros não reescreve nada.
+
+Uso:
+    python3 scripts/benchmarks/corpus.py /tmp/corpus --files 10000
+    python3 scripts/benchmarks/corpus.py /tmp/corpus --files 1000 --console-density 5
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+from typing import Dict, List
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Versão do gerador: mudar o conteúdo gerado exige incrementar
+GENERATOR_VERSION = 1
+
+MANIFEST = 'corpus.json'
+
+DEFAULTS = {
+    'files': 1000,
+    'seed': 42,
+    'console_density': 2.0,   # chamadas console.* por arquivo (média)
+    'catch_density': 0.3,     # fração dos handlers com try/catch
+    'multiline_ratio': 0.2,   # fração das chamadas console.* em várias linhas
+    'import_density': 0.1,    # fração dos arquivos com import de Skeleton/NotificationCenter
+    'duplicate_ratio': 0.05,  # fração dos arquivos que são dashboards quase duplicados
+}
+
+AREAS = ['pages', 'components', 'modules', 'features', 'hooks', 'services']
+TOPICS = ['fleet', 'crew', 'maritime', 'analytics', 'finance', 'safety', 'training',
+          'compliance', 'weather', 'logistics', 'maintenance', 'reports']
+NAMES = ['Dashboard', 'CommandCenter', 'Overview', 'Panel', 'Monitor', 'Hub',
+         'Manager', 'Tracker', 'Console', 'Center', 'Insights', 'Board', 'Form', 'Table']
+SUFFIXES = ['-v2', '-new', '-enhanced', '-professional', '-unified', '-optimized']
+CONSOLE_METHODS = ['log', 'log', 'log', 'info', 'debug', 'warn', 'error', 'table']
+HOOKS = ['useState', 'useEffect', 'useMemo', 'useCallback', 'useRef']
+JSX_TAGS = ['div', 'section', 'Card', 'CardHeader', 'CardContent', 'Button', 'Badge', 'Table', 'form', 'Dialog']
+
+
+def _migration_imports() -> List[str]:
+    """Especificadores antigos de migration_rules.json (alvos do migrate_file)"""
+    with open(os.path.join(SCRIPTS_DIR, 'migration_rules.json'), 'r', encoding='utf-8') as f:
+        sets = json.load(f)['sets']
+    return [old for rule_set in sets for old in rule_set['rules']]
+
+
+def console_call(rng: random.Random, indent: str, options: dict, method: str = None) -> List[str]:
+    method = method or rng.choice(CONSOLE_METHODS)
+    message = f'"[{rng.choice(TOPICS)}] {rng.choice(["loaded", "updated", "failed", "state"])}"'
+    if rng.random() < options['multiline_ratio']:
+        return [
+            f"{indent}console.{method}(",
+            f"{indent}  {message},",
+            f"{indent}  {{ id, status: data?.status, count: items.length }}",
+            f"{indent});",
+        ]
+    return [f"{indent}console.{method}({message}, data);"]
+
+
+def handler(rng: random.Random, index: int, consoles: int, options: dict) -> List[str]:
+    """Uma função assíncrona do componente, com ou sem try/catch"""
+    lines = [f"  const handle{rng.choice(NAMES)}{index} = async (id: string) => {{"]
+    if rng.random() < options['catch_density']:
+        lines.append("    try {")
+        lines.append(f"      const data = await fetch(`/api/{rng.choice(TOPICS)}/${{id}}`).then((r) => r.json());")
+        for _ in range(max(0, consoles - 1)):
+            lines.extend(console_call(rng, "      ", options))
+        lines.append("      setItems(data.items ?? []);")
+        lines.append("    } catch (error) {")
+        if consoles:
+            lines.extend(console_call(rng, "      ", options, rng.choice(['error', 'warn', 'log'])))
+        lines.append("      setStatus(\"error\");")
+        lines.append("    }")
+    else:
+        lines.append(f"    const data = {{ id, status: \"{rng.choice(['idle', 'ready', 'busy'])}\" }};")
+        for _ in range(consoles):
+            lines.extend(console_call(rng, "    ", options))
+        lines.append("    setStatus(data.status);")
+    lines.append("  };")
+    lines.append("")
+    return lines
+
+
+def component_source(rng: random.Random, name: str, options: dict, migration_imports: List[str]) -> str:
+    """Código de um componente .tsx"""
+    hooks = sorted(set(rng.sample(HOOKS, rng.randint(2, len(HOOKS)))) | {'useState'})
+    lines = [
+        f'import React, {{ {", ".join(hooks)} }} from "react";',
+        'import { Card, CardContent, CardHeader } from "@/components/ui/card";',
+        'import { Button } from "@/components/ui/button";',
+    ]
+    if rng.random() < options['import_density']:
+        lines.append(f'import {{ Legacy }} from "{rng.choice(migration_imports)}";')
+    lines.extend(["", f"export const {name.replace('-', '_')} = () => {{",
+                  "  const [items, setItems] = useState<any[]>([]);",
+                  "  const [status, setStatus] = useState(\"idle\");", ""])
+
+    handlers = rng.randint(3, 10)
+    consoles = [0] * handlers
+    total = int(options['console_density'])
+    if rng.random() < options['console_density'] - total:
+        total += 1
+    for _ in range(total):
+        consoles[rng.randrange(handlers)] += 1
+    for index in range(handlers):
+        lines.extend(handler(rng, index, consoles[index], options))
+
+    lines.append("  return (")
+    lines.append('    <div className="space-y-4">')
+    for row in range(rng.randint(4, 20)):
+        tag = rng.choice(JSX_TAGS)
+        lines.append(f'      <{tag} key="{row}" className="p-{rng.randint(1, 6)}">{{items[{row}]?.name}}</{tag}>')
+    lines.extend(["    </div>", "  );", "};", "", f"export default {name.replace('-', '_')};", ""])
+    return "\n".join(lines)
+
+
+def near_duplicate(rng: random.Random, base: str) -> str:
+    """Variante de um dashboard: poucas linhas alteradas, removidas (só linhas JSX) ou acrescentadas"""
+    lines = []
+    for line in base.split("\n"):
+        roll = rng.random()
+        if roll < 0.03 and ' key="' in line:
+            continue
+        if roll < 0.06:
+            line = line.replace('"', "'")
+        lines.append(line)
+        if roll > 0.98:
+            lines.append("  // TODO: revisar")
+    return "\n".join(lines)
+
+
+def file_spec(seed: int, index: int, options: dict, migration_imports: List[str]):
+    """(caminho relativo, conteúdo) do arquivo `index`; não depende do total de arquivos"""
+    rng = random.Random(seed * 1_000_003 + index)
+    if rng.random() < options['duplicate_ratio']:
+        family = rng.randrange(20)
+        family_rng = random.Random(f"{seed}:dashboard:{family}")
+        topic = TOPICS[family % len(TOPICS)]
+        base_name = f"{topic.title()}Dashboard{family}"
+        base = component_source(family_rng, base_name, options, migration_imports)
+        name = f"{base_name}{rng.choice(SUFFIXES)}"
+        rel_path = f"src/{rng.choice(['pages', 'components', 'modules'])}/{topic}/{name}-{index}.tsx"
+        return rel_path, near_duplicate(rng, base)
+
+    area = rng.choice(AREAS)
+    parts = ['src', area] + [rng.choice(TOPICS) for _ in range(rng.randint(1, 3))]
+    name = f"{rng.choice(TOPICS).title()}{rng.choice(NAMES)}{index}"
+    extension = '.ts' if area in ('hooks', 'services') else '.tsx'
+    return '/'.join(parts + [name + extension]), component_source(rng, name, options, migration_imports)
+
+
+def read_manifest(out_dir: str) -> dict:
+    try:
+        with open(os.path.join(out_dir, MANIFEST), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def generate_corpus(out_dir: str, **params) -> Dict[str, object]:
+    """
+    Gera o corpus em out_dir (ou reaproveita, se o manifesto tiver os mesmos parâmetros)
+
+    Returns:
+        Manifesto: parâmetros, versão, arquivos e bytes
+    """
+    options = dict(DEFAULTS)
+    unknown = set(params) - set(options)
+    if unknown:
+        raise ValueError(f"Parâmetros desconhecidos: {', '.join(sorted(unknown))}")
+    options.update(params)
+    manifest = read_manifest(out_dir)
+    if manifest.get('version') == GENERATOR_VERSION and manifest.get('params') == options:
+        return manifest
+
+    # Só apaga diretórios que são corpus gerados (têm manifesto) ou estão vazios
+    if os.path.isdir(out_dir) and os.listdir(out_dir) and not manifest:
+        raise ValueError(f"{out_dir} não está vazio e não é um corpus gerado")
+    shutil.rmtree(out_dir, ignore_errors=True)
+    migration_imports = _migration_imports()
+    total_bytes = 0
+    for index in range(options['files']):
+        rel_path, content = file_spec(options['seed'], index, options, migration_imports)
+        path = os.path.join(out_dir, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        data = content.encode('utf-8')
+        with open(path, 'wb') as f:
+            f.write(data)
+        total_bytes += len(data)
+
+    manifest = {'version': GENERATOR_VERSION, 'params': options, 'files': options['files'], 'bytes': total_bytes}
+    with open(os.path.join(out_dir, MANIFEST), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def add_corpus_arguments(parser: argparse.ArgumentParser) -> None:
+    """Parâmetros do gerador como opções de linha de comando (--files, --seed, ...)"""
+    parser.add_argument('--files', type=int, default=DEFAULTS['files'],
+                        help=f"Quantidade de arquivos (padrão: {DEFAULTS['files']})")
+    parser.add_argument('--seed', type=int, default=DEFAULTS['seed'], help="Semente (padrão: 42)")
+    for key in ('console_density', 'catch_density', 'multiline_ratio', 'import_density', 'duplicate_ratio'):
+        parser.add_argument(f"--{key.replace('_', '-')}", type=float, default=DEFAULTS[key],
+                            help=f"(padrão: {DEFAULTS[key]})")
+
+
+def corpus_params(args: argparse.Namespace) -> dict:
+    return {key: getattr(args, key) for key in DEFAULTS}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera um corpus TS/TSX sintético e determinístico")
+    parser.add_argument('out_dir', help="Diretório de saída (vazio ou corpus anterior, que é recriado)")
+    add_corpus_arguments(parser)
+    args = parser.parse_args()
+
+    manifest = generate_corpus(args.out_dir, **corpus_params(args))
+    print(f"✅ {manifest['files']} arquivos, {manifest['bytes'] / (1024 * 1024):.1f} MB em {args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
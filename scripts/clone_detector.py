@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""
+Detector de código duplicado (clones) por winnowing em src/
+
+Cada arquivo vira uma sequência de tokens normalizados (sem comentários,
+literais trocados por marcadores). Sobre ela são calculados hashes rolantes
+de K tokens e, por winnowing, o menor hash de cada janela de W hashes vira
+uma impressão digital. Qualquer trecho repetido com pelo menos K + W - 1
+tokens compartilha ao menos uma impressão.
+
+As impressões de cada arquivo ficam em cache pelo hash do conteúdo e o
+índice invertido (impressão -> locais) é montado a partir desse cache, então
+`report` e `query` não varrem a árvore.
+
+Uso:
+    python scripts/clone_detector.py build -j 0          # indexa (paralelo) e gera o relatório
+    python scripts/clone_detector.py report --min-lines 20
+    python scripts/clone_detector.py query src/pages/Dashboard.tsx:40-90
+"""
+
+import argparse
+import hashlib
+import json
+import time
+from collections import Counter, defaultdict, deque
+from functools import partial
+from typing import Dict, List, Optional, Tuple
+
+from file_cache import FileCache, content_hash, make_cache_key
+from js_lexer import NAME, NUMBER, REGEX, STRING, TEMPLATE, tokenize
+from parallel import resolve_jobs, run_sharded
+from source_files import LineCounter, SOURCE_EXTENSIONS, iter_source_files, open_bytes
+
+# Versão das impressões: incrementar invalida o cache
+CLONE_VERSION = 1
+
+# Tamanho do k-grama e da janela: trechos com K + W - 1 = 44 tokens (~8 linhas)
+# ou mais são sempre detectados
+KGRAM_SIZE = 25
+WINDOW_SIZE = 20
+
+# Impressões presentes em mais arquivos que isso (boilerplate de imports etc.) são ignoradas
+MAX_FILES_PER_PRINT = 500
+
+# Fração mínima de impressões em comum para duas regiões serem cópias uma da outra
+MIN_SHARED_RATIO = 0.5
+
+CACHE_PATH = ".analysis-cache/clone_fingerprints.json"
+REPORT_PATH = "clone_report.json"
+
+_MODULUS = (1 << 61) - 1
+_BASE = 1_000_003
+
+# Literais viram marcadores: cópias com textos/números diferentes continuam iguais
+_LITERAL_MARKERS = {NUMBER: '0', STRING: '""', TEMPLATE: '``', REGEX: '//'}
+
+# Palavras reservadas preservadas quando os identificadores são normalizados
+_KEYWORDS = frozenset({
+    'async', 'await', 'break', 'case', 'catch', 'class', 'const', 'continue', 'default',
+    'delete', 'do', 'else', 'export', 'extends', 'false', 'finally', 'for', 'from',
+    'function', 'if', 'import', 'in', 'instanceof', 'interface', 'let', 'new', 'null',
+    'return', 'super', 'switch', 'this', 'throw', 'true', 'try', 'type', 'typeof',
+    'undefined', 'var', 'void', 'while', 'yield',
+})
+
+# Impressão: (hash, índice do token inicial, linha inicial, linha final)
+Fingerprint = Tuple[int, int, int, int]
+
+
+def normalized_values(tokens, normalize_identifiers: bool = False) -> List[str]:
+    """Valores dos tokens com literais (e, opcionalmente, identificadores) normalizados"""
+    if normalize_identifiers:
+        return [
+            '$' if tok.kind == NAME and tok.value not in _KEYWORDS
+            else _LITERAL_MARKERS.get(tok.kind, tok.value)
+            for tok in tokens
+        ]
+    return [_LITERAL_MARKERS.get(tok.kind, tok.value) for tok in tokens]
+
+
+def winnow(hashes: List[int], window: int = WINDOW_SIZE) -> List[int]:
+    """
+    Índices selecionados por winnowing robusto
+
+    Em cada janela fica o menor hash (o mais à direita em empates); índices
+    repetidos entre janelas consecutivas são registrados uma única vez.
+    """
+    if not hashes:
+        return []
+    if len(hashes) < window:
+        best = min(range(len(hashes)), key=lambda i: (hashes[i], -i))
+        return [best]
+
+    selected = []
+    candidates = deque()  # índices com hashes crescentes
+    for index, value in enumerate(hashes):
+        while candidates and hashes[candidates[-1]] >= value:
+            candidates.pop()
+        candidates.append(index)
+        if candidates[0] <= index - window:
+            candidates.popleft()
+        if index >= window - 1 and (not selected or selected[-1] != candidates[0]):
+            selected.append(candidates[0])
+    return selected
+
+
+def fingerprints(text: str, normalize_identifiers: bool = False) -> List[Fingerprint]:
+    """Impressões digitais (winnowing sobre hashes rolantes de K tokens) de um arquivo"""
+    tokens = tokenize(text)
+    if len(tokens) < KGRAM_SIZE:
+        return []
+
+    values = normalized_values(tokens, normalize_identifiers)
+    token_ids = {
+        value: int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest(), 'little')
+        for value in set(values)
+    }
+    ids = [token_ids[value] for value in values]
+
+    # Hash rolante (Rabin-Karp) de cada k-grama
+    high = pow(_BASE, KGRAM_SIZE - 1, _MODULUS)
+    rolling = 0
+    for token_id in ids[:KGRAM_SIZE]:
+        rolling = (rolling * _BASE + token_id) % _MODULUS
+    kgram_hashes = [rolling]
+    for outgoing, incoming in zip(ids, ids[KGRAM_SIZE:]):
+        rolling = ((rolling - outgoing * high) * _BASE + incoming) % _MODULUS
+        kgram_hashes.append(rolling)
+
+    # Linhas só das impressões selecionadas (índices crescentes)
+    starts = LineCounter(text)
+    ends = LineCounter(text)
+    result = []
+    for index in winnow(kgram_hashes):
+        last = tokens[index + KGRAM_SIZE - 1]
+        result.append((kgram_hashes[index], index, starts.line_at(tokens[index].start), ends.line_at(last.end - 1)))
+    return result
+
+
+def fingerprint_files(items, normalize_identifiers):
+    """
+    Impressões de uma fatia de arquivos (worker)
+
+    Cada item é (arquivo, entrada antiga do cache); se o hash não mudou, as
+    impressões antigas são reaproveitadas.
+    """
+    results = []
+    for filepath, cached in items:
+        try:
+            with open_bytes(filepath) as data:
+                digest = content_hash(data)
+                if cached and cached['hash'] == digest:
+                    results.append((filepath, digest, cached['value']))
+                    continue
+                text = data[:].decode('utf-8')
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"  ❌ Erro ao indexar {filepath}: {e}")
+            continue
+        results.append((filepath, digest, fingerprints(text, normalize_identifiers)))
+    return results
+
+
+def cache_key(normalize_identifiers: bool) -> str:
+    return make_cache_key(str(CLONE_VERSION), str(KGRAM_SIZE), str(WINDOW_SIZE), str(normalize_identifiers))
+
+
+def build_index(src_root: str = "src", jobs: int = 1, normalize_identifiers: bool = False,
+                cache_path: str = CACHE_PATH) -> Tuple[int, int]:
+    """
+    Atualiza as impressões de src/ em uma passada paralela (só arquivos alterados)
+
+    Returns:
+        (arquivos reaproveitados, arquivos reindexados)
+    """
+    cache = FileCache(cache_path, cache_key(normalize_identifiers)).load()
+    pending = []
+    file_stats = {}
+    for path in iter_source_files(src_root, SOURCE_EXTENSIONS):
+        filepath = path.as_posix()
+        try:
+            st = path.stat()
+        except OSError:
+            continue
+        file_stats[filepath] = st
+        if cache.lookup(filepath, st) is None:
+            pending.append((filepath, cache.stale(filepath)))
+
+    worker = partial(fingerprint_files, normalize_identifiers=normalize_identifiers)
+    for results in run_sharded(worker, pending, jobs):
+        for filepath, digest, prints in results:
+            cache.store(filepath, file_stats[filepath], digest, prints)
+
+    cache.prune(file_stats)
+    cache.save()
+    return len(file_stats) - len(pending), len(pending)
+
+
+class CloneIndex:
+    """Índice invertido impressão -> locais, montado só a partir do cache"""
+
+    def __init__(self, normalize_identifiers: bool = False, cache_path: str = CACHE_PATH):
+        cache = FileCache(cache_path, cache_key(normalize_identifiers)).load()
+        self.files = sorted(cache.entries)
+        self.prints: Dict[str, List[Fingerprint]] = {
+            filepath: [tuple(fp) for fp in cache.entries[filepath]['value']] for filepath in self.files
+        }
+        # hash -> [(arquivo, posição da impressão no arquivo), ...]
+        self.postings: Dict[int, List[Tuple[str, int]]] = defaultdict(list)
+        for filepath in self.files:
+            for position, (value, _, _, _) in enumerate(self.prints[filepath]):
+                self.postings[value].append((filepath, position))
+        # Impressões que aparecem em mais de um arquivo (e não são onipresentes)
+        self.shared = {
+            value for value, locations in self.postings.items()
+            if len(locations) > 1 and 1 < len({filepath for filepath, _ in locations}) <= MAX_FILES_PER_PRINT
+        }
+
+    def regions(self):
+        """
+        Regiões duplicadas de cada arquivo
+
+        Impressões compartilhadas vizinhas (até uma janela de distância) são
+        unidas em uma região contínua.
+
+        Yields:
+            (arquivo, linha inicial, linha final, [hashes da região])
+        """
+        for filepath in self.files:
+            run = []
+            last_token = None
+            for value, token, start_line, end_line in self.prints[filepath]:
+                if value not in self.shared:
+                    continue
+                if run and token - last_token > WINDOW_SIZE:
+                    yield self._region(filepath, run)
+                    run = []
+                run.append((value, start_line, end_line))
+                last_token = token
+            if run:
+                yield self._region(filepath, run)
+
+    @staticmethod
+    def _region(filepath, run):
+        return filepath, run[0][1], max(end for _, _, end in run), [value for value, _, _ in run]
+
+    def clone_classes(self, min_lines: int = 10, min_copies: int = 2) -> List[dict]:
+        """
+        Agrupa regiões que são cópias umas das outras
+
+        As maiores regiões viram sementes; cada semente reúne as regiões ainda
+        livres que compartilham com ela pelo menos MIN_SHARED_RATIO das
+        impressões da menor das duas. Sem transitividade, regiões parecidas
+        com regiões diferentes não se juntam em cadeia.
+
+        Returns:
+            Classes ordenadas por (cópias × linhas), com arquivo e intervalo de linhas
+        """
+        regions = [
+            (filepath, start, end, set(values))
+            for filepath, start, end, values in self.regions()
+            if end - start + 1 >= min_lines
+        ]
+        regions.sort(key=lambda r: (-len(r[3]), r[0], r[1]))
+        by_hash = defaultdict(list)
+        for index, (_, _, _, values) in enumerate(regions):
+            for value in values:
+                by_hash[value].append(index)
+
+        assigned = set()
+        result = []
+        for seed, (_, _, _, seed_values) in enumerate(regions):
+            if seed in assigned:
+                continue
+            shared = Counter()
+            for value in seed_values:
+                for other in by_hash[value]:
+                    if other != seed and other not in assigned:
+                        shared[other] += 1
+            copies = [seed] + sorted(
+                other for other, count in shared.items()
+                if count >= MIN_SHARED_RATIO * min(len(seed_values), len(regions[other][3]))
+            )
+            if len({regions[index][0] for index in copies}) < min_copies:
+                continue
+            assigned.update(copies)
+            locations = sorted((regions[index][0], regions[index][1], regions[index][2]) for index in copies)
+            result.append({
+                'copies': len(copies),
+                'lines': max(end - start + 1 for _, start, end in locations),
+                'locations': [
+                    {'file': filepath, 'start_line': start, 'end_line': end}
+                    for filepath, start, end in locations
+                ],
+            })
+        result.sort(key=lambda c: (-c['copies'] * c['lines'], c['locations'][0]['file']))
+        return result
+
+    def query(self, filepath: str, start_line: Optional[int] = None, end_line: Optional[int] = None):
+        """
+        Outros locais que compartilham impressões com um arquivo (ou trecho dele)
+
+        Returns:
+            [(arquivo, linha inicial, linha final, impressões em comum), ...]
+        """
+        matches = defaultdict(list)
+        for value, _, first, last in self.prints.get(filepath, []):
+            if start_line is not None and (last < start_line or first > end_line):
+                continue
+            if value not in self.shared:
+                continue
+            for other_file, position in self.postings[value]:
+                if other_file == filepath and start_line is None:
+                    continue
+                _, _, other_start, other_end = self.prints[other_file][position]
+                if other_file == filepath and other_start <= end_line and other_end >= start_line:
+                    continue
+                matches[other_file].append((other_start, other_end))
+        return sorted(
+            ((other, min(s for s, _ in spans), max(e for _, e in spans), len(spans))
+             for other, spans in matches.items()),
+            key=lambda m: (-m[3], m[0])
+        )
+
+
+def parse_location(location: str):
+    """arquivo[:início-fim] -> (arquivo, início, fim)"""
+    filepath, _, line_range = location.partition(':')
+    if not line_range:
+        return filepath, None, None
+    start, _, end = line_range.partition('-')
+    return filepath, int(start), int(end or start)
+
+
+def print_classes(classes, top):
+    print(f"\n🔁 {len(classes)} trechos duplicados (top {min(top, len(classes))}):")
+    for clone in classes[:top]:
+        print(f"\n  {clone['copies']} cópias, ~{clone['lines']} linhas:")
+        for location in clone['locations'][:10]:
+            print(f"     - {location['file']}:{location['start_line']}-{location['end_line']}")
+        if len(clone['locations']) > 10:
+            print(f"     ... e mais {len(clone['locations']) - 10}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Detecta trechos de código duplicados em src/")
+    parser.add_argument('command', choices=['build', 'report', 'query'],
+                        help="build = indexa e gera o relatório; report = só o relatório; "
+                             "query = cópias de um arquivo[:início-fim]")
+    parser.add_argument('location', nargs='?', help="Para query: arquivo[:início-fim]")
+    parser.add_argument('--src', default="src", help="Diretório raiz (padrão: src)")
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help="Processos paralelos no build (0 = todos os núcleos, padrão: 1)")
+    parser.add_argument('--normalize-identifiers', action='store_true',
+                        help="Também troca identificadores por um marcador (pega cópias com nomes renomeados)")
+    parser.add_argument('--min-lines', type=int, default=10, help="Tamanho mínimo do trecho (padrão: 10)")
+    parser.add_argument('--min-copies', type=int, default=2, help="Cópias mínimas (padrão: 2)")
+    parser.add_argument('--top', type=int, default=20, help="Trechos exibidos no terminal (padrão: 20)")
+    parser.add_argument('--out', default=REPORT_PATH, help=f"Relatório JSON (padrão: {REPORT_PATH})")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    if args.command == 'build':
+        start = time.perf_counter()
+        reused, reindexed = build_index(args.src, resolve_jobs(args.jobs), args.normalize_identifiers)
+        print(f"🗂️  Impressões: {reused} arquivos reaproveitados, {reindexed} reindexados "
+              f"({time.perf_counter() - start:.2f}s)")
+
+    start = time.perf_counter()
+    index = CloneIndex(args.normalize_identifiers)
+    if not index.files:
+        print("⚠️  Índice vazio: rode 'build' primeiro")
+        return
+
+    if args.command == 'query':
+        if not args.location:
+            print("❌ Informe arquivo[:início-fim]")
+            return
+        filepath, start_line, end_line = parse_location(args.location)
+        matches = index.query(filepath, start_line, end_line)
+        print(f"🔎 {args.location}: {len(matches)} arquivos com trechos em comum "
+              f"({(time.perf_counter() - start) * 1000:.0f} ms)")
+        for other, first, last, shared in matches[:args.top]:
+            print(f"   {other}:{first}-{last} ({shared} impressões)")
+        return
+
+    classes = index.clone_classes(args.min_lines, args.min_copies)
+    print_classes(classes, args.top)
+    with open(args.out, 'w', encoding='utf-8') as f:
+        json.dump({
+            'kgram_size': KGRAM_SIZE,
+            'window_size': WINDOW_SIZE,
+            'normalize_identifiers': args.normalize_identifiers,
+            'min_lines': args.min_lines,
+            'files_indexed': len(index.files),
+            'clones': classes,
+        }, f, indent=2, ensure_ascii=False)
+    print(f"\n✅ Relatório salvo em: {args.out} ({time.perf_counter() - start:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,10 +4,21 @@ FASE B - Criação de Matriz de Similaridade
 Script para gerar matriz de similaridade entre módulos redundantes
 """
 
+import argparse
 import json
 import os
 from collections import defaultdict
-from typing import Dict, List, Set
+from typing import Dict, Iterator, List, Set, Tuple
+
+from feature_store import load_features
+from instrumentation import Profiler, add_profile_arguments
+from inventory import build_inventory, write_reports
+from minhash import compute_signatures, estimated_jaccard, lsh_buckets
+from parallel import resolve_jobs
+from similarity_store import STORE_DIR, save_store
+
+# Níveis de diretório que formam um bloco de candidatos (ex.: src/components/fleet)
+BLOCK_PREFIX_DEPTH = 3
 
 def load_json_report(filename: str) -> dict:
     """Carrega relatório JSON"""
@@ -45,6 +56,11 @@ def calculate_similarity(module1: dict, module2: dict) -> float:
         similarity_score += path_similarity
         factors += 1
     
+    # Fator 3: similaridade de conteúdo (Jaccard estimado por MinHash), se disponível
+    if module1.get('minhash') and module2.get('minhash'):
+        similarity_score += estimated_jaccard(module1['minhash'], module2['minhash']) * 100
+        factors += 1
+    
     # Retornar média de todos os fatores
     return similarity_score / factors if factors > 0 else 0.0
 
@@ -88,8 +104,235 @@ def find_similar_groups(modules: List[dict], threshold: float = 60.0) -> Dict[st
     # Remover grupos com apenas um elemento
     return {k: v for k, v in groups.items() if len(v) > 1}
 
+class UnionFind:
+    """Conjuntos disjuntos com compressão de caminho; a raiz é sempre o menor índice"""
+    
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+        self.components = size
+    
+    def find(self, index: int) -> int:
+        root = index
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[index] != root:
+            self.parent[index], index = root, self.parent[index]
+        return root
+    
+    def union(self, a: int, b: int) -> bool:
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return False
+        if root_b < root_a:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        self.components -= 1
+        return True
+
+def directory_prefix(path: str, depth: int) -> str:
+    """Primeiros `depth` níveis do diretório do caminho"""
+    return '/'.join(os.path.dirname(path).split('/')[:depth])
+
+def candidate_blocks(modules: List[dict], prefix_depth: int = BLOCK_PREFIX_DEPTH) -> List[List[int]]:
+    """
+    Blocos de candidatos: módulos com o mesmo nome base ou sob o mesmo prefixo
+    de diretório (subpastas inclusive) e, com assinaturas MinHash, os baldes
+    de LSH (conteúdo parecido)
+    
+    Todos os pares dentro de um bloco são comparados.
+    """
+    blocks = defaultdict(list)
+    for index, module in enumerate(modules):
+        path = module.get('path', '')
+        blocks[('name', extract_name_base(path))].append(index)
+        blocks[('dir', directory_prefix(path, prefix_depth))].append(index)
+    candidates = [blocks[key] for key in sorted(blocks) if len(blocks[key]) > 1]
+    candidates.extend(lsh_buckets([module.get('minhash') for module in modules]))
+    return candidates
+
+def size_windows(modules: List[dict], threshold: float,
+                 prefix_depth: int = BLOCK_PREFIX_DEPTH) -> Iterator[Tuple[List[int], float]]:
+    """
+    Blocos dos prefixos mais curtos que prefix_depth, ordenados por linhas,
+    com a razão mínima de tamanho para um par passar do limiar
+    
+    Dois módulos sob o mesmo prefixo de `level` níveis, mas em subpastas
+    diferentes, têm no máximo level/(level+1) de similaridade de caminho.
+    Com os demais fatores no máximo (100), só pares com razão de tamanho
+    >= min_ratio alcançam o limiar: na ordem por linhas, uma janela. Módulos
+    sem linhas vêm primeiro e são comparados com todo o bloco.
+    
+    Returns:
+        Iterador de (índices ordenados por linhas, min_ratio)
+    """
+    for level in range(prefix_depth - 1, 0, -1):
+        blocks = defaultdict(list)
+        for index, module in enumerate(modules):
+            blocks[directory_prefix(module.get('path', ''), level)].append(index)
+        path_bound = 100 * level / (level + 1)
+        for key in sorted(blocks):
+            block = blocks[key]
+            if len(block) < 2:
+                continue
+            factors = 3 if any(modules[index].get('minhash') for index in block) else 2
+            min_ratio = (factors * threshold - path_bound - 100 * (factors - 2)) / 100
+            block.sort(key=lambda index: (modules[index].get('lines', 0), index))
+            yield block, min_ratio
+
+def attach_signatures(module_lists: List[List[dict]], jobs: int = 1) -> int:
+    """
+    Calcula (ou lê do cache) a assinatura MinHash de cada módulo
+    
+    A assinatura fica em module['minhash'] e ativa o fator de conteúdo em
+    calculate_similarity.
+    
+    Returns:
+        Número de módulos com assinatura
+    """
+    paths = [module['path'] for modules in module_lists for module in modules if 'path' in module]
+    signatures = compute_signatures(paths, jobs)
+    attached = 0
+    for modules in module_lists:
+        for module in modules:
+            sig = signatures.get(module.get('path'))
+            if sig:
+                module['minhash'] = sig
+                attached += 1
+    return attached
+
+def refresh_from_features(module_lists: List[List[dict]], jobs: int = 1) -> int:
+    """
+    Atualiza linhas e bytes dos módulos a partir do store de features
+
+    Os relatórios JSON podem estar desatualizados; o store é atualizado de
+    forma incremental (só arquivos alterados são relidos).
+
+    Returns:
+        Número de módulos atualizados (os que não estão em src/ ficam como estão)
+    """
+    store, _, _ = load_features(jobs=jobs)
+    refreshed = 0
+    for modules in module_lists:
+        for module in modules:
+            row = store.row_of.get(module.get('path'))
+            if row is None:
+                continue
+            module['lines'] = int(store.columns['lines'][row])
+            module['size_bytes'] = int(store.columns['bytes'][row])
+            refreshed += 1
+    return refreshed
+
+def may_reach_threshold(module1: dict, module2: dict, threshold: float) -> bool:
+    """Limite superior barato: tamanho exato e os demais fatores no máximo (100)"""
+    lines1 = module1.get('lines', 0)
+    lines2 = module2.get('lines', 0)
+    if lines1 > 0 and lines2 > 0 and 'path' in module1 and 'path' in module2:
+        size_ratio = min(lines1, lines2) / max(lines1, lines2)
+        other_factors = 2 if module1.get('minhash') and module2.get('minhash') else 1
+        return (size_ratio * 100 + 100 * other_factors) / (1 + other_factors) >= threshold
+    return True
+
+def find_similar_groups_blocked(modules: List[dict], threshold: float = 60.0,
+                                prefix_depth: int = BLOCK_PREFIX_DEPTH) -> Dict[str, List[dict]]:
+    """
+    Agrupa módulos similares com blocagem + union-find
+    
+    Compara todos os pares dentro dos blocos (nome base, prefixo de diretório
+    de prefix_depth níveis, baldes de LSH) e, entre subpastas de prefixos mais
+    curtos, só os pares dentro da janela de tamanho que ainda pode passar do
+    limiar. Assim todo par acima do limiar é comparado, como no modo guloso.
+    Une os que passam do limiar; os grupos são as componentes conexas. O
+    resultado não depende da ordem de entrada (módulos ordenados pelo caminho)
+    e nenhum módulo fica preso ao primeiro grupo que o absorveu.
+    """
+    ordered = sorted(modules, key=lambda m: m.get('path', ''))
+    clusters = UnionFind(len(ordered))
+    
+    def link(i: int, j: int):
+        if clusters.find(i) == clusters.find(j):
+            return
+        if not may_reach_threshold(ordered[i], ordered[j], threshold):
+            return
+        if calculate_similarity(ordered[i], ordered[j]) >= threshold:
+            clusters.union(i, j)
+    
+    for block in candidate_blocks(ordered, prefix_depth):
+        for position, i in enumerate(block):
+            for j in block[position + 1:]:
+                link(i, j)
+    
+    for block, min_ratio in size_windows(ordered, threshold, prefix_depth):
+        for position, i in enumerate(block):
+            if clusters.components == 1:
+                break
+            lines = ordered[i].get('lines', 0)
+            for j in block[position + 1:]:
+                if lines > 0 and lines < min_ratio * ordered[j].get('lines', 0):
+                    break
+                link(i, j)
+    
+    members = defaultdict(list)
+    for index, module in enumerate(ordered):
+        members[clusters.find(index)].append(module)
+    
+    # Nome do grupo pelo primeiro módulo (menor caminho); colisões ganham sufixo
+    groups = {}
+    for root in sorted(members):
+        if len(members[root]) < 2:
+            continue
+        group_key = f"group_{extract_name_base(members[root][0].get('path', ''))}"
+        if group_key in groups:
+            suffix = 2
+            while f"{group_key}_{suffix}" in groups:
+                suffix += 1
+            group_key = f"{group_key}_{suffix}"
+        groups[group_key] = members[root]
+    return groups
+
+# Estratégias de agrupamento disponíveis na linha de comando
+GROUPING_MODES = {
+    'greedy': find_similar_groups,
+    'blocked': find_similar_groups_blocked,
+}
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Gera a matriz de similaridade entre módulos")
+    parser.add_argument(
+        '--grouping', choices=sorted(GROUPING_MODES), default='greedy',
+        help="greedy = comparação de todos os pares (padrão); "
+             "blocked = blocagem por nome/prefixo de diretório + union-find, mesmos pares acima do limiar"
+    )
+    parser.add_argument(
+        '--content', action='store_true',
+        help="Inclui a similaridade de conteúdo (MinHash dos tokens) como fator; "
+             "no modo blocked, os baldes de LSH também viram blocos de candidatos"
+    )
+    parser.add_argument(
+        '--jobs', '-j', type=int, default=1,
+        help="Processos paralelos para inventário, assinaturas e features (0 = todos os núcleos, padrão: 1)"
+    )
+    parser.add_argument(
+        '--inventory', action='store_true',
+        help="Regenera os quatro relatórios de entrada (scripts/inventory.py) antes de carregá-los"
+    )
+    parser.add_argument(
+        '--features', action='store_true',
+        help="Usa linhas e bytes atuais do store de features em vez dos valores dos relatórios"
+    )
+    parser.add_argument(
+        '--store', nargs='?', const=STORE_DIR, metavar='DIR',
+        help=f"Também grava os scores par a par no store binário para consultas (sem DIR: {STORE_DIR}); "
+             "consulte com: python scripts/similarity_store.py query NOME"
+    )
+    add_profile_arguments(parser)
+    return parser.parse_args()
+
 def generate_similarity_matrix():
     """Gera matriz de similaridade completa"""
+    args = parse_args()
+    group_finder = GROUPING_MODES[args.grouping]
+    profiler = Profiler.from_args(args, 'create-similarity-matrix')
+    
     print("=" * 70)
     print("   NAUTILUS ONE - MATRIZ DE SIMILARIDADE")
     print("   FASE B - Varredura Técnica Final")
@@ -98,6 +341,11 @@ def generate_similarity_matrix():
     
     # Carregar relatórios JSON
     print("[1/4] Carregando relatórios...")
+    profiler.mark("[1/4] carregar relatórios")
+    
+    if args.inventory:
+        write_reports(build_inventory(jobs=resolve_jobs(args.jobs)))
+        print("   ✓ Inventário de src/ regenerado")
     
     dashboards_data = load_json_report('dashboard_analysis_report.json')
     command_centers_data = load_json_report('command_center_analysis_report.json')
@@ -105,21 +353,45 @@ def generate_similarity_matrix():
     services_data = load_json_report('services_utilities_report.json')
     
     print("   ✓ Relatórios carregados")
+    profiler.count(4)
+    
+    if args.features:
+        profiler.mark("[1/4] store de features")
+        refreshed = refresh_from_features(
+            [dashboards_data.get('files', []), command_centers_data.get('files', [])],
+            resolve_jobs(args.jobs)
+        )
+        print(f"   ✓ Linhas atualizadas pelo store de features: {refreshed} módulos")
+        profiler.count(refreshed)
+    
+    if args.content:
+        profiler.mark("[1/4] assinaturas MinHash")
+        attached = attach_signatures(
+            [dashboards_data.get('files', []), command_centers_data.get('files', [])],
+            resolve_jobs(args.jobs)
+        )
+        print(f"   ✓ Assinaturas MinHash: {attached} arquivos")
+        profiler.count(attached)
     
     # Analisar dashboards
     print("\n[2/4] Analisando similaridade entre dashboards...")
+    profiler.mark("[2/4] grupos de dashboards")
     dashboard_files = dashboards_data.get('files', [])
-    dashboard_groups = find_similar_groups(dashboard_files, threshold=50.0)
+    profiler.count(len(dashboard_files))
+    dashboard_groups = group_finder(dashboard_files, threshold=50.0)
     print(f"   ✓ {len(dashboard_groups)} grupos de dashboards similares encontrados")
     
     # Analisar command centers
     print("\n[3/4] Analisando similaridade entre command centers...")
+    profiler.mark("[3/4] grupos de command centers")
     command_center_files = command_centers_data.get('files', [])
-    command_center_groups = find_similar_groups(command_center_files, threshold=50.0)
+    profiler.count(len(command_center_files))
+    command_center_groups = group_finder(command_center_files, threshold=50.0)
     print(f"   ✓ {len(command_center_groups)} grupos de command centers similares encontrados")
     
     # Gerar relatório
     print("\n[4/4] Gerando relatório de matriz de similaridade...")
+    profiler.mark("[4/4] relatório")
     
     report = {
         "analysis_date": dashboards_data.get('analysis_date', ''),
@@ -252,6 +524,15 @@ def generate_similarity_matrix():
     
     print("   ✓ Relatório gerado")
     
+    if args.store:
+        profiler.mark("store de similaridade")
+        try:
+            meta = save_store(dashboard_files + command_center_files, args.store)
+            print(f"   ✓ Store de similaridade: {meta['pairs']} pares de {meta['modules']} módulos em {args.store}")
+            profiler.count(meta['modules'])
+        except ImportError as e:
+            print(f"   ⚠️  Store de similaridade não gerado: {e}")
+    
     print("\n" + "=" * 70)
     print("   ANÁLISE CONCLUÍDA!")
     print("=" * 70)
@@ -262,6 +543,7 @@ def generate_similarity_matrix():
     print(f"  - Dashboards:      {len(dashboard_groups)} grupos")
     print(f"  - Command Centers: {len(command_center_groups)} grupos")
     print()
+    profiler.finish()
 
 if __name__ == "__main__":
     generate_similarity_matrix()
@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+"""
+Store colunar de features por arquivo (.npz) compartilhado pelas análises
+
+Uma única passada extrai de cada arquivo de src/ um vetor de features:
+
+    lines, bytes          linhas (como `wc -l`) e tamanho
+    imports, hooks        imports estáticos e chamadas de hooks (useX(...))
+    console               chamadas console.<método> por método (CONSOLE_METHODS)
+    console_in_catch      quantas dessas estão em catch/finally
+    patterns              padrões de componente (form/table/card/modal, como no grep
+                          de find-similar-components.sh)
+    jsx                   histograma das tags JSX abertas (CSR: jsx_indptr/jsx_tags/
+                          jsx_counts, com o vocabulário em jsx_vocab)
+    hash                  hash do conteúdo
+
+As colunas ficam em arrays NumPy gravados em um .npz. A atualização é
+incremental: arquivos com tamanho e mtime iguais reaproveitam a linha sem
+serem lidos, e arquivos com o mesmo hash de conteúdo não são reanalisados.
+Os relatórios de console, componentes e similaridade são calculados só a
+partir das colunas.
+
+Uso:
+    python scripts/feature_store.py update -j 0
+    python scripts/feature_store.py show src/components/InteropDashboard.tsx
+    python scripts/feature_store.py components --out similar_components_report.json
+"""
+
+import argparse
+import json
+import os
+import re
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from file_cache import content_hash
+from js_lexer import NAME, NUMBER, OP, STRING, scan_console_calls, tokenize
+from parallel import resolve_jobs, run_sharded
+from source_files import iter_source_files, open_bytes
+
+try:
+    import numpy as np
+except ImportError:  # dependência opcional: só o store precisa dela
+    np = None
+
+# Versão da extração: incrementar (ou mudar as listas abaixo) descarta o store
+FEATURES_VERSION = 1
+
+STORE_PATH = ".analysis-cache/features.npz"
+REPOSITORY = "/home/ubuntu/github_repos/travel-hr-buddy"
+
+# Os mesmos métodos de CONSOLE_PATTERN em analyze_console_logs.py
+CONSOLE_METHODS = ('log', 'error', 'warn', 'info', 'debug', 'trace', 'table', 'dir', 'group', 'groupEnd')
+
+# Os mesmos padrões (grep por linha) de find-similar-components.sh
+COMPONENT_PATTERNS = {
+    'form': re.compile(r'<form|Form|input|Input'),
+    'table': re.compile(r'<table|Table|DataGrid|datagrid'),
+    'card': re.compile(r'<Card|card|<div.*className.*card'),
+    'modal': re.compile(r'<Modal|modal|Dialog|dialog'),
+}
+COMPONENT_EXTENSIONS = ('.tsx', '.jsx')
+VERSIONED_NAME_RE = re.compile(r'(-v[0-9]|-new|-old|-legacy|-updated|-improved|[0-9]$)')
+
+HOOK_NAME_RE = re.compile(r'use[A-Z]\w*')
+
+# Tokens depois dos quais '<' é comparação ou genérico, e não uma tag JSX
+_NOT_JSX_PREVIOUS = frozenset({')', ']'})
+_JSX_PREVIOUS_KEYWORDS = frozenset({'return', 'default', 'yield', 'await', 'case', 'else', 'do'})
+
+_SCALAR_COLUMNS = ('size', 'mtime_ns', 'lines', 'bytes', 'imports', 'hooks', 'console_in_catch')
+
+
+def require_numpy():
+    if np is None:
+        raise ImportError("numpy é necessário para o store de features: pip install numpy")
+
+
+def _opens_jsx(previous) -> bool:
+    """'<' depois deste token abre uma tag JSX?"""
+    if previous is None:
+        return True
+    if previous.kind == NAME:
+        return previous.value in _JSX_PREVIOUS_KEYWORDS
+    if previous.kind in (NUMBER, STRING):
+        return False
+    return previous.value not in _NOT_JSX_PREVIOUS
+
+
+def extract_features(data: bytes, filepath: str) -> dict:
+    """
+    Features de um arquivo (já lido)
+
+    A contagem de tags JSX é heurística: '<' seguido de identificador, fora de
+    posições em que seria comparação ou genérico (depois de nome, número,
+    ')' ou ']').
+    """
+    data = data[:]  # mmap -> bytes
+    text = data.decode('utf-8')
+    tokens = tokenize(text)
+    imports = hooks = 0
+    jsx: Dict[str, int] = {}
+    is_component = filepath.endswith(COMPONENT_EXTENSIONS)
+    for index, tok in enumerate(tokens):
+        if tok.kind != NAME and tok.value != '<':
+            continue
+        previous = tokens[index - 1] if index else None
+        following = tokens[index + 1] if index + 1 < len(tokens) else None
+        if tok.kind == NAME:
+            if tok.value == 'import':
+                # import x from / import '...' (não import(...) nem import.meta)
+                if following is not None and following.value not in ('(', '.') and \
+                        (previous is None or previous.value != '.'):
+                    imports += 1
+            elif HOOK_NAME_RE.fullmatch(tok.value) and following is not None and following.value == '(':
+                if previous is None or previous.value not in ('function', '.'):
+                    hooks += 1
+        elif is_component and tok.kind == OP and following is not None and following.kind == NAME \
+                and _opens_jsx(previous):
+            name = following.value
+            position = index + 2
+            while position + 1 < len(tokens) and tokens[position].value == '.' \
+                    and tokens[position + 1].kind == NAME:
+                name += '.' + tokens[position + 1].value
+                position += 2
+            jsx[name] = jsx.get(name, 0) + 1
+
+    console = [0] * len(CONSOLE_METHODS)
+    in_catch = 0
+    if data.find(b'console.') != -1:
+        for call in scan_console_calls(text):
+            if call.member in CONSOLE_METHODS:
+                console[CONSOLE_METHODS.index(call.member)] += 1
+                in_catch += call.in_catch
+
+    return {
+        'hash': content_hash(data),
+        'lines': data.count(b'\n'),
+        'bytes': len(data),
+        'imports': imports,
+        'hooks': hooks,
+        'console': console,
+        'console_in_catch': in_catch,
+        'patterns': [
+            any(pattern.search(line) for line in text.split('\n'))
+            for pattern in COMPONENT_PATTERNS.values()
+        ],
+        'jsx': jsx,
+    }
+
+
+def extract_files(items):
+    """
+    Features de uma fatia de arquivos (worker)
+
+    Cada item é (arquivo, hash antigo ou None). Se o hash não mudou, devolve
+    None no lugar das features e a linha antiga é reaproveitada.
+
+    Returns:
+        [(arquivo, features ou None), ...]; arquivos ilegíveis ficam de fora
+    """
+    results = []
+    for filepath, old_hash in items:
+        try:
+            with open_bytes(filepath) as data:
+                if old_hash is not None and content_hash(data) == old_hash:
+                    results.append((filepath, None))
+                    continue
+                results.append((filepath, extract_features(data, filepath)))
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"  ❌ Erro ao extrair {filepath}: {e}")
+    return results
+
+
+def _schema() -> str:
+    return json.dumps([FEATURES_VERSION, CONSOLE_METHODS, list(COMPONENT_PATTERNS)])
+
+
+class FeatureStore:
+    """Features de todos os arquivos, uma linha por arquivo, em colunas NumPy"""
+
+    def __init__(self, path: str = STORE_PATH):
+        require_numpy()
+        self.path = os.fspath(path)
+        self.paths: List[str] = []
+        self.columns: Dict[str, 'np.ndarray'] = {}
+        self.row_of: Dict[str, int] = {}
+
+    def load(self) -> 'FeatureStore':
+        """Carrega o store; se a versão ou as listas de features mudaram, começa vazio"""
+        try:
+            with np.load(self.path, allow_pickle=False) as data:
+                if str(data['schema']) != _schema():
+                    return self
+                self.columns = {name: data[name] for name in data.files if name != 'schema'}
+        except (OSError, ValueError, KeyError):
+            return self
+        self.paths = [str(p) for p in self.columns.pop('paths')]
+        self.row_of = {path: row for row, path in enumerate(self.paths)}
+        return self
+
+    def __len__(self):
+        return len(self.paths)
+
+    def row(self, index: int) -> dict:
+        """Features de uma linha no mesmo formato de extract_features"""
+        start, stop = self.columns['jsx_indptr'][index:index + 2]
+        vocab = self.columns['jsx_vocab']
+        return {
+            'hash': str(self.columns['hash'][index]),
+            **{name: int(self.columns[name][index]) for name in _SCALAR_COLUMNS},
+            'console': [int(v) for v in self.columns['console'][index]],
+            'patterns': [bool(v) for v in self.columns['patterns'][index]],
+            'jsx': {
+                str(vocab[tag]): int(count)
+                for tag, count in zip(self.columns['jsx_tags'][start:stop], self.columns['jsx_counts'][start:stop])
+            },
+        }
+
+    def update(self, src_root: str = "src", root: str = ".", jobs: int = 1) -> Tuple[int, int]:
+        """
+        Atualiza o store com os arquivos atuais de src_root (caminhos relativos a root)
+
+        As linhas seguem a ordem da varredura; arquivos removidos saem do store.
+
+        Returns:
+            (arquivos reaproveitados, arquivos reanalisados)
+        """
+        current = []
+        file_stats = {}
+        pending = []
+        for path in iter_source_files(src_root):
+            rel_path = os.path.relpath(path, root).replace(os.sep, '/')
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            current.append(rel_path)
+            file_stats[rel_path] = (path, st)
+            row = self.row_of.get(rel_path)
+            if row is None or self.columns['size'][row] != st.st_size or \
+                    self.columns['mtime_ns'][row] != st.st_mtime_ns:
+                pending.append((rel_path, None if row is None else str(self.columns['hash'][row])))
+
+        # O worker recebe o caminho real; o resultado volta com o caminho relativo
+        real_paths = {os.fspath(file_stats[rel][0]): rel for rel, _ in pending}
+        items = [(os.fspath(file_stats[rel][0]), old_hash) for rel, old_hash in pending]
+        rows: Dict[str, dict] = {}
+        for results in run_sharded(extract_files, items, jobs):
+            for real_path, features in results:
+                rel_path = real_paths[real_path]
+                rows[rel_path] = features if features is not None else self.row(self.row_of[rel_path])
+
+        # Reanalisados que não voltaram do worker: a linha antiga não vale mais
+        stale = {rel for rel, _ in pending}
+        records = []
+        for rel_path in current:
+            if rel_path in rows:
+                record = rows[rel_path]
+            elif rel_path in self.row_of and rel_path not in stale:
+                record = self.row(self.row_of[rel_path])
+            else:
+                continue  # ilegível
+            st = file_stats[rel_path][1]
+            record['size'], record['mtime_ns'] = st.st_size, st.st_mtime_ns
+            records.append((rel_path, record))
+        self._set_rows(records)
+        return len(current) - len(pending), len(pending)
+
+    def _set_rows(self, records: List[Tuple[str, dict]]) -> None:
+        """Monta as colunas a partir de [(caminho, features), ...]"""
+        count = len(records)
+        self.paths = [path for path, _ in records]
+        self.row_of = {path: row for row, path in enumerate(self.paths)}
+        columns = {
+            'hash': np.array([r['hash'] for _, r in records], dtype='<U32'),
+            'console': np.array([r['console'] for _, r in records], dtype=np.int32).reshape(count, len(CONSOLE_METHODS)),
+            'patterns': np.array([r['patterns'] for _, r in records], dtype=bool).reshape(count, len(COMPONENT_PATTERNS)),
+        }
+        for name in _SCALAR_COLUMNS:
+            columns[name] = np.array([r[name] for _, r in records], dtype=np.int64)
+
+        vocab = sorted({tag for _, r in records for tag in r['jsx']})
+        tag_ids = {tag: i for i, tag in enumerate(vocab)}
+        indptr = [0]
+        tags, counts = [], []
+        for _, record in records:
+            for tag, tag_count in sorted(record['jsx'].items()):
+                tags.append(tag_ids[tag])
+                counts.append(tag_count)
+            indptr.append(len(tags))
+        columns['jsx_vocab'] = np.array(vocab, dtype=str) if vocab else np.zeros(0, dtype='<U1')
+        columns['jsx_indptr'] = np.array(indptr, dtype=np.int64)
+        columns['jsx_tags'] = np.array(tags, dtype=np.int32)
+        columns['jsx_counts'] = np.array(counts, dtype=np.int32)
+        self.columns = columns
+
+    def save(self) -> None:
+        """Grava o .npz de forma atômica (arquivo temporário + rename)"""
+        directory = os.path.dirname(self.path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(f, schema=np.array(_schema()), paths=np.array(self.paths, dtype=str), **self.columns)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def lines_of(self) -> Dict[str, int]:
+        """{arquivo: linhas}"""
+        return dict(zip(self.paths, (int(v) for v in self.columns['lines'])))
+
+
+def load_features(src_root: str = "src", root: str = ".", jobs: int = 1,
+                  path: str = STORE_PATH) -> Tuple[FeatureStore, int, int]:
+    """Carrega, atualiza e grava o store; devolve (store, reaproveitados, reanalisados)"""
+    store = FeatureStore(path).load()
+    reused, reanalyzed = store.update(src_root, root, jobs)
+    store.save()
+    return store, reused, reanalyzed
+
+
+def analysis_date() -> str:
+    """Data no formato de `date -Iseconds` (UTC) usado pelos relatórios"""
+    return datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+
+def component_report(components: List[Tuple[str, Sequence[bool]]]) -> dict:
+    """
+    Relatório de componentes similares (mesmo esquema de similar_components_report.json)
+
+    Args:
+        components: [(caminho .tsx/.jsx, flags na ordem de COMPONENT_PATTERNS), ...]
+    """
+    names = {os.path.splitext(os.path.basename(path))[0] for path, _ in components}
+    counts = {
+        kind: sum(1 for _, flags in components if flags[position])
+        for position, kind in enumerate(COMPONENT_PATTERNS)
+    }
+    return {
+        "analysis_date": analysis_date(),
+        "repository": REPOSITORY,
+        "summary": {
+            "total_components": len(components),
+            "versioned_components": sum(1 for name in names if VERSIONED_NAME_RE.search(name)),
+            **{f"{kind}_components": count for kind, count in counts.items()},
+        },
+        "generalization_opportunities": {f"{kind}_base": count for kind, count in counts.items()},
+    }
+
+
+def component_summary(store: FeatureStore) -> dict:
+    """Relatório de componentes calculado só a partir das colunas do store"""
+    patterns = store.columns['patterns']
+    return component_report([
+        (path, patterns[row]) for row, path in enumerate(store.paths) if path.endswith(COMPONENT_EXTENSIONS)
+    ])
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Store colunar de features por arquivo")
+    parser.add_argument('command', choices=['update', 'show', 'components'],
+                        help="update = atualiza o store; show = features de um arquivo; "
+                             "components = gera o relatório de componentes a partir do store")
+    parser.add_argument('file', nargs='?', help="Para show: caminho do arquivo")
+    parser.add_argument('--src', default="src", help="Diretório raiz (padrão: src)")
+    parser.add_argument('--store', default=STORE_PATH, help=f"Arquivo do store (padrão: {STORE_PATH})")
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help="Processos paralelos (0 = todos os núcleos, padrão: 1)")
+    parser.add_argument('--out', default='similar_components_report.json',
+                        help="Para components: relatório JSON (padrão: similar_components_report.json)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    start = time.perf_counter()
+    store, reused, reanalyzed = load_features(args.src, jobs=resolve_jobs(args.jobs), path=args.store)
+    print(f"🗂️  Features: {len(store)} arquivos ({reused} reaproveitados, {reanalyzed} relidos) "
+          f"em {time.perf_counter() - start:.2f}s")
+
+    if args.command == 'show':
+        row: Optional[int] = store.row_of.get(args.file or '')
+        if row is None:
+            print(f"❌ {args.file} não está no store")
+            return
+        print(json.dumps(store.row(row), indent=2, ensure_ascii=False))
+    elif args.command == 'components':
+        report = component_summary(store)
+        with open(args.out, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"✅ Relatório salvo em: {args.out}")
+        for kind, count in report['generalization_opportunities'].items():
+            print(f"   {kind}: {count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Cache persistente por arquivo para análises incrementais
+
+Cada entrada é indexada pelo caminho e guarda tamanho, mtime e hash do
+conteúdo junto com o resultado da análise. Um arquivo só precisa ser
+reanalisado quando o conteúdo muda; se apenas o mtime mudou (checkout,
+touch), o hash confirma que o resultado ainda vale.
+
+O cache inteiro é descartado quando a `key` muda (ex.: regex ou versão do
+analisador), o que dá um caminho explícito de invalidação.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from typing import Any, Dict, Iterable, Optional
+
+CACHE_FORMAT_VERSION = 1
+
+
+def content_hash(data: bytes) -> str:
+    """Hash rápido do conteúdo do arquivo"""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def make_cache_key(*parts: str) -> str:
+    """Gera a chave de invalidação a partir da configuração do analisador"""
+    return content_hash('\0'.join(parts).encode('utf-8'))
+
+
+class FileCache:
+    """Cache em disco (JSON) de resultados por arquivo"""
+
+    def __init__(self, path, key: str):
+        self.path = os.fspath(path)
+        self.key = key
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.dirty = False
+
+    def load(self) -> 'FileCache':
+        """Carrega o cache; se a chave ou o formato mudaram, começa vazio"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return self
+
+        if data.get('format') == CACHE_FORMAT_VERSION and data.get('key') == self.key:
+            self.entries = data.get('entries', {})
+        else:
+            self.dirty = True
+        return self
+
+    def lookup(self, rel_path: str, st: os.stat_result) -> Optional[Dict[str, Any]]:
+        """Retorna a entrada se tamanho e mtime ainda conferem (sem ler o arquivo)"""
+        entry = self.entries.get(rel_path)
+        if entry and entry['size'] == st.st_size and entry['mtime_ns'] == st.st_mtime_ns:
+            return entry
+        return None
+
+    def stale(self, rel_path: str) -> Optional[Dict[str, Any]]:
+        """Entrada antiga, para comparar pelo hash depois de ler o conteúdo"""
+        return self.entries.get(rel_path)
+
+    def store(self, rel_path: str, st: os.stat_result, digest: str, value: Any) -> None:
+        self.entries[rel_path] = {
+            'size': st.st_size,
+            'mtime_ns': st.st_mtime_ns,
+            'hash': digest,
+            'value': value,
+        }
+        self.dirty = True
+
+    def prune(self, live_paths: Iterable[str]) -> None:
+        """Remove entradas de arquivos que não existem mais"""
+        live = set(live_paths)
+        for rel_path in [p for p in self.entries if p not in live]:
+            del self.entries[rel_path]
+            self.dirty = True
+
+    def clear(self) -> None:
+        self.entries = {}
+        self.dirty = True
+
+    def save(self) -> None:
+        """Grava o cache de forma atômica (arquivo temporário + rename)"""
+        if not self.dirty:
+            return
+        directory = os.path.dirname(self.path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-', suffix='.json')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'format': CACHE_FORMAT_VERSION,
+                    'key': self.key,
+                    'entries': self.entries,
+                }, f, separators=(',', ':'))
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        self.dirty = False
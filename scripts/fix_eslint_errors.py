@@ -1,158 +1,593 @@
 #!/usr/bin/env python3
 """
 Script para corrigir erros ESLint automaticamente
+
+O ESLint roda com o formatter JSON, em vários subprocessos paralelos (cada
+um com uma fatia dos arquivos e um timeout), e a saída de cada um é lida e
+interpretada de forma incremental, um resultado de arquivo por vez. Com
+--since REF as duas passadas (diagnóstico e --fix) ficam limitadas aos
+arquivos alterados desde REF.
+
+Os arquivos são passados explicitamente (para dividir em fatias), então o
+script reproduz a seleção de `eslint .` (npm run lint) no modo eslintrc do
+ESLint 8: arquivos *.js e os que casam com algum overrides[].files do
+.eslintrc.json (padrões terminados em * não selecionam arquivos), menos o
+.eslintignore.
 """
 
+import argparse
+import json
 import os
 import re
 import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
+from typing import Iterator
+
+from parallel import chunked, resolve_jobs, run_sharded
+from source_diff import add_dry_run_arguments, diff_writer_from_args, render_diff
+from source_files import SOURCE_EXTENSIONS, GitignoreRules, iter_source_files, write_text_atomic
 
 # Diretório base do projeto
 BASE_DIR = Path("/home/ubuntu/github_repos/travel-hr-buddy")
 
-def get_files_with_console_errors():
-    """Obtém lista de arquivos com erros no-console"""
-    result = subprocess.run(
-        ["npm", "run", "lint"],
-        cwd=BASE_DIR,
-        capture_output=True,
-        text=True
-    )
-    
-    files = set()
-    for line in result.stdout.split('\n'):
-        if 'no-console' in line and 'error' in line:
-            # Extrai o caminho do arquivo da linha
-            parts = line.strip().split()
-            if parts:
-                file_path = parts[0].split(':')[0]
-                if file_path.startswith('/'):
-                    files.add(file_path)
+# ESLint local do projeto (o mesmo de `npm run lint`)
+ESLINT_COMMAND = ["npx", "--no-install", "eslint"]
+
+# Tempo máximo de cada subprocesso do ESLint (segundos)
+LINT_TIMEOUT = 600
+
+# Tamanho dos blocos lidos do stdout do ESLint
+READ_SIZE = 64 * 1024
+
+def iter_json_array(stream, read_size=READ_SIZE) -> Iterator[object]:
+    """
+    Interpreta um array JSON lido de um stream, um elemento por vez
+
+    Só o elemento em andamento fica no buffer; o stdout inteiro nunca é
+    montado em memória. Os elementos precisam ser objetos ou arrays (um
+    número no fim do buffer poderia estar incompleto).
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    pos = 0
+    eof = False
+    started = False
     
-    return list(files)
+    while True:
+        # Pula espaços, o '[' inicial e as vírgulas entre elementos
+        while pos < len(buffer) and (buffer[pos].isspace() or buffer[pos] == ',' or
+                                     (not started and buffer[pos] == '[')):
+            started = started or buffer[pos] == '['
+            pos += 1
+        if pos < len(buffer) and buffer[pos] == ']':
+            return
+        if pos < len(buffer):
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            else:
+                yield value
+                pos = end
+                continue
+        if eof:
+            if buffer[pos:].strip():
+                raise ValueError("Saída JSON do ESLint incompleta")
+            return
+        chunk = stream.read(read_size)
+        if not chunk:
+            eof = True
+        buffer = buffer[pos:] + chunk
+        pos = 0
 
-def remove_console_logs_from_file(file_path):
-    """Remove console.log mas preserva console.error e console.warn"""
+def load_eslintignore():
+    """Regras do .eslintignore do projeto (None se não existir)"""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-        
-        new_lines = []
-        modified = False
-        
-        for line in lines:
-            # Preserva console.error e console.warn
-            if re.search(r'console\.(error|warn)', line):
-                new_lines.append(line)
-            # Remove console.log, console.debug, console.info, etc.
-            elif re.search(r'console\.(log|debug|info|table|dir|trace)', line):
-                # Remove a linha se ela só contém console.log
-                if line.strip().startswith('console.'):
-                    modified = True
-                    continue
-                else:
-                    # Comenta a linha se ela tem mais código
-                    new_lines.append(f"// {line}")
-                    modified = True
-            else:
-                new_lines.append(line)
-        
-        if modified:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.writelines(new_lines)
-            return True
-    except Exception as e:
-        print(f"Erro ao processar {file_path}: {e}")
+        with open(BASE_DIR / '.eslintignore', 'r', encoding='utf-8') as f:
+            rules = GitignoreRules(f)
+    except OSError:
+        return None
+    return rules if rules.rules else None
+
+def is_eslint_ignored(rules, rel_path):
+    """O arquivo (ou algum diretório acima dele) casa com o .eslintignore?"""
+    if rules is None:
         return False
+    parts = rel_path.split('/')
+    for depth in range(1, len(parts)):
+        if rules.match('/'.join(parts[:depth]), True):
+            return True
+    return bool(rules.match(rel_path, False))
+
+def strip_json_comments(text):
+    """Remove comentários // e /* */ de um JSON (o .eslintrc.json aceita comentários)"""
+    parts = []
+    i = 0
+    start = 0
+    while i < len(text):
+        char = text[i]
+        if char == '"':
+            # Pula a string inteira (pode conter // em URLs)
+            i += 1
+            while i < len(text) and text[i] != '"':
+                i += 2 if text[i] == '\\' else 1
+            i += 1
+        elif text.startswith('//', i):
+            parts.append(text[start:i])
+            i = text.find('\n', i)
+            i = len(text) if i == -1 else i
+            start = i
+        elif text.startswith('/*', i):
+            parts.append(text[start:i])
+            end = text.find('*/', i + 2)
+            i = len(text) if end == -1 else end + 2
+            start = i
+        else:
+            i += 1
+    parts.append(text[start:])
+    return ''.join(parts)
+
+def load_lint_targets():
+    """
+    Regras de seleção de `eslint .` além dos *.js: overrides[].files do .eslintrc.json
+
+    Returns:
+        [(padrões incluídos, padrões excluídos ou None), ...] como GitignoreRules
+    """
+    try:
+        with open(BASE_DIR / '.eslintrc.json', 'r', encoding='utf-8') as f:
+            config = json.loads(strip_json_comments(f.read()))
+    except (OSError, ValueError) as e:
+        print(f"  ⚠️  .eslintrc.json não lido ({e}): só arquivos *.js serão analisados")
+        return []
+    
+    def as_list(value):
+        return [value] if isinstance(value, str) else list(value or [])
     
+    targets = []
+    for override in config.get('overrides', []):
+        # Como no ESLint 8: padrões terminados em * não selecionam arquivos novos
+        files = [pattern for pattern in as_list(override.get('files')) if not pattern.endswith('*')]
+        if files:
+            excluded = as_list(override.get('excludedFiles'))
+            targets.append((GitignoreRules(files), GitignoreRules(excluded) if excluded else None))
+    return targets
+
+def is_lint_target(targets, rel_path):
+    """`eslint .` analisaria este arquivo (sem contar o .eslintignore)?"""
+    if rel_path.endswith('.js'):
+        return True
+    for included, excluded in targets:
+        if included.match(rel_path, False) and not (excluded and excluded.match(rel_path, False)):
+            return True
     return False
 
-def remove_ts_nocheck(file_path):
-    """Remove // @ts-nocheck dos arquivos"""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+def all_lint_files():
+    """Os arquivos que `eslint .` (npm run lint) analisaria"""
+    rules = load_eslintignore()
+    targets = load_lint_targets()
+    files = []
+    for path in iter_source_files(BASE_DIR):
+        rel_path = path.relative_to(BASE_DIR).as_posix()
+        if is_lint_target(targets, rel_path) and not is_eslint_ignored(rules, rel_path):
+            files.append(rel_path)
+    return files
+
+def changed_files(ref):
+    """
+    Arquivos JS/TS alterados desde `ref` (commits, working tree e não versionados)
+
+    Arquivos removidos, os ignorados pelo .eslintignore e os que `eslint .`
+    não selecionaria (ver all_lint_files) ficam de fora.
+    """
+    def git(*args):
+        result = subprocess.run(["git", *args], cwd=BASE_DIR, capture_output=True, text=True, check=True)
+        return result.stdout.splitlines()
+    
+    candidates = git("diff", "--name-only", "--diff-filter=ACMR", ref)
+    candidates += git("ls-files", "--others", "--exclude-standard")
+    rules = load_eslintignore()
+    targets = load_lint_targets()
+    return sorted({
+        rel_path for rel_path in candidates
+        if rel_path.endswith(SOURCE_EXTENSIONS)
+        and is_lint_target(targets, rel_path)
+        and (BASE_DIR / rel_path).is_file()
+        and not is_eslint_ignored(rules, rel_path)
+    })
+
+def run_eslint_shard(files, fix=False, timeout=LINT_TIMEOUT, on_result=None):
+    """
+    Roda o ESLint (formatter JSON) sobre uma fatia de arquivos
+
+    Cada resultado de arquivo é passado para `on_result` assim que é lido.
+    O subprocesso é encerrado se passar de `timeout` segundos.
+
+    Returns:
+        (código de saída ou None em caso de timeout, início do stderr)
+    """
+    command = ESLINT_COMMAND + ["--format", "json"] + (["--fix"] if fix else []) + ["--"] + list(files)
+    with tempfile.TemporaryFile() as stderr:
+        process = subprocess.Popen(command, cwd=BASE_DIR, stdout=subprocess.PIPE, stderr=stderr,
+                                   text=True, encoding='utf-8')
+        timed_out = threading.Event()
         
-        # Remove // @ts-nocheck
-        new_content = re.sub(r'//\s*@ts-nocheck\s*\n?', '', content)
+        def kill():
+            timed_out.set()
+            process.kill()
         
-        if new_content != content:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(new_content)
-            return True
-    except Exception as e:
-        print(f"Erro ao processar {file_path}: {e}")
-        return False
+        timer = threading.Timer(timeout, kill)
+        timer.start()
+        try:
+            try:
+                for result in iter_json_array(process.stdout):
+                    if on_result is not None:
+                        on_result(result)
+            except ValueError:
+                pass  # saída truncada (timeout) ou não-JSON (erro de configuração)
+            process.stdout.close()
+            returncode = process.wait()
+        finally:
+            timer.cancel()
+        stderr.seek(0)
+        error = stderr.read(2000).decode('utf-8', errors='replace').strip()
+    return (None if timed_out.is_set() else returncode), error
+
+def run_eslint(files, on_result, fix=False, jobs=1, timeout=LINT_TIMEOUT):
+    """
+    Roda o ESLint em subprocessos paralelos (uma fatia de arquivos cada)
+
+    `on_result` recebe cada resultado de arquivo; as chamadas são serializadas.
+
+    Returns:
+        Número de fatias que falharam (timeout ou erro do ESLint)
+    """
+    if not files:
+        return 0
+    lock = threading.Lock()
     
-    return False
+    def handle(result):
+        with lock:
+            on_result(result)
+    
+    shards = chunked(files, jobs)
+    failed = 0
+    with ThreadPoolExecutor(max_workers=len(shards)) as executor:
+        futures = [executor.submit(run_eslint_shard, shard, fix, timeout, handle) for shard in shards]
+        for shard, future in zip(shards, futures):
+            returncode, error = future.result()
+            if returncode is None:
+                print(f"  ⏱️  ESLint excedeu {timeout}s em uma fatia de {len(shard)} arquivos")
+                failed += 1
+            elif returncode not in (0, 1):
+                print(f"  ❌ ESLint falhou (código {returncode}): {error or 'sem detalhes'}")
+                failed += 1
+    return failed
 
-def fix_case_declarations(file_path):
-    """Corrige declarações em case blocks adicionando braces"""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-        
-        new_lines = []
-        modified = False
-        i = 0
+def get_files_with_errors(files, rules, jobs=1, timeout=LINT_TIMEOUT):
+    """
+    Arquivos com erros de cada regra do ESLint, em uma única passada
+
+    Returns:
+        ({regra: conjunto de caminhos absolutos}, fatias que falharam); com
+        fatias falhas, os conjuntos podem estar incompletos
+    """
+    found = {rule: set() for rule in rules}
+    
+    def collect(result):
+        for message in result.get('messages', []):
+            if message.get('ruleId') in found and message.get('severity') == 2:
+                found[message['ruleId']].add(result['filePath'])
+    
+    failed = run_eslint(files, collect, jobs=jobs, timeout=timeout)
+    return found, failed
+
+def get_files_with_console_errors(files, jobs=1, timeout=LINT_TIMEOUT):
+    """Obtém lista de arquivos com erros no-console"""
+    found, _ = get_files_with_errors(files, ['no-console'], jobs, timeout)
+    return sorted(found['no-console'])
+
+# Fixers trabalham sobre o conteúdo em memória: recebem o texto e devolvem o
+# texto corrigido (o mesmo objeto se nada mudou)
+
+CONSOLE_KEEP_RE = re.compile(r'console\.(error|warn)')
+CONSOLE_REMOVE_RE = re.compile(r'console\.(log|debug|info|table|dir|trace)')
+TS_NOCHECK_RE = re.compile(r'//\s*@ts-nocheck\s*\n?')
+CASE_RE = re.compile(r'\s*case\s+')
+DECLARATION_RE = re.compile(r'\s*(const|let|var)\s+')
+DEFAULT_RE = re.compile(r'\s*default\s*:')
+
+def split_lines(content):
+    """Linhas com a quebra de linha ('\n' ou '\r\n') preservada, como readlines()"""
+    lines = content.split('\n')
+    result = [line + '\n' for line in lines[:-1]]
+    if lines[-1]:
+        result.append(lines[-1])
+    return result
+
+def fix_console_logs(content):
+    """Remove console.log mas preserva console.error e console.warn"""
+    if 'console.' not in content:
+        return content
+    new_lines = []
+    modified = False
+    
+    for line in split_lines(content):
+        # Preserva console.error e console.warn
+        if CONSOLE_KEEP_RE.search(line):
+            new_lines.append(line)
+        # Remove console.log, console.debug, console.info, etc.
+        elif CONSOLE_REMOVE_RE.search(line):
+            # Remove a linha se ela só contém console.log
+            if line.strip().startswith('console.'):
+                modified = True
+                continue
+            else:
+                # Comenta a linha se ela tem mais código
+                new_lines.append(f"// {line}")
+                modified = True
+        else:
+            new_lines.append(line)
+    
+    return ''.join(new_lines) if modified else content
+
+def fix_ts_nocheck(content):
+    """Remove // @ts-nocheck"""
+    if '@ts-nocheck' not in content:
+        return content
+    return TS_NOCHECK_RE.sub('', content)
+
+def fix_case_blocks(content):
+    """
+    Corrige declarações em case blocks adicionando braces
+
+    `case X:` seguido de const/let/var vira `case X: {`, e o bloco é fechado
+    no nível do case depois do break (ou antes do próximo case/default ou do
+    fim do switch, se não houver break).
+    """
+    if 'case' not in content:
+        return content
+    lines = split_lines(content)
+    new_lines = []
+    modified = False
+    i = 0
+    
+    while i < len(lines):
+        line = lines[i]
         
-        while i < len(lines):
-            line = lines[i]
+        # case com declaração (const, let, var) na linha seguinte
+        if (CASE_RE.match(line) and line.rstrip().endswith(':')
+                and i + 1 < len(lines) and DECLARATION_RE.match(lines[i + 1])):
+            # Abre o bloco na própria linha do case (o label sai uma única vez)
+            label = line.rstrip()
+            newline = line[len(label):] or '\n'
+            indent = line[:len(line) - len(line.lstrip())]
+            new_lines.append(label + ' {' + newline)
+            modified = True
+            i += 1
             
-            # Detecta case statement
-            if re.match(r'\s*case\s+', line):
-                new_lines.append(line)
+            # Copia as linhas do case até o break, inclusive
+            while i < len(lines):
+                current = lines[i]
+                current_indent = len(current) - len(current.lstrip())
+                if (CASE_RE.match(current) or DEFAULT_RE.match(current)
+                        or (current.lstrip().startswith('}') and current_indent < len(indent))):
+                    break
+                new_lines.append(current)
                 i += 1
-                
-                # Verifica se a próxima linha tem declaração (const, let, var)
-                if i < len(lines) and re.search(r'\s*(const|let|var)\s+', lines[i]):
-                    # Adiciona abertura de bloco
-                    new_lines.append(lines[i-1].replace('case', 'case').rstrip() + ' {\n')
-                    modified = True
-                    
-                    # Adiciona linhas até o break
-                    while i < len(lines):
-                        if 'break' in lines[i]:
-                            new_lines.append(lines[i])
-                            new_lines.append(' ' * (len(lines[i]) - len(lines[i].lstrip())) + '}\n')
-                            i += 1
-                            break
-                        else:
-                            new_lines.append(lines[i])
-                            i += 1
-                    continue
-            
-            new_lines.append(line)
-            i += 1
+                if 'break' in current:
+                    break
+            new_lines.append(indent + '}' + newline)
+            continue
         
-        if modified:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.writelines(new_lines)
-            return True
-    except Exception as e:
-        print(f"Erro ao processar {file_path}: {e}")
-        return False
+        new_lines.append(line)
+        i += 1
     
-    return False
+    return ''.join(new_lines) if modified else content
+
+# Pipeline de fixers, aplicados nesta ordem: nome -> (função, regra do ESLint
+# que seleciona os arquivos ou None para todos os arquivos). Um fixer novo só
+# precisa ser registrado aqui; ele roda na mesma leitura/escrita dos demais.
+FIXERS = {
+    'console-log': (fix_console_logs, 'no-console'),
+    'ts-nocheck': (fix_ts_nocheck, None),
+    'case-declarations': (fix_case_blocks, None),
+}
+
+# Fixers usados por padrão (o comportamento original do script)
+DEFAULT_FIXERS = ('console-log',)
+
+def apply_fixers(file_path, fixer_names, diff_format=None):
+    """
+    Lê o arquivo uma vez, aplica os fixers em ordem e grava no máximo uma vez
+
+    Com diff_format ('unified' ou 'json', --dry-run) nada é gravado: o diff
+    renderizado volta no resultado.
+
+    Returns:
+        (arquivo, [fixers que mudaram o conteúdo], {fixer: segundos}, erro ou None, diff ou None)
+    """
+    changed = []
+    timings = {}
+    try:
+        with open(file_path, 'r', encoding='utf-8', newline='') as f:
+            original = f.read()
+        content = original
+        for name in fixer_names:
+            start = time.perf_counter()
+            fixed = FIXERS[name][0](content)
+            timings[name] = time.perf_counter() - start
+            if fixed != content:
+                changed.append(name)
+                content = fixed
+        diff = None
+        if content != original:
+            if diff_format:
+                rel_path = Path(os.path.relpath(file_path, BASE_DIR)).as_posix()
+                diff = render_diff(rel_path, original, content, diff_format)
+            else:
+                write_text_atomic(file_path, content)
+    except (OSError, UnicodeDecodeError) as e:
+        return file_path, [], timings, str(e), None
+    return file_path, changed, timings, None, diff
+
+def apply_fixers_to_files(items, diff_format=None):
+    """Aplica os fixers a uma fatia de (arquivo, [fixers]) (worker)"""
+    return [apply_fixers(file_path, fixer_names, diff_format) for file_path, fixer_names in items]
+
+def run_fixers(targets, jobs=1, diff_writer=None):
+    """
+    Roda o pipeline em paralelo
+
+    Args:
+        targets: [(arquivo, [fixers a aplicar]), ...]
+        diff_writer: no --dry-run, recebe os diffs na ordem dos arquivos (nada é gravado)
+
+    Returns:
+        ({fixer: {'files': arquivos alterados, 'seconds': tempo total}}, [arquivos alterados])
+    """
+    stats = {name: {'files': 0, 'seconds': 0.0} for name in FIXERS}
+    changed_files = []
+    worker = partial(apply_fixers_to_files, diff_format=diff_writer.fmt if diff_writer else None)
+    for results in run_sharded(worker, targets, jobs):
+        for file_path, changed, timings, error, diff in results:
+            if error:
+                print(f"Erro ao processar {file_path}: {error}")
+                continue
+            if diff_writer:
+                diff_writer.write(diff)
+            for name, seconds in timings.items():
+                stats[name]['seconds'] += seconds
+            for name in changed:
+                stats[name]['files'] += 1
+            if changed:
+                changed_files.append(file_path)
+    return stats, changed_files
+
+def remove_console_logs_from_file(file_path):
+    """Remove console.log mas preserva console.error e console.warn"""
+    return bool(apply_fixers(file_path, ['console-log'])[1])
+
+def remove_ts_nocheck(file_path):
+    """Remove // @ts-nocheck dos arquivos"""
+    return bool(apply_fixers(file_path, ['ts-nocheck'])[1])
+
+def fix_case_declarations(file_path):
+    """Corrige declarações em case blocks adicionando braces"""
+    return bool(apply_fixers(file_path, ['case-declarations'])[1])
+
+def plan_fixers(lint_files, fixer_names, jobs=1, timeout=LINT_TIMEOUT):
+    """
+    Decide quais fixers rodam em cada arquivo
+
+    Uma única passada do ESLint cobre as regras de todos os fixers escolhidos;
+    fixers sem regra rodam em todos os arquivos.
+
+    Returns:
+        ([(caminho absoluto, [fixers]), ...] em ordem de caminho, fatias do
+        ESLint que falharam)
+    """
+    rules = {FIXERS[name][1] for name in fixer_names} - {None}
+    flagged, failed = get_files_with_errors(lint_files, sorted(rules), jobs, timeout) if rules else ({}, 0)
+    everyone = {str(BASE_DIR / rel_path) for rel_path in lint_files}
+    targets = {}
+    for name in fixer_names:
+        rule = FIXERS[name][1]
+        for file_path in (flagged[rule] if rule else everyone):
+            targets.setdefault(file_path, []).append(name)
+    return sorted(targets.items()), failed
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Corrige erros ESLint automaticamente")
+    parser.add_argument(
+        '--since', metavar='REF',
+        help="Só arquivos alterados desde REF (ex.: origin/main), incluindo mudanças não commitadas"
+    )
+    parser.add_argument(
+        '--jobs', '-j', type=int, default=1,
+        help="Subprocessos do ESLint em paralelo (0 = todos os núcleos, padrão: 1)"
+    )
+    parser.add_argument(
+        '--timeout', type=int, default=LINT_TIMEOUT,
+        help=f"Tempo máximo de cada subprocesso do ESLint em segundos (padrão: {LINT_TIMEOUT})"
+    )
+    parser.add_argument(
+        '--fixers', default=','.join(DEFAULT_FIXERS),
+        help=f"Fixers aplicados, em ordem, separados por vírgula (disponíveis: {', '.join(FIXERS)}; "
+             f"padrão: {','.join(DEFAULT_FIXERS)})"
+    )
+    add_dry_run_arguments(parser)
+    return parser.parse_args()
 
 def main():
+    args = parse_args()
+    fixer_names = [name.strip() for name in args.fixers.split(',') if name.strip()]
+    unknown = [name for name in fixer_names if name not in FIXERS]
+    if unknown:
+        print(f"❌ Fixers desconhecidos: {', '.join(unknown)} (disponíveis: {', '.join(FIXERS)})")
+        return
+    diff_writer = diff_writer_from_args(args)
+    try:
+        run(args, fixer_names, diff_writer)
+    finally:
+        # Devolve o stdout mesmo se o dry-run falhar no meio
+        if diff_writer:
+            diff_writer.close()
+
+def run(args, fixer_names, diff_writer):
+    """Fase 1 (fixers) e Fase 2 (eslint --fix, fora do --dry-run)"""
+    jobs = resolve_jobs(args.jobs)
     print("🔧 Iniciando correção de erros ESLint...")
     
-    # 1. Remover console.log
-    print("\n📝 Fase 1: Removendo console.log...")
-    console_files = get_files_with_console_errors()
-    console_fixed = 0
-    for file_path in console_files:
-        if remove_console_logs_from_file(file_path):
-            console_fixed += 1
-            print(f"  ✓ {file_path}")
+    if args.since:
+        lint_files = changed_files(args.since)
+        print(f"   {len(lint_files)} arquivos alterados desde {args.since}")
+    else:
+        lint_files = all_lint_files()
+    if not lint_files:
+        print("\n✅ Nada para corrigir")
+        return
+    
+    # 1. Pipeline de fixers (uma leitura e no máximo uma escrita por arquivo)
+    print(f"\n📝 Fase 1: Aplicando fixers ({', '.join(fixer_names)})...")
+    targets, failed = plan_fixers(lint_files, fixer_names, jobs, args.timeout)
+    stats, fixed_files = run_fixers(targets, jobs, diff_writer)
+    for file_path in fixed_files:
+        print(f"  ✓ {file_path}")
     
-    print(f"\n✅ {console_fixed} arquivos corrigidos (console.log)")
+    print(f"\n✅ {len(fixed_files)} arquivos corrigidos")
+    for name in fixer_names:
+        print(f"   {name}: {stats[name]['files']} arquivos ({stats[name]['seconds'] * 1000:.0f} ms)")
+    if failed:
+        print(f"   ⚠️  {failed} fatias do ESLint não terminaram: os fixers por regra "
+              f"podem não ter visto todos os arquivos")
     
-    # 2. Executar eslint --fix novamente
+    # O eslint --fix grava direto nos arquivos: no dry-run só os fixers entram no diff
+    if diff_writer:
+        print(f"\n🔍 Dry-run: nada foi gravado; diff de {diff_writer.files} arquivos em "
+              f"{'stdout' if args.diff_output == '-' else args.diff_output} (Fase 2, eslint --fix, não executada)")
+        return
+    
+    # 2. Executar eslint --fix nos mesmos arquivos
     print("\n📝 Fase 2: Executando eslint --fix...")
-    subprocess.run(["npm", "run", "lint", "--", "--fix"], cwd=BASE_DIR)
+    remaining = {'errors': 0, 'warnings': 0, 'files': 0}
+    
+    def count(result):
+        remaining['errors'] += result.get('errorCount', 0)
+        remaining['warnings'] += result.get('warningCount', 0)
+        remaining['files'] += 1 if result.get('errorCount', 0) else 0
+    
+    failed = run_eslint(lint_files, count, fix=True, jobs=jobs, timeout=args.timeout)
+    print(f"   Restam {remaining['errors']} erros em {remaining['files']} arquivos "
+          f"e {remaining['warnings']} avisos")
+    if failed:
+        print(f"   ⚠️  {failed} fatias do ESLint não terminaram")
     
     print("\n✅ Correções concluídas!")
 
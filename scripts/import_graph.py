@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+Índice persistente do grafo de imports de src/
+
+Guarda, por arquivo, os especificadores locais que ele cita (já na forma
+canônica @/...) e os padrões de import.meta.glob / import(`...${x}`) em um
+cache por hash de conteúdo; só arquivos alterados são relidos.
+
+As arestas resolvidas (arquivo -> arquivo) e as reversas (quem importa X)
+também são gravadas. Em cada execução só são religados os arquivos
+alterados e os que citam algo cuja resolução mudou com arquivos criados ou
+removidos. As consultas respondem em milissegundos.
+
+Uso:
+    python scripts/import_graph.py importers @/components/ui/skeleton
+    python scripts/import_graph.py importers src/components/ui/skeleton.tsx
+    python scripts/import_graph.py imports src/App.tsx
+"""
+
+import argparse
+import json
+import os
+import time
+from collections import defaultdict
+from functools import partial
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from file_cache import FileCache, content_hash, make_cache_key
+from parallel import resolve_jobs, run_sharded
+from source_files import SOURCE_EXTENSIONS, iter_source_files, open_bytes, write_text_atomic
+from ts_imports import (ALIAS_PREFIX, GLOB_IMPORT_RE, IMPORT_SPECIFIER_RE, TEMPLATE_IMPORT_RE,
+                        canonical_specifier, extract_dynamic_patterns, extract_local_specifiers,
+                        glob_regex, importer_directory)
+
+# Versão da extração: incrementar invalida o cache
+GRAPH_VERSION = 2
+
+# Raiz do projeto (pai de scripts/): o cache não depende do diretório atual
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+CACHE_PATH = PROJECT_ROOT / ".analysis-cache" / "import_graph.json"
+LINKS_PATH = PROJECT_ROOT / ".analysis-cache" / "import_graph_links.json"
+
+# Ordem de resolução de um especificador sem extensão (como o TypeScript)
+RESOLVE_EXTENSIONS = ('.ts', '.tsx', '.js', '.jsx')
+
+
+def parse_files(items, src_root):
+    """
+    Extrai os especificadores de uma fatia de arquivos (worker)
+
+    Cada item é (arquivo, entrada antiga do cache); se o hash não mudou, o
+    resultado antigo é reaproveitado.
+
+    Returns:
+        [(arquivo, hash, {'specifiers': [...], 'globs'?: [...], 'templates'?: [...]}), ...]
+        na ordem dos itens
+    """
+    results = []
+    for filepath, cached in items:
+        try:
+            with open_bytes(filepath) as data:
+                digest = content_hash(data)
+                if cached and cached['hash'] == digest:
+                    value = cached['value']
+                else:
+                    text = data[:].decode('utf-8')
+                    importer_dir = importer_directory(filepath, src_root)
+                    value = {'specifiers': extract_local_specifiers(text, importer_dir)}
+                    value.update(extract_dynamic_patterns(text, importer_dir))
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"  ❌ Erro ao indexar {filepath}: {e}")
+            continue
+        results.append((filepath, digest, value))
+    return results
+
+
+def _extension_rank(filepath: str) -> int:
+    extension = filepath[filepath.rfind('.'):]
+    if extension in RESOLVE_EXTENSIONS:
+        return RESOLVE_EXTENSIONS.index(extension)
+    return len(RESOLVE_EXTENSIONS)
+
+
+class ImportGraph:
+    """Grafo de imports de src/ com arestas diretas e reversas"""
+
+    def __init__(self, src_root: str = "src", cache_path=CACHE_PATH, links_path=LINKS_PATH):
+        self.src_root = src_root.rstrip('/')
+        # O cache fica na raiz do projeto e as chaves são caminhos relativos:
+        # outra árvore (outro diretório atual) usa outra chave
+        self.cache_key = make_cache_key(
+            IMPORT_SPECIFIER_RE.pattern, GLOB_IMPORT_RE.pattern, TEMPLATE_IMPORT_RE.pattern, str(GRAPH_VERSION),
+            os.path.abspath(self.src_root)
+        )
+        self.cache = FileCache(cache_path, self.cache_key)
+        self.links_path = os.fspath(links_path)
+        # arquivo -> especificadores canônicos citados
+        self.specifiers: Dict[str, List[str]] = {}
+        # arquivo -> {'globs': [...], 'templates': [...]} (só arquivos que têm algum)
+        self.patterns: Dict[str, Dict[str, List[str]]] = {}
+        # especificador canônico -> arquivo (inclui variantes sem extensão e /index)
+        self.modules: Dict[str, str] = {}
+        # arestas resolvidas e reversas (arquivo -> arquivos)
+        self.imports: Dict[str, List[str]] = {}
+        self.importers: Dict[str, List[str]] = defaultdict(list)
+        # especificador canônico -> arquivos que o citam (mesmo sem arquivo correspondente)
+        self.specifier_importers: Dict[str, List[str]] = defaultdict(list)
+
+    def update(self, jobs: int = 1, rebuild: bool = False):
+        """
+        Atualiza o índice: só arquivos com tamanho/mtime diferentes são relidos
+
+        As arestas gravadas da execução anterior são corrigidas só onde
+        precisa (ver _patch); sem elas, ou com --rebuild, tudo é religado.
+
+        Returns:
+            (arquivos reaproveitados, arquivos relidos)
+        """
+        links = None
+        if rebuild:
+            self.cache.clear()
+        else:
+            self.cache.load()
+            links = self._load_links()
+
+        fresh = {}
+        pending = []
+        file_stats = {}
+        for path in iter_source_files(self.src_root, SOURCE_EXTENSIONS):
+            filepath = path.as_posix()
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            file_stats[filepath] = st
+            entry = self.cache.lookup(filepath, st)
+            if entry is not None:
+                fresh[filepath] = entry['value']
+            else:
+                pending.append((filepath, self.cache.stale(filepath)))
+
+        worker = partial(parse_files, src_root=self.src_root)
+        for results in run_sharded(worker, pending, jobs):
+            for filepath, digest, value in results:
+                self.cache.store(filepath, file_stats[filepath], digest, value)
+                fresh[filepath] = value
+
+        self.cache.prune(file_stats)
+        self.cache.save()
+
+        # Ordem determinística (a da varredura)
+        self.specifiers = {}
+        self.patterns = {}
+        for filepath in file_stats:
+            value = fresh.get(filepath)
+            if value is None:
+                continue
+            self.specifiers[filepath] = value['specifiers']
+            patterns = {name: value[name] for name in ('globs', 'templates') if name in value}
+            if patterns:
+                self.patterns[filepath] = patterns
+
+        if links is not None:
+            changed = self._patch(links)
+        else:
+            self._link()
+            changed = True
+        if changed:
+            self._save_links()
+        return len(file_stats) - len(pending), len(pending)
+
+    def _module_id(self, filepath: str) -> str:
+        return ALIAS_PREFIX + filepath[len(self.src_root) + 1:]
+
+    def _build_modules(self) -> Dict[str, str]:
+        """Especificador canônico -> arquivo, com as variantes sem extensão e /index"""
+        modules = {}
+        by_priority = sorted(self.specifiers, key=_extension_rank)
+        for filepath in self.specifiers:
+            modules[self._module_id(filepath)] = filepath
+        # @/a/b -> src/a/b.ts(x); depois @/a -> src/a/index.ts(x)
+        for filepath in by_priority:
+            stem = self._module_id(filepath)
+            stem = stem[:stem.rfind('.')]
+            modules.setdefault(stem, filepath)
+        for filepath in by_priority:
+            stem = self._module_id(filepath)
+            stem = stem[:stem.rfind('.')]
+            if stem.endswith('/index'):
+                modules.setdefault(stem[:-len('/index')], filepath)
+        return modules
+
+    def _link_file(self, filepath: str, touched: Optional[Set[str]] = None):
+        """Resolve os especificadores de um arquivo e registra as arestas"""
+        targets = []
+        for specifier in self.specifiers[filepath]:
+            self.specifier_importers[specifier].append(filepath)
+            target = self.modules.get(specifier)
+            if target is not None and target != filepath and target not in targets:
+                targets.append(target)
+                self.importers[target].append(filepath)
+        self.imports[filepath] = targets
+        if touched is not None:
+            touched.update(self.specifiers[filepath])
+            touched.update(targets)
+
+    def _unlink_file(self, filepath: str, specifiers: List[str]):
+        """Remove as arestas de um arquivo (citando `specifiers`, os especificadores antigos)"""
+        for target in self.imports.pop(filepath, []):
+            importers = self.importers.get(target)
+            if importers is not None:
+                importers.remove(filepath)
+                if not importers:
+                    del self.importers[target]
+        for specifier in specifiers:
+            importers = self.specifier_importers.get(specifier)
+            if importers is not None and filepath in importers:
+                importers.remove(filepath)
+                if not importers:
+                    del self.specifier_importers[specifier]
+
+    def _link(self):
+        """Resolve todos os especificadores em arquivos e monta as arestas reversas"""
+        self.modules = self._build_modules()
+        self.imports = {}
+        self.importers = defaultdict(list)
+        self.specifier_importers = defaultdict(list)
+        for filepath in self.specifiers:
+            self._link_file(filepath)
+
+    def _patch(self, links: dict) -> bool:
+        """
+        Corrige as arestas gravadas só nos arquivos afetados
+
+        Religa os arquivos alterados ou novos e os que citam um especificador
+        cuja resolução mudou (porque um arquivo foi criado ou removido); as
+        arestas dos arquivos removidos são apagadas. O resultado é igual ao
+        de um _link completo, inclusive na ordem das listas. Os especificadores
+        de comparação são os gravados junto com as arestas, então um cache
+        salvo sem as arestas (execução interrompida) não as deixa inconsistentes.
+
+        Returns:
+            True se alguma aresta mudou
+        """
+        previous: Dict[str, List[str]] = links['specifiers']
+        self.modules = links['modules']
+        self.imports = links['imports']
+        self.importers = defaultdict(list, links['importers'])
+        self.specifier_importers = defaultdict(list, links['specifier_importers'])
+
+        removed = [filepath for filepath in previous if filepath not in self.specifiers]
+        stale = {
+            filepath for filepath, specifiers in self.specifiers.items()
+            if previous.get(filepath) != specifiers
+        }
+        if not removed and not stale:
+            return False
+
+        if removed or any(filepath not in previous for filepath in stale):
+            # Arquivos entraram ou saíram: só especificadores com outra resolução afetam terceiros
+            modules = self._build_modules()
+            for key in modules.keys() | self.modules.keys():
+                if modules.get(key) != self.modules.get(key):
+                    stale.update(self.specifier_importers.get(key, ()))
+            self.modules = modules
+            stale.difference_update(removed)
+
+        touched: Set[str] = set()
+        for filepath in removed + sorted(stale):
+            old = previous.get(filepath, [])
+            touched.update(old)
+            touched.update(self.imports.get(filepath, []))
+            self._unlink_file(filepath, old)
+        for filepath in stale:
+            self._link_file(filepath, touched)
+
+        # Listas reordenadas pela varredura, como em um _link completo
+        order = {filepath: index for index, filepath in enumerate(self.specifiers)}
+        for key in touched:
+            for index in (self.importers, self.specifier_importers):
+                if key in index:
+                    index[key].sort(key=order.__getitem__)
+        self.imports = {filepath: self.imports[filepath] for filepath in self.specifiers}
+        return True
+
+    def _load_links(self) -> Optional[dict]:
+        """Arestas gravadas na execução anterior (None se ausentes ou de outra versão)"""
+        try:
+            with open(self.links_path, 'r', encoding='utf-8') as f:
+                links = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if links.get('key') != self.cache_key:
+            return None
+        return links
+
+    def _save_links(self):
+        """Grava módulos, arestas e índices reversos (escrita atômica)"""
+        os.makedirs(os.path.dirname(self.links_path) or '.', exist_ok=True)
+        write_text_atomic(self.links_path, json.dumps({
+            'key': self.cache_key,
+            'specifiers': self.specifiers,
+            'modules': self.modules,
+            'imports': self.imports,
+            'importers': self.importers,
+            'specifier_importers': self.specifier_importers,
+        }))
+
+    def resolve(self, target: str) -> Optional[str]:
+        """Arquivo correspondente a um caminho (src/...) ou especificador (@/...)"""
+        if target in self.specifiers:
+            return target
+        key = canonical_specifier(target)
+        if key is None and target.startswith(self.src_root + '/'):
+            key = self._module_id(target)
+        return self.modules.get(key) if key else None
+
+    def glob_targets(self, pattern: str) -> List[str]:
+        """Arquivos casados por um padrão canônico de import.meta.glob (@/pages/**/*.tsx)"""
+        regex = glob_regex(pattern)
+        return [filepath for filepath in self.specifiers if regex.match(self._module_id(filepath))]
+
+    def prefix_targets(self, prefix: str) -> List[str]:
+        """Arquivos que um import(`prefixo${...}`) pode carregar"""
+        return [filepath for filepath in self.specifiers if self._module_id(filepath).startswith(prefix)]
+
+    def importers_of(self, target: str) -> List[str]:
+        """Arquivos que importam `target` (caminho ou especificador @/...)"""
+        filepath = self.resolve(target)
+        if filepath is not None:
+            return list(self.importers.get(filepath, []))
+        key = canonical_specifier(target)
+        return list(self.specifier_importers.get(key, [])) if key else []
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Consulta o grafo de imports de src/")
+    parser.add_argument('command', choices=['importers', 'imports', 'update'],
+                        help="importers = quem importa X; imports = o que X importa; update = só atualiza")
+    parser.add_argument('targets', nargs='*', help="Arquivos (src/...) ou especificadores (@/...)")
+    parser.add_argument('--src', default="src", help="Diretório raiz (padrão: src)")
+    parser.add_argument(
+        '--jobs', '-j', type=int, default=1,
+        help="Processos paralelos para reindexar (0 = todos os núcleos, padrão: 1)"
+    )
+    parser.add_argument('--rebuild', action='store_true', help="Descarta o cache e reindexa tudo")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    graph = ImportGraph(args.src)
+
+    start = time.perf_counter()
+    reused, reparsed = graph.update(resolve_jobs(args.jobs), rebuild=args.rebuild)
+    elapsed = time.perf_counter() - start
+    print(f"🗂️  Índice de imports: {len(graph.specifiers)} arquivos "
+          f"({reused} reaproveitados, {reparsed} relidos) em {elapsed * 1000:.0f} ms")
+
+    for target in args.targets:
+        start = time.perf_counter()
+        if args.command == 'importers':
+            results = graph.importers_of(target)
+            label = "importado por"
+        else:
+            filepath = graph.resolve(target)
+            results = graph.imports.get(filepath, []) if filepath else []
+            label = "importa"
+        elapsed = time.perf_counter() - start
+        print(f"\n📄 {target} {label} {len(results)} arquivos ({elapsed * 1000:.2f} ms):")
+        for filepath in results:
+            print(f"   {filepath}")
+
+
+if __name__ == "__main__":
+    main()
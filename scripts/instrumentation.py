@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Instrumentação por fase para os scripts de análise (--profile / --cprofile)
+
+Cada fase registra tempo de parede, tempo de CPU e quantidade de itens.
+As fases podem ser marcadas em sequência (mark fecha a anterior) ou com
+`with profiler.phase(...)`. No final, finish() imprime a tabela, grava o
+relatório JSON e, com --cprofile, o arquivo .prof do cProfile.
+
+Desligado (padrão), phase() devolve sempre o mesmo objeto inerte e
+mark()/count() retornam na primeira linha: o custo é uma chamada de método.
+
+Uso em um script:
+
+    profiler = Profiler.from_args(args, 'remove_console_logs')
+    profiler.mark('varredura')
+    ...
+    profiler.count(len(files))
+    profiler.mark('relatório')
+    ...
+    profiler.finish()
+"""
+
+import cProfile
+import json
+import os
+import pstats
+import time
+from datetime import datetime
+from typing import List, Optional
+
+PROFILE_DIR = ".analysis-cache/profiles"
+
+# Funções listadas no resumo do cProfile (ordenadas por tempo acumulado)
+CPROFILE_TOP = 15
+
+
+class Phase:
+    """Tempo de parede, CPU e itens de uma fase"""
+
+    __slots__ = ('name', 'wall', 'cpu', 'items', '_wall_start', '_cpu_start')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.items = 0
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.process_time()
+
+    def add(self, items: int = 1) -> None:
+        self.items += items
+
+    def close(self) -> None:
+        self.wall = time.perf_counter() - self._wall_start
+        self.cpu = time.process_time() - self._cpu_start
+
+    def to_dict(self) -> dict:
+        return {
+            'name': self.name,
+            'wall_seconds': round(self.wall, 6),
+            'cpu_seconds': round(self.cpu, 6),
+            'items': self.items,
+            'items_per_s': round(self.items / self.wall, 1) if self.items and self.wall else None,
+        }
+
+
+class _NullPhase:
+    """Fase inerte usada com a instrumentação desligada"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def add(self, items: int = 1) -> None:
+        pass
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class _PhaseContext:
+    def __init__(self, profiler: 'Profiler', name: str):
+        self.profiler = profiler
+        self.phase = Phase(name)
+
+    def __enter__(self) -> Phase:
+        return self.phase
+
+    def __exit__(self, *exc):
+        self.phase.close()
+        self.profiler.phases.append(self.phase)
+        return False
+
+
+class Profiler:
+    """
+    Coleta as fases de uma execução
+
+    Args:
+        enabled: liga a instrumentação (sem isso, tudo é no-op)
+        script: nome usado no relatório e no caminho padrão
+        report_path: onde gravar o JSON (padrão: .analysis-cache/profiles/<script>.json)
+        cprofile_path: se informado, roda o cProfile e grava as estatísticas aqui
+    """
+
+    def __init__(self, enabled: bool = False, script: str = '', report_path: Optional[str] = None,
+                 cprofile_path: Optional[str] = None):
+        self.enabled = enabled or bool(cprofile_path)
+        self.script = script
+        self.report_path = report_path or os.path.join(PROFILE_DIR, f"{script or 'profile'}.json")
+        self.cprofile_path = cprofile_path
+        self.phases: List[Phase] = []
+        self._current: Optional[Phase] = None
+        self._cprofile = None
+        if not self.enabled:
+            return
+        self.started = datetime.now().isoformat(timespec='seconds')
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.process_time()
+        if cprofile_path:
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+
+    @classmethod
+    def from_args(cls, args, script: str) -> 'Profiler':
+        """Profiler configurado pelas opções de add_profile_arguments"""
+        return cls(args.profile, script, args.profile_out, args.cprofile)
+
+    def phase(self, name: str):
+        """Context manager de uma fase; o objeto devolvido aceita .add(itens)"""
+        if not self.enabled:
+            return _NULL_PHASE
+        return _PhaseContext(self, name)
+
+    def mark(self, name: str) -> None:
+        """Fecha a fase corrente (se houver) e abre outra"""
+        if not self.enabled:
+            return
+        self._close_current()
+        self._current = Phase(name)
+
+    def count(self, items: int = 1) -> None:
+        """Soma itens processados à fase corrente"""
+        if not self.enabled or self._current is None:
+            return
+        self._current.items += items
+
+    def _close_current(self) -> None:
+        if self._current is not None:
+            self._current.close()
+            self.phases.append(self._current)
+            self._current = None
+
+    def report(self) -> dict:
+        return {
+            'script': self.script,
+            'started': self.started,
+            'wall_seconds': round(self._wall, 6),
+            'cpu_seconds': round(self._cpu, 6),
+            'phases': [phase.to_dict() for phase in self.phases],
+        }
+
+    def finish(self) -> Optional[dict]:
+        """Fecha a última fase, imprime o resumo e grava os relatórios"""
+        if not self.enabled:
+            return None
+        self._close_current()
+        self._wall = time.perf_counter() - self._wall_start
+        self._cpu = time.process_time() - self._cpu_start
+        if self._cprofile is not None:
+            self._cprofile.disable()
+
+        report = self.report()
+        print_phases(report)
+
+        os.makedirs(os.path.dirname(self.report_path) or '.', exist_ok=True)
+        with open(self.report_path, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"⏱️  Tempos por fase salvos em: {self.report_path}")
+
+        if self._cprofile is not None:
+            os.makedirs(os.path.dirname(self.cprofile_path) or '.', exist_ok=True)
+            self._cprofile.dump_stats(self.cprofile_path)
+            print(f"\n🔬 cProfile (top {CPROFILE_TOP} por tempo acumulado):")
+            pstats.Stats(self.cprofile_path).sort_stats('cumulative').print_stats(CPROFILE_TOP)
+            print(f"🔬 Estatísticas do cProfile salvas em: {self.cprofile_path} "
+                  f"(python -m pstats {self.cprofile_path})")
+        return report
+
+
+def print_phases(report: dict) -> None:
+    """Tabela de fases do relatório"""
+    print()
+    print(f"⏱️  {'Fase':<40} {'Parede (s)':>11} {'CPU (s)':>9} {'Itens':>9} {'Itens/s':>10}")
+    print("   " + "-" * 83)
+    for phase in report['phases']:
+        rate = f"{phase['items_per_s']:.0f}" if phase['items_per_s'] else "-"
+        print(f"   {phase['name']:<40} {phase['wall_seconds']:>11.3f} {phase['cpu_seconds']:>9.3f} "
+              f"{phase['items']:>9} {rate:>10}")
+    print(f"   {'Total':<40} {report['wall_seconds']:>11.3f} {report['cpu_seconds']:>9.3f}")
+
+
+def add_profile_arguments(parser) -> None:
+    """Opções --profile, --profile-out e --cprofile"""
+    parser.add_argument(
+        '--profile', action='store_true',
+        help="Mede tempo de parede/CPU e itens de cada fase e grava um relatório JSON"
+    )
+    parser.add_argument(
+        '--profile-out', metavar='ARQUIVO.json',
+        help=f"Onde gravar o relatório de tempos (padrão: {PROFILE_DIR}/<script>.json)"
+    )
+    parser.add_argument(
+        '--cprofile', metavar='ARQUIVO.prof',
+        help="Roda o cProfile e grava as estatísticas (implica --profile)"
+    )
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Inventário de src/ em uma passada: regenera os quatro relatórios de entrada
+da matriz de similaridade
+
+Cada arquivo de src/ é classificado pelo nome, com as mesmas regras dos
+scripts analyze-dashboards.sh, analyze-command-centers.sh,
+analyze-services-utilities.sh e find-similar-components.sh. Os arquivos
+classificados são lidos uma única vez, em paralelo, para medir linhas/bytes
+e testar os padrões de componente.
+
+Saídas (mesmos esquemas dos relatórios atuais):
+    dashboard_analysis_report.json
+    command_center_analysis_report.json
+    similar_components_report.json
+    services_utilities_report.json
+
+Diferenças em relação aos scripts shell: arquivos ignorados pelo .gitignore
+ficam de fora, a ordem é a de sorted() do Python (não a do locale) e um
+arquivo que casa com "command" e "center" aparece uma só vez.
+
+Uso:
+    python scripts/inventory.py -j 0
+"""
+
+import argparse
+import json
+import os
+import re
+import time
+from fnmatch import fnmatchcase
+from typing import Dict, List, Optional, Tuple
+
+from feature_store import COMPONENT_EXTENSIONS, COMPONENT_PATTERNS, REPOSITORY, analysis_date, component_report
+from parallel import resolve_jobs, run_sharded
+from source_files import iter_source_files, open_bytes
+
+REPORT_FILES = {
+    'dashboards': 'dashboard_analysis_report.json',
+    'command_centers': 'command_center_analysis_report.json',
+    'components': 'similar_components_report.json',
+    'services': 'services_utilities_report.json',
+}
+
+# Categorias por trecho do caminho (grep -i sobre a lista de arquivos)
+DASHBOARD_CATEGORIES = {
+    'analytics_dashboards': ('analytics', 'metric', 'chart', 'report', 'statistic'),
+    'monitoring_dashboards': ('monitor', 'alert', 'status', 'health', 'track'),
+    'management_dashboards': ('manage', 'admin', 'control', 'config'),
+    'operational_dashboards': ('operation', 'fleet', 'crew', 'vessel', 'ship'),
+}
+COMMAND_CENTER_CATEGORIES = {
+    'fleet_command': ('fleet',),
+    'operations_command': ('operation',),
+    'mission_command': ('mission',),
+    'control_centers': ('control',),
+}
+SERVICE_CATEGORIES = {
+    'api_services': ('api',),
+    'data_services': ('data',),
+    'auth_services': ('auth',),
+    'storage_services': ('storage',),
+}
+
+SERVICE_NAME_PATTERNS = ('*service*.ts', '*service*.tsx')
+UTILITY_NAME_PATTERNS = ('*util*.ts', '*utils*.ts', '*helper*.ts', '*helpers*.ts')
+TEST_NAME_PATTERNS = ('*.test.*', '*.spec.*')
+
+# Os padrões de componente em bytes: '.' não cruza linhas, então buscar no
+# arquivo inteiro equivale ao grep linha a linha
+_COMPONENT_PATTERNS_BYTES = [re.compile(p.pattern.encode()) for p in COMPONENT_PATTERNS.values()]
+
+
+def classify(path: str) -> List[str]:
+    """Grupos (chaves de REPORT_FILES) a que o arquivo pertence, pelo nome"""
+    name = os.path.basename(path)
+    lower = name.lower()
+    groups = []
+    if 'dashboard' in lower:
+        groups.append('dashboards')
+    if 'command' in lower or (('center' in lower or 'control' in lower) and 'command' not in path):
+        groups.append('command_centers')
+    if name.endswith(COMPONENT_EXTENSIONS):
+        groups.append('components')
+    if not any(fnmatchcase(name, pattern) for pattern in TEST_NAME_PATTERNS):
+        if any(fnmatchcase(lower, pattern) for pattern in SERVICE_NAME_PATTERNS):
+            groups.append('services')
+        if any(fnmatchcase(lower, pattern) for pattern in UTILITY_NAME_PATTERNS):
+            groups.append('utilities')
+    return groups
+
+
+def measure_files(items):
+    """
+    Linhas, bytes e padrões de componente de uma fatia de arquivos (worker)
+
+    Returns:
+        [(arquivo, linhas, bytes, flags dos padrões ou None), ...]
+    """
+    results = []
+    for filepath, is_component in items:
+        try:
+            with open_bytes(filepath) as data:
+                data = data[:]
+        except OSError as e:
+            print(f"  ❌ Erro ao ler {filepath}: {e}")
+            continue
+        patterns: Optional[List[bool]] = None
+        if is_component:
+            patterns = [pattern.search(data) is not None for pattern in _COMPONENT_PATTERNS_BYTES]
+        results.append((filepath, data.count(b'\n'), len(data), patterns))
+    return results
+
+
+def count_categories(paths: List[str], categories: Dict[str, Tuple[str, ...]]) -> Dict[str, int]:
+    """Arquivos cujo caminho contém algum trecho de cada categoria (sem diferenciar maiúsculas)"""
+    lowered = [path.lower() for path in paths]
+    return {
+        key: sum(1 for path in lowered if any(word in path for word in words))
+        for key, words in categories.items()
+    }
+
+
+def build_inventory(src_root: str = "src", jobs: int = 1) -> Dict[str, dict]:
+    """
+    Percorre src_root uma vez e monta os quatro relatórios
+
+    Returns:
+        {chave de REPORT_FILES: relatório}
+    """
+    groups: Dict[str, List[str]] = {key: [] for key in ('dashboards', 'command_centers', 'components',
+                                                        'services', 'utilities')}
+    items = []
+    for path in iter_source_files(src_root, extensions=('',)):
+        filepath = path.as_posix()
+        file_groups = classify(filepath)
+        if not file_groups:
+            continue
+        for group in file_groups:
+            groups[group].append(filepath)
+        items.append((filepath, 'components' in file_groups))
+
+    measured = {}
+    for results in run_sharded(measure_files, items, jobs):
+        for filepath, lines, size, patterns in results:
+            measured[filepath] = (lines, size, patterns)
+
+    def entries(group):
+        return [
+            {"path": filepath, "lines": measured[filepath][0], "size_bytes": measured[filepath][1]}
+            for filepath in sorted(groups[group]) if filepath in measured
+        ]
+
+    dashboards = sorted(groups['dashboards'])
+    command_centers = sorted(groups['command_centers'])
+    services = sorted(groups['services'])
+    date = analysis_date()
+
+    command_center_counts = count_categories(command_centers, COMMAND_CENTER_CATEGORIES)
+    generic = sum(
+        1 for path in command_centers
+        if not any(word in path.lower() for words in COMMAND_CENTER_CATEGORIES.values() for word in words)
+    )
+    return {
+        'dashboards': {
+            "analysis_date": date,
+            "repository": REPOSITORY,
+            "summary": {"total_dashboards": len(dashboards), **count_categories(dashboards, DASHBOARD_CATEGORIES)},
+            "files": entries('dashboards'),
+        },
+        'command_centers': {
+            "analysis_date": date,
+            "repository": REPOSITORY,
+            "summary": {
+                "total_command_centers": len(command_centers),
+                **command_center_counts,
+                "generic_centers": generic,
+            },
+            "files": entries('command_centers'),
+        },
+        'components': component_report([
+            (filepath, measured[filepath][2]) for filepath in sorted(groups['components']) if filepath in measured
+        ]),
+        'services': {
+            "analysis_date": date,
+            "repository": REPOSITORY,
+            "summary": {
+                "total_services": len(services),
+                "total_utilities": len(groups['utilities']),
+                **count_categories(services, SERVICE_CATEGORIES),
+            },
+            "services": entries('services'),
+            "utilities": entries('utilities'),
+        },
+    }
+
+
+def write_reports(reports: Dict[str, dict], out_dir: str = ".") -> List[str]:
+    """Grava os relatórios; devolve os caminhos escritos"""
+    written = []
+    for key, filename in REPORT_FILES.items():
+        path = os.path.join(out_dir, filename)
+        with open(path, 'w') as f:
+            json.dump(reports[key], f, indent=2)
+        written.append(path)
+    return written
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Regenera os relatórios de inventário de src/ em uma passada")
+    parser.add_argument('--src', default="src", help="Diretório raiz (padrão: src)")
+    parser.add_argument('--out-dir', default=".", help="Onde gravar os relatórios (padrão: diretório atual)")
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help="Processos paralelos (0 = todos os núcleos, padrão: 1)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    start = time.perf_counter()
+    reports = build_inventory(args.src, resolve_jobs(args.jobs))
+    for path in write_reports(reports, args.out_dir):
+        print(f"✅ {path}")
+    print(f"\n   Dashboards:      {reports['dashboards']['summary']['total_dashboards']}")
+    print(f"   Command Centers: {reports['command_centers']['summary']['total_command_centers']}")
+    print(f"   Componentes:     {reports['components']['summary']['total_components']}")
+    print(f"   Services:        {reports['services']['summary']['total_services']}")
+    print(f"   Utilities:       {reports['services']['summary']['total_utilities']}")
+    print(f"\n⏱️  {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
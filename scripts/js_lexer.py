@@ -0,0 +1,566 @@
+#!/usr/bin/env python3
+"""
+Tokenizador mínimo de JS/TS/TSX para os scripts de varredura
+
+Faz uma única passada linear sobre o arquivo e entende strings, template
+literals (com ${...} aninhados), comentários e literais de regex, de modo que
+parênteses e chaves dentro deles não contam. Não é um parser completo: o
+objetivo é saber com precisão onde cada chamada termina e em qual bloco
+(catch/finally, função) cada token está.
+"""
+
+import re
+from typing import List, NamedTuple, Optional
+
+# Tipos de token
+NAME = 'name'
+NUMBER = 'num'
+STRING = 'str'
+TEMPLATE = 'tpl'
+REGEX = 'regex'
+PUNCT = 'punct'
+OP = 'op'
+COMMENT = 'comment'
+
+
+class Token(NamedTuple):
+    kind: str
+    value: str
+    start: int
+    end: int
+
+
+# O \s* inicial consome o espaço em branco dentro do próprio regex (bem mais
+# rápido do que deixar o search() pular caractere por caractere); o token
+# começa no grupo que casou. Identificadores e pontuação vêm primeiro por
+# serem os mais frequentes.
+_TOKEN_RE = re.compile(r'''\s*(?:
+    (?P<name>[^\W\d][\w$]*|\$[\w$]*)
+  | (?P<punct>[{}()\[\];,])
+  | (?P<comment>//[^\n]*|/\*[\s\S]*?(?:\*/|\Z))
+  | (?P<str>'[^'\\\n]*(?:\\[\s\S][^'\\\n]*)*'?|"[^"\\\n]*(?:\\[\s\S][^"\\\n]*)*"?)
+  | (?P<tpl>`)
+  | (?P<num>\d[\w.]*|\.\d\w*)
+  | (?P<slash>/)
+  | (?P<op>=>|\?\.(?!\d)|\.\.\.|[^\s\w$'"`/{}()\[\];,])
+)''', re.VERBOSE)
+
+# Trecho de template literal até o fechamento (`) ou o início de ${
+_TEMPLATE_CHUNK_RE = re.compile(r'(?:[^`\\$]|\\[\s\S]|\$(?!\{))*(`|\$\{)?')
+
+# Literal de regex em uma única linha, com classes [...] e flags
+_REGEX_RE = re.compile(r'/(?![*/])(?:[^/\\\[\n]|\\.|\[(?:[^\]\\\n]|\\.)*\])+/[A-Za-z]*')
+
+# Palavras-chave após as quais uma barra inicia um regex (e não uma divisão)
+_REGEX_PREFIX_KEYWORDS = frozenset({
+    'return', 'typeof', 'instanceof', 'in', 'of', 'new', 'delete', 'void',
+    'throw', 'case', 'do', 'else', 'yield', 'await',
+})
+
+
+def _regex_allowed(prev: Optional[Token], pos: int) -> bool:
+    """Decide se uma barra na posição atual inicia um literal de regex"""
+    if prev is None:
+        return True
+    if prev.kind == PUNCT:
+        return prev.value in '([{;,'
+    if prev.kind == OP:
+        # </div> em JSX: a barra colada no '<' fecha uma tag
+        return not (prev.value == '<' and prev.end == pos)
+    if prev.kind == NAME:
+        return prev.value in _REGEX_PREFIX_KEYWORDS
+    return False
+
+
+def tokenize(text: str, keep_comments: bool = False) -> List[Token]:
+    """
+    Quebra o código em tokens em uma passada linear
+
+    Espaços em branco não geram tokens; comentários só são mantidos com
+    keep_comments=True. Cada trecho de template literal vira um token TEMPLATE
+    e as expressões dentro de ${...} viram tokens normais.
+    """
+    tokens: List[Token] = []
+    append = tokens.append
+    match = _TOKEN_RE.match
+    # tuple.__new__ evita o custo do construtor do NamedTuple no laço quente
+    new_token = tuple.__new__
+    # Para cada '{' aberto: True se for o ${ de um template literal
+    brace_stack: List[bool] = []
+    prev: Optional[Token] = None
+    pos = 0
+    length = len(text)
+
+    while pos < length:
+        m = match(text, pos)
+        if m is None:
+            break
+        kind = m.lastgroup
+        group = m.lastindex
+        start = m.start(group)
+        pos = m.end()
+
+        if kind == NAME:
+            tok = new_token(Token, (NAME, m.group(group), start, pos))
+            append(tok)
+            prev = tok
+            continue
+
+        if kind == COMMENT:
+            if keep_comments:
+                append(new_token(Token, (COMMENT, m.group(group), start, pos)))
+            continue
+
+        if kind == 'slash':
+            if _regex_allowed(prev, start):
+                rm = _REGEX_RE.match(text, start)
+                if rm:
+                    pos = rm.end()
+                    tok = new_token(Token, (REGEX, rm.group(), start, pos))
+                    append(tok)
+                    prev = tok
+                    continue
+            if text.startswith('/=', start):
+                pos = start + 2
+            tok = new_token(Token, (OP, text[start:pos], start, pos))
+        elif kind == TEMPLATE or (kind == PUNCT and m.group(group) == '}' and brace_stack and brace_stack[-1]):
+            # Abertura de template ou retomada após o '}' de um ${...}
+            if kind == PUNCT:
+                brace_stack.pop()
+            cm = _TEMPLATE_CHUNK_RE.match(text, pos)
+            pos = cm.end()
+            if cm.group(1) == '${':
+                brace_stack.append(True)
+            tok = new_token(Token, (TEMPLATE, text[start:pos], start, pos))
+        elif kind == PUNCT:
+            value = m.group(group)
+            if value == '{':
+                brace_stack.append(False)
+            elif value == '}' and brace_stack:
+                brace_stack.pop()
+            tok = new_token(Token, (PUNCT, value, start, pos))
+        else:
+            tok = new_token(Token, (kind, m.group(group), start, pos))
+
+        append(tok)
+        prev = tok
+
+    return tokens
+
+
+def find_closing(tokens: List[Token], open_index: int) -> int:
+    """
+    Retorna o índice do token que fecha o '(' / '[' / '{' em open_index
+
+    Returns:
+        Índice do fechamento, ou -1 se o arquivo terminar antes
+    """
+    depth = 0
+    for i in range(open_index, len(tokens)):
+        tok = tokens[i]
+        if tok.kind != PUNCT:
+            continue
+        if tok.value in '([{':
+            depth += 1
+        elif tok.value in ')]}':
+            depth -= 1
+            if depth == 0:
+                return i
+    return -1
+
+
+def has_newline_between(text: str, start: int, end: int) -> bool:
+    return text.find('\n', start, end) != -1
+
+
+# Cabeçalhos de controle cujo corpo pode ser um único statement sem chaves
+CONTROL_KEYWORDS = frozenset({'if', 'for', 'while', 'with'})
+
+# Palavras-chave que exigem uma expressão/statement em seguida
+OPERAND_KEYWORDS = _REGEX_PREFIX_KEYWORDS | {'else', 'export', 'default', 'extends'}
+
+
+class ScopeTracker:
+    """
+    Acompanha parênteses e chaves durante a passada sobre os tokens
+
+    Sabe se o token atual está dentro de um bloco catch/finally (ou de um
+    callback passado a .catch()/.finally()), se um ')' acabou de fechar o
+    cabeçalho de um if/for/while (corpo sem chaves) e se um '{' abre uma
+    expressão (atributo JSX title={...} ou objeto após '=') e não um bloco.
+    """
+
+    def __init__(self):
+        self.paren_stack: List[Optional[str]] = []
+        self.brace_stack: List[Optional[str]] = []
+        self.catch_depth = 0
+        # Rótulo do último '(' fechado (ex.: 'catch', 'if'), válido enquanto
+        # o token anterior for esse ')'
+        self.last_closed_paren: Optional[str] = None
+        self.prev: Optional[Token] = None
+        # Rótulos case/default de um switch: ternários pendentes e a posição
+        # do ':' que encerra o rótulo (após ele começa um statement)
+        self._pending_case = False
+        self._ternary_depth = 0
+        self._case_colon_start = -1
+
+    @property
+    def in_catch(self) -> bool:
+        """True dentro de um bloco catch/finally ou de um callback .catch()/.finally()"""
+        return self.catch_depth > 0
+
+    def _brace_label(self) -> Optional[str]:
+        prev = self.prev
+        if prev is None:
+            return None
+        if prev.kind == NAME and prev.value in ('catch', 'finally'):
+            return prev.value
+        if prev.kind == PUNCT and prev.value == ')' and self.last_closed_paren in ('catch', 'switch'):
+            return self.last_closed_paren
+        if prev.kind == OP and prev.value == '=':
+            return 'expression'
+        return None
+
+    def feed(self, tok: Token) -> None:
+        """Atualiza o estado com o próximo token significativo"""
+        if tok.kind == PUNCT:
+            value = tok.value
+            if value == '(':
+                prev = self.prev
+                label = prev.value if prev is not None and prev.kind == NAME else None
+                # promise.catch(...) / .finally(...): o callback é tratamento de erro
+                if label in ('catch', 'finally'):
+                    self.catch_depth += 1
+                self.paren_stack.append(label)
+            elif value == ')':
+                label = self.paren_stack.pop() if self.paren_stack else None
+                if label in ('catch', 'finally'):
+                    self.catch_depth -= 1
+                self.last_closed_paren = label
+            elif value == '{':
+                label = self._brace_label()
+                if label in ('catch', 'finally'):
+                    self.catch_depth += 1
+                self.brace_stack.append(label)
+            elif value == '}':
+                if self.brace_stack and self.brace_stack.pop() in ('catch', 'finally'):
+                    self.catch_depth -= 1
+        elif tok.kind == NAME:
+            if tok.value in ('case', 'default') and self.brace_stack and self.brace_stack[-1] == 'switch':
+                self._pending_case = True
+                self._ternary_depth = 0
+        elif tok.kind == OP and self._pending_case:
+            if tok.value == '?':
+                self._ternary_depth += 1
+            elif tok.value == ':':
+                if self._ternary_depth:
+                    self._ternary_depth -= 1
+                else:
+                    self._pending_case = False
+                    self._case_colon_start = tok.start
+        self.prev = tok
+
+    def at_statement_start(self, text: str, tok: Token) -> bool:
+        """
+        True se `tok` começa um statement que pode ser removido inteiro
+
+        Corpos sem chaves (if (x) console.log()), corpos de arrow function e
+        qualquer posição de expressão retornam False.
+        """
+        prev = self.prev
+        if prev is None:
+            return True
+        if prev.kind == PUNCT:
+            if prev.value == '{':
+                # title={console.log()}: apagar deixaria um atributo vazio
+                return self.brace_stack[-1] != 'expression'
+            if prev.value in ';}':
+                return True
+            if prev.value == ')':
+                if self.last_closed_paren in CONTROL_KEYWORDS:
+                    return False
+                return has_newline_between(text, prev.end, tok.start)
+            if prev.value == ']':
+                return has_newline_between(text, prev.end, tok.start)
+            return False
+        if prev.kind == NAME and prev.value in OPERAND_KEYWORDS:
+            return False
+        if prev.kind == OP:
+            # case "x": console.log() — mas não o ':' de um ternário ou objeto
+            return prev.value == ':' and prev.start == self._case_colon_start
+        # Identificador, número, string, template ou regex: fim de statement por ASI
+        return has_newline_between(text, prev.end, tok.start)
+
+
+def statement_end(text: str, tokens: List[Token], close_index: int) -> int:
+    """
+    Verifica se a expressão que termina em tokens[close_index] fecha o statement
+
+    Returns:
+        Índice do último token do statement (o ';' se houver), ou -1 se a
+        expressão continua (ex.: .then(...), &&, operador na linha seguinte)
+    """
+    nxt = close_index + 1
+    if nxt >= len(tokens):
+        return close_index
+    tok = tokens[nxt]
+    if tok.kind == PUNCT:
+        if tok.value == ';':
+            return nxt
+        if tok.value == '}':
+            return close_index
+    if not has_newline_between(text, tokens[close_index].end, tok.start):
+        return -1
+    if tok.kind in (NAME, NUMBER, STRING) or (tok.kind == PUNCT and tok.value == '{'):
+        return close_index
+    return -1
+
+
+# ---------------------------------------------------------------------------
+# Varredura "grossa" para o analisador: só para nos tokens que mudam o escopo
+# (strings, comentários, templates, regex, chaves, parênteses, =>, catch,
+# finally) e nas chamadas console.X(. Todo o resto é pulado pelo próprio
+# motor de regex, então o custo fica próximo ao de uma busca simples.
+# Pares (...) e {...} sem nada aninhado (nem strings/barras) viram um único
+# token: não podem conter chamadas nem abrir escopos.
+# ---------------------------------------------------------------------------
+
+# Todas as alternativas começam com um caractere literal e não há grupos
+# nomeados: assim o sre monta o conjunto de primeiros caracteres e pula o
+# texto irrelevante em C. O tipo do token é decidido pelo primeiro caractere.
+_SCOPE_RE = re.compile(r'''
+    //[^\n]* | /\*[\s\S]*?(?:\*/|\Z)
+  | '[^'\\\n]*(?:\\[\s\S][^'\\\n]*)*'? | "[^"\\\n]*(?:\\[\s\S][^"\\\n]*)*"?
+  | `
+  | \([^(){}'"`/]*\) | \{[^(){}'"`/]*\}
+  | \{ | \} | \( | \)
+  | =>
+  | /
+  | console\s*\.\s*([A-Za-z]+)\s*\(
+  | catch | finally
+''', re.VERBOSE)
+
+_IDENT_CHARS = frozenset('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_$')
+
+# Cabeçalhos de função, procurados olhando para trás a partir do '(' dos
+# parâmetros, só na própria linha (limitada a _FUNC_HEAD_WINDOW caracteres)
+_FUNC_HEAD_WINDOW = 200
+_GENERICS = r'(?:<[^<>]*(?:<[^<>]*>[^<>]*)*>\s*)?'
+_DECL_HEAD_RE = re.compile(
+    r'(?:\bfunction\b\s*\*?\s*(?P<fname>[\w$]+)?|(?P<method>[\w$]+))\s*' + _GENERICS + r'$'
+)
+_ARROW_PARAMS_HEAD_RE = re.compile(
+    r'(?P<name>[\w$]+)\s*(?::[^=;(){}]*)?(?<![=!<>])=\s*(?:async\s*)?' + _GENERICS + r'$'
+    r'|(?P<prop>[\w$]+)\s*:\s*(?:async\s*)?' + _GENERICS + r'$'
+)
+_ARROW_SINGLE_PARAM_RE = re.compile(
+    r'(?P<name>[\w$]+)\s*(?::[^=;(){}]*)?(?<![=!<>])=\s*(?:async\s+)?[\w$]+\s*$'
+    r'|(?P<prop>[\w$]+)\s*:\s*(?:async\s+)?[\w$]+\s*$'
+)
+_NOT_FUNCTION_NAMES = frozenset({
+    'if', 'for', 'while', 'switch', 'catch', 'with', 'return', 'typeof',
+    'await', 'yield', 'new', 'async', 'function', 'in', 'of', 'void', 'delete',
+})
+
+
+class ConsoleCall(NamedTuple):
+    start: int
+    member: str
+    in_catch: bool
+    function: Optional[str]
+
+
+def _prev_significant(text: str, pos: int) -> int:
+    """Índice do último caractere não branco antes de pos (-1 se não houver)"""
+    j = pos - 1
+    while j >= 0 and text[j] in ' \t\r\n':
+        j -= 1
+    return j
+
+
+def _slash_starts_regex(text: str, pos: int) -> bool:
+    """Mesma regra do tokenize(), mas olhando o texto cru antes da barra"""
+    j = _prev_significant(text, pos)
+    if j < 0:
+        return True
+    c = text[j]
+    if c in _IDENT_CHARS:
+        k = j
+        while k >= 0 and text[k] in _IDENT_CHARS:
+            k -= 1
+        return text[k + 1:j + 1] in _REGEX_PREFIX_KEYWORDS
+    if c in ')]}"\'`':
+        return False
+    # </div> em JSX
+    return not (c == '<' and j == pos - 1)
+
+
+def _head_window(text: str, end: int) -> str:
+    """Trecho da linha que antecede `end`, onde fica o cabeçalho da função"""
+    start = max(text.rfind('\n', 0, end) + 1, end - _FUNC_HEAD_WINDOW)
+    return text[start:end]
+
+
+def _declared_function_name(text: str, paren_start: int):
+    """
+    Classifica o '(' em paren_start seguido de ') {' como função/método
+
+    Returns:
+        (é função?, nome ou None)
+    """
+    m = _DECL_HEAD_RE.search(_head_window(text, paren_start))
+    if m is None:
+        return False, None
+    if m.group('method') is not None:
+        name = m.group('method')
+        return (False, None) if name in _NOT_FUNCTION_NAMES else (True, name)
+    return True, m.group('fname')
+
+
+def _arrow_function_name(text: str, head_end: int, single_param: bool) -> Optional[str]:
+    """Nome de uma arrow function atribuída (const f = (...) => / f: x =>)"""
+    regex = _ARROW_SINGLE_PARAM_RE if single_param else _ARROW_PARAMS_HEAD_RE
+    m = regex.search(_head_window(text, head_end))
+    if m is None:
+        return None
+    return m.group('name') or m.group('prop')
+
+
+def scan_console_calls(text: str) -> List[ConsoleCall]:
+    """
+    Encontra as chamadas console.X( reais de um arquivo em uma passada
+
+    Ignora ocorrências em comentários, strings, templates e regex, e mantém
+    uma pilha de escopos para saber se cada chamada está em um bloco
+    catch/finally (ou callback .catch()/.finally()) e em qual função nomeada.
+    Para no último 'console' do arquivo, já que nada depois importa.
+    """
+    calls: List[ConsoleCall] = []
+    limit = text.rfind('console')
+    if limit == -1:
+        return calls
+
+    search = _SCOPE_RE.search
+    length = len(text)
+    # Chaves: None, 'catch'/'finally', True (${ de template) ou o nome da função
+    # ('' para funções anônimas)
+    brace_stack: list = []
+    # Parênteses: (posição do '(', 'catch'/'finally' ou None)
+    paren_stack: List[tuple] = []
+    function_names: List[str] = []
+    catch_depth = 0
+    prev_kw = None
+    prev_char = None
+    last_closed = None
+    arrow_pos = -1
+    arrow_after_paren = None
+    pos = 0
+
+    while True:
+        m = search(text, pos)
+        if m is None:
+            break
+        start, pos = m.span()
+        if start > limit:
+            break
+        c = text[start]
+        kw = None
+
+        if c == '/':
+            nxt = text[start + 1] if start + 1 < length else ''
+            if nxt == '/' or nxt == '*':
+                continue
+            if _slash_starts_regex(text, start):
+                rm = _REGEX_RE.match(text, start)
+                if rm:
+                    pos = rm.end()
+                    c = 'regex'
+            else:
+                continue
+
+        elif c == "'" or c == '"':
+            continue
+
+        elif c == 'c' or c == 'f':
+            before = text[start - 1] if start else ''
+            member = m.group(1)
+            if member is not None:
+                if before not in _IDENT_CHARS and before != '.':
+                    named = [n for n in function_names if n]
+                    calls.append(ConsoleCall(
+                        start, member, catch_depth > 0, named[-1] if named else None
+                    ))
+                # O '(' da chamada foi consumido pelo match
+                paren_stack.append((pos - 1, None))
+                c = '('
+            else:
+                if before in _IDENT_CHARS or (pos < length and text[pos] in _IDENT_CHARS):
+                    continue
+                kw = m.group()
+
+        elif c == '=':
+            arrow_pos = start
+            arrow_after_paren = last_closed if prev_char == ')' else None
+
+        elif c == '`' or (c == '}' and brace_stack and brace_stack[-1] is True):
+            # Abertura de template ou retomada após o '}' de um ${...}
+            if c == '}':
+                brace_stack.pop()
+            cm = _TEMPLATE_CHUNK_RE.match(text, pos)
+            pos = cm.end()
+            if cm.group(1) == '${':
+                brace_stack.append(True)
+            c = '`'
+
+        elif pos - start > 1:
+            # Par (...) ou {...} sem nada aninhado: abre e fecha no mesmo token
+            if c == '(':
+                last_closed = (start, prev_kw)
+                c = ')'
+            else:
+                c = '}'
+
+        elif c == '(':
+            if prev_kw:
+                catch_depth += 1
+            paren_stack.append((start, prev_kw))
+
+        elif c == ')':
+            last_closed = paren_stack.pop() if paren_stack else None
+            if last_closed is not None and last_closed[1]:
+                catch_depth -= 1
+
+        elif c == '{':
+            label = None
+            if prev_kw:
+                label = prev_kw
+            elif prev_char == ')' and last_closed is not None:
+                if last_closed[1] == 'catch':
+                    label = 'catch'
+                else:
+                    is_function, name = _declared_function_name(text, last_closed[0])
+                    if is_function:
+                        label = name or ''
+            elif prev_char == '=':
+                if arrow_after_paren is not None:
+                    label = _arrow_function_name(text, arrow_after_paren[0], False) or ''
+                else:
+                    label = _arrow_function_name(text, arrow_pos, True) or ''
+
+            if label == 'catch' or label == 'finally':
+                catch_depth += 1
+            elif label is not None:
+                function_names.append(label)
+            brace_stack.append(label)
+
+        elif c == '}':
+            label = brace_stack.pop() if brace_stack else None
+            if label == 'catch' or label == 'finally':
+                catch_depth -= 1
+            elif label is not None and label is not True:
+                function_names.pop()
+
+        prev_kw = kw
+        prev_char = c
+
+    return calls
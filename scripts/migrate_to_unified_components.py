@@ -4,135 +4,228 @@ Script de Migração para Componentes Unificados
 FASE 2 - Consolidação de Componentes Duplicados
 
 Este script migra automaticamente todos os imports de Skeleton e NotificationCenter
-para as versões unificadas.
+para as versões unificadas. As regras (especificador antigo -> novo) ficam em
+migration_rules.json.
 """
 
+import argparse
+import json
 import os
-import re
-import shutil
 from datetime import datetime
-from typing import List, Dict, Tuple
-
-# Mapeamento de imports antigos para novos
-SKELETON_MIGRATIONS = {
-    # Imports antigos -> novo import unificado
-    r'from ["\']@/components/dashboard/DashboardSkeleton["\']': 'from "@/components/unified/Skeletons.unified"',
-    r'from ["\']@/components/RouteSkeletons["\']': 'from "@/components/unified/Skeletons.unified"',
-    r'from ["\']@/components/ui/enhanced-skeletons["\']': 'from "@/components/unified/Skeletons.unified"',
-    r'from ["\']@/components/ui/skeleton["\']': 'from "@/components/unified/Skeletons.unified"',
-    r'from ["\']@/components/ui/skeleton-loader["\']': 'from "@/components/unified/Skeletons.unified"',
-    r'from ["\']@/components/ui/skeleton-loaders["\']': 'from "@/components/unified/Skeletons.unified"',
-    r'from ["\']@/components/ui/loading-skeleton["\']': 'from "@/components/unified/Skeletons.unified"',
-    r'from ["\']@/components/ui/adaptive-skeleton["\']': 'from "@/components/unified/Skeletons.unified"',
-    r'from ["\']@/components/ui/SkeletonPro["\']': 'from "@/components/unified/Skeletons.unified"',
-    r'from ["\']@/components/ui/OptimizedSkeleton["\']': 'from "@/components/unified/Skeletons.unified"',
-    r'from ["\']@/components/ux/Skeletons["\']': 'from "@/components/unified/Skeletons.unified"',
-    r'from ["\']@/components/performance/SkeletonCard["\']': 'from "@/components/unified/Skeletons.unified"',
-    r'from ["\']@/components/performance/SkeletonLoader["\']': 'from "@/components/unified/Skeletons.unified"',
-    
-    # Relative imports
-    r'from ["\']\./SkeletonPro["\']': 'from "@/components/unified/Skeletons.unified"',
-    r'from ["\']\./SkeletonLoader["\']': 'from "@/components/unified/Skeletons.unified"',
-    r'from ["\']\.\./ui/skeleton["\']': 'from "@/components/unified/Skeletons.unified"',
-}
-
-NOTIFICATION_MIGRATIONS = {
-    # Imports antigos -> novo import unificado
-    r'from ["\']@/components/notifications/notification-center["\']': 'from "@/components/unified/NotificationCenter.unified"',
-    r'from ["\']@/components/notifications/NotificationCenter["\']': 'from "@/components/unified/NotificationCenter.unified"',
-    r'from ["\']@/components/notifications/NotificationCenterProfessional["\']': 'from "@/components/unified/NotificationCenter.unified"',
-    r'from ["\']@/components/notifications/enhanced-notification-center["\']': 'from "@/components/unified/NotificationCenter.unified"',
-    r'from ["\']@/components/notifications/real-time-notification-center["\']': 'from "@/components/unified/NotificationCenter.unified"',
-    r'from ["\']@/components/communication/notification-center["\']': 'from "@/components/unified/NotificationCenter.unified"',
-    r'from ["\']@/components/ui/NotificationCenter["\']': 'from "@/components/unified/NotificationCenter.unified"',
-    r'from ["\']@/components/ui/real-time-notifications["\']': 'from "@/components/unified/NotificationCenter.unified"',
-    r'from ["\']@/components/fleet/notification-center["\']': 'from "@/components/unified/NotificationCenter.unified"',
-    r'from ["\']@/components/maritime/notification-center["\']': 'from "@/components/unified/NotificationCenter.unified"',
-    
-    # Relative imports
-    r'from ["\']\./notification-center["\']': 'from "@/components/unified/NotificationCenter.unified"',
-    r'from ["\']\./NotificationCenter["\']': 'from "@/components/unified/NotificationCenter.unified"',
-}
-
-def create_backup(filepath: str) -> str:
-    """Cria backup do arquivo antes de modificar"""
-    backup_dir = "backups_component_migration"
-    os.makedirs(backup_dir, exist_ok=True)
-    
-    # Criar estrutura de diretórios no backup
-    rel_path = os.path.relpath(filepath, "src")
-    backup_path = os.path.join(backup_dir, rel_path)
-    os.makedirs(os.path.dirname(backup_path), exist_ok=True)
+from functools import partial
+from pathlib import Path
+from typing import List, Dict, Optional, Tuple
+
+from backup_store import STORE_DIR, BackupRun, BackupStore
+from import_graph import ImportGraph
+from parallel import resolve_jobs, run_sharded
+from source_diff import add_dry_run_arguments, diff_writer_from_args, render_diff
+from source_files import DECLARATION_SUFFIXES, TS_EXTENSIONS, iter_source_files, open_bytes, write_text_atomic
+from ts_imports import ALIAS_PREFIX, FROM_SPECIFIER_RE, canonical_specifier, importer_directory
+
+# Tabela de regras: especificador antigo (@/...) -> novo, agrupadas por conjunto
+RULES_FILE = Path(__file__).with_name("migration_rules.json")
+
+def create_backup(filepath: str, backup: BackupRun, data=None) -> str:
+    """
+    Registra o conteúdo do arquivo no store de backups antes de modificar
     
-    shutil.copy2(filepath, backup_path)
-    return backup_path
+    O arquivo é substituído por rename (write_text_atomic) e o inode antigo
+    não é mais escrito, então o blob pode ser um hard link do original.
+    """
+    return backup.backup(filepath, data, replaced=True)
+
+class MigrationEngine:
+    """
+    Regras de migração indexadas pelo especificador canônico (@/...)
+
+    Cada especificador `from "..."` do arquivo é extraído uma vez, resolvido
+    (relativos a partir do diretório do arquivo) e consultado em um dict,
+    então o custo por arquivo não depende do número de regras.
+    """
+
+    def __init__(self, migration_sets: List[Tuple[str, Dict[str, str]]], src_root: str = "src"):
+        self.src_root = src_root
+        self.set_names = [set_name for set_name, _ in migration_sets]
+        # especificador canônico -> (ordem da regra, conjunto, novo especificador)
+        self.rules: Dict[str, Tuple[int, str, str]] = {}
+        for set_name, migrations in migration_sets:
+            for old_specifier, new_specifier in migrations.items():
+                if not old_specifier.startswith(ALIAS_PREFIX):
+                    raise ValueError(f"Regra '{old_specifier}' deve usar o alias {ALIAS_PREFIX}")
+                key = canonical_specifier(old_specifier)
+                if key in self.rules:
+                    raise ValueError(f"Regra duplicada para '{old_specifier}'")
+                self.rules[key] = (len(self.rules), set_name, new_specifier)
+        
+        # Uma passada equivale a aplicar os conjuntos em sequência só se nenhum
+        # import novo for, ele mesmo, alvo de outra regra
+        for _, _, new_specifier in self.rules.values():
+            if canonical_specifier(new_specifier) in self.rules:
+                raise ValueError(f"Regras encadeadas: '{new_specifier}' é alvo de outra regra")
+        
+        # Pré-filtro sobre os bytes: diretórios de primeiro nível das regras
+        # (ex.: @/components/) e imports relativos, que podem resolver para elas
+        prefixes = {key[:key.find('/', len(ALIAS_PREFIX)) + 1] or key for key in self.rules}
+        self.prefilter = tuple(sorted(p.encode('utf-8') for p in prefixes)) + (b'./',)
+
+    @classmethod
+    def from_file(cls, path=RULES_FILE, src_root: str = "src") -> 'MigrationEngine':
+        """Carrega a tabela de regras do arquivo JSON"""
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return cls([(s['name'], s['rules']) for s in data['sets']], src_root)
+
+    def might_match(self, data) -> bool:
+        """Teste barato sobre os bytes do arquivo, sem decodificar"""
+        return any(data.find(prefix) != -1 for prefix in self.prefilter)
+
+    def rewrite(self, content: str, importer_dir: str = '') -> Tuple[str, Dict[str, List[str]]]:
+        """
+        Reescreve os especificadores que têm regra
+        
+        Returns:
+            (novo conteúdo, {conjunto: mudanças}) com uma mudança por regra
+            aplicada, mostrando a primeira ocorrência do import antigo
+        """
+        first_match: Dict[str, str] = {}
+        
+        def replace(match):
+            key = canonical_specifier(match.group(2), importer_dir)
+            rule = self.rules.get(key)
+            if rule is None:
+                return match.group()
+            first_match.setdefault(key, match.group())
+            return f'from "{rule[2]}"'
+        
+        content = FROM_SPECIFIER_RE.sub(replace, content)
+        
+        changes: Dict[str, List[str]] = {}
+        for key in sorted(first_match, key=lambda k: self.rules[k][0]):
+            _, set_name, new_specifier = self.rules[key]
+            changes.setdefault(set_name, []).append(f'{first_match[key]} → from "{new_specifier}"')
+        return content, changes
 
-def migrate_file(filepath: str, migrations: Dict[str, str]) -> Tuple[bool, List[str]]:
+
+def migrate_file(filepath: str, engine: MigrationEngine, backup: Optional[BackupRun],
+                 diff_format: Optional[str] = None) -> Tuple[bool, Dict[str, List[str]], Optional[str]]:
     """
-    Migra um arquivo aplicando as regras de migração
+    Migra um arquivo aplicando todas as regras de migração (uma leitura, uma escrita)
+    
+    Com diff_format ('unified' ou 'json', --dry-run) o arquivo não é gravado
+    nem copiado para o backup; o diff renderizado vem no resultado.
     
     Returns:
-        (modified, changes): Se foi modificado e lista de mudanças
+        (modified, changes, diff): Se foi (ou seria) modificado, as mudanças por
+        conjunto de regras e o diff (só no dry-run)
     """
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
+        with open_bytes(filepath) as data:
+            if not engine.might_match(data):
+                return False, {}, None
+            original = data[:]
+        content = original.decode('utf-8')
         
-        original_content = content
-        changes = []
+        new_content, changes = engine.rewrite(content, importer_directory(filepath, engine.src_root))
         
-        for old_pattern, new_import in migrations.items():
-            if re.search(old_pattern, content):
-                # Criar backup apenas se houver mudança
-                if not changes:
-                    create_backup(filepath)
-                
-                # Aplicar substituição
-                content, count = re.subn(old_pattern, new_import, content)
-                
-                if count > 0:
-                    old_import = re.search(old_pattern, original_content)
-                    if old_import:
-                        changes.append(f"{old_import.group()} → {new_import}")
+        if changes and diff_format:
+            rel_path = Path(os.path.relpath(filepath)).as_posix()
+            return True, changes, render_diff(rel_path, content, new_content, diff_format)
         
-        # Escrever arquivo modificado
+        # Escrever arquivo modificado (backup apenas se houver mudança);
+        # a escrita atômica preserva as quebras de linha originais (CRLF/LF)
         if changes:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(content)
-            return True, changes
+            create_backup(filepath, backup, original)
+            write_text_atomic(filepath, new_content)
+            return True, changes, None
         
-        return False, []
+        return False, {}, None
     
     except Exception as e:
         print(f"  ❌ Erro ao processar {filepath}: {e}")
-        return False, []
+        return False, {}, None
+
+def migrate_files(filepaths: List[str], engine: MigrationEngine, backup: Optional[BackupRun],
+                  diff_format: Optional[str] = None) -> List[Tuple[str, Dict[str, List[str]], Optional[str]]]:
+    """Migra uma fatia de arquivos (worker) e devolve só os modificados, na ordem"""
+    results = []
+    for filepath in filepaths:
+        modified, changes, diff = migrate_file(filepath, engine, backup, diff_format)
+        if modified:
+            results.append((filepath, changes, diff))
+    return results
 
 def find_files_to_migrate(root_dir: str = "src") -> List[str]:
     """Encontra todos os arquivos .tsx e .ts que podem precisar migração"""
-    files = []
-    for dirpath, _, filenames in os.walk(root_dir):
-        # Ignorar node_modules, dist, build, etc
-        if 'node_modules' in dirpath or 'dist' in dirpath or 'build' in dirpath:
-            continue
-        
-        for filename in filenames:
-            if filename.endswith(('.tsx', '.ts')) and not filename.endswith('.d.ts'):
-                files.append(os.path.join(dirpath, filename))
+    # Varredura única (node_modules, dist, build e .gitignore podados antes da descida)
+    return [
+        str(path)
+        for path in iter_source_files(root_dir, TS_EXTENSIONS, exclude_suffixes=DECLARATION_SUFFIXES)
+    ]
+
+def find_importers_to_migrate(engine: MigrationEngine, jobs: int = 1) -> List[str]:
+    """
+    Arquivos que citam algum especificador das regras, segundo o índice de imports
+
+    Só esses arquivos são abertos; o índice é atualizado de forma incremental.
+    """
+    graph = ImportGraph(engine.src_root)
+    reused, reparsed = graph.update(jobs)
+    print(f"   Índice de imports: {reused} arquivos reaproveitados, {reparsed} relidos")
     
-    return files
+    candidates = set()
+    for key in engine.rules:
+        candidates.update(graph.specifier_importers.get(key, ()))
+    # Mesmo filtro da varredura completa (.ts/.tsx, sem .d.ts), na ordem da varredura
+    return [
+        filepath for filepath in graph.specifiers
+        if filepath in candidates and filepath.endswith(TS_EXTENSIONS)
+        and not filepath.endswith(DECLARATION_SUFFIXES)
+    ]
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Migra imports para os componentes unificados")
+    parser.add_argument(
+        '--jobs', '-j', type=int, default=1,
+        help="Processos paralelos (0 = todos os núcleos, padrão: 1)"
+    )
+    parser.add_argument(
+        '--rules', default=RULES_FILE,
+        help=f"Tabela de regras em JSON (padrão: {RULES_FILE.name})"
+    )
+    parser.add_argument(
+        '--full-scan', action='store_true',
+        help="Analisa todos os arquivos de src/ em vez de consultar o índice de imports"
+    )
+    parser.add_argument(
+        '--backup-store', default=STORE_DIR,
+        help=f"Store de backups/journal da execução (padrão: {STORE_DIR})"
+    )
+    add_dry_run_arguments(parser)
+    return parser.parse_args()
 
 def main():
+    args = parse_args()
+    diff_writer = diff_writer_from_args(args)
+    try:
+        run(args, diff_writer)
+    finally:
+        # Devolve o stdout mesmo se o dry-run falhar no meio
+        if diff_writer:
+            diff_writer.close()
+
+def run(args, diff_writer):
+    """Migra os imports (ou, no --dry-run, só calcula o diff)"""
+    jobs = resolve_jobs(args.jobs)
+    engine = MigrationEngine.from_file(args.rules)
     print("=" * 80)
     print("🔄 MIGRAÇÃO AUTOMÁTICA PARA COMPONENTES UNIFICADOS")
     print("=" * 80)
     print()
     
-    # Estatísticas
+    # Estatísticas por conjunto de regras
     stats = {
-        'skeleton_files': 0,
-        'notification_files': 0,
-        'skeleton_changes': 0,
-        'notification_changes': 0,
+        'by_set': {set_name: {'files': 0, 'changes': 0} for set_name in engine.set_names},
         'total_files_modified': 0,
     }
     
@@ -140,53 +233,62 @@ def main():
     
     # Encontrar arquivos
     print("📁 Buscando arquivos para migração...")
-    files = find_files_to_migrate()
+    if args.full_scan:
+        files = find_files_to_migrate()
+    else:
+        files = find_importers_to_migrate(engine, jobs)
     print(f"   Encontrados {len(files)} arquivos para analisar")
     print()
     
-    # Migrar Skeletons
-    print("🔧 Migrando imports de Skeleton...")
-    for filepath in files:
-        modified, changes = migrate_file(filepath, SKELETON_MIGRATIONS)
-        if modified:
-            stats['skeleton_files'] += 1
-            stats['skeleton_changes'] += len(changes)
-            stats['total_files_modified'] += 1
-            modified_files.append((filepath, 'Skeleton', changes))
-            print(f"  ✅ {filepath}")
-            for change in changes:
-                print(f"     - {change}")
+    # Uma passada por arquivo para todos os conjuntos; resultados na ordem dos arquivos
+    if diff_writer:
+        backup = None
+        worker = partial(migrate_files, engine=engine, backup=None, diff_format=diff_writer.fmt)
+    else:
+        backup = BackupStore(args.backup_store).start_run("migrate_to_unified_components")
+        worker = partial(migrate_files, engine=engine, backup=backup)
+    results = []
+    for chunk_results in run_sharded(worker, files, jobs):
+        for filepath, changes_by_set, diff in chunk_results:
+            results.append((filepath, changes_by_set))
+            if diff_writer:
+                diff_writer.write(diff)
+    stats['total_files_modified'] = len(results)
     
-    print(f"\n  Migrados {stats['skeleton_files']} arquivos Skeleton")
-    print()
-    
-    # Migrar NotificationCenter
-    print("🔧 Migrando imports de NotificationCenter...")
-    for filepath in files:
-        modified, changes = migrate_file(filepath, NOTIFICATION_MIGRATIONS)
-        if modified:
-            stats['notification_files'] += 1
-            stats['notification_changes'] += len(changes)
-            if filepath not in [f[0] for f in modified_files]:
-                stats['total_files_modified'] += 1
-            modified_files.append((filepath, 'NotificationCenter', changes))
+    for set_name in engine.set_names:
+        print(f"🔧 Migrando imports de {set_name}...")
+        set_stats = stats['by_set'][set_name]
+        for filepath, changes_by_set in results:
+            changes = changes_by_set.get(set_name)
+            if not changes:
+                continue
+            set_stats['files'] += 1
+            set_stats['changes'] += len(changes)
+            modified_files.append((filepath, set_name, changes))
             print(f"  ✅ {filepath}")
             for change in changes:
                 print(f"     - {change}")
+        
+        print(f"\n  Migrados {set_stats['files']} arquivos {set_name}")
+        print()
     
-    print(f"\n  Migrados {stats['notification_files']} arquivos NotificationCenter")
-    print()
+    total_changes = sum(set_stats['changes'] for set_stats in stats['by_set'].values())
     
     # Relatório Final
     print("=" * 80)
     print("📊 RELATÓRIO DE MIGRAÇÃO")
     print("=" * 80)
-    print(f"Arquivos Skeleton migrados: {stats['skeleton_files']}")
-    print(f"Arquivos NotificationCenter migrados: {stats['notification_files']}")
+    for set_name, set_stats in stats['by_set'].items():
+        print(f"Arquivos {set_name} migrados: {set_stats['files']}")
     print(f"Total de arquivos modificados: {stats['total_files_modified']}")
-    print(f"Total de mudanças: {stats['skeleton_changes'] + stats['notification_changes']}")
+    print(f"Total de mudanças: {total_changes}")
     print()
     
+    if diff_writer:
+        print(f"🔍 Dry-run: nada foi gravado; diff de {diff_writer.files} arquivos em "
+              f"{'stdout' if args.diff_output == '-' else args.diff_output}")
+        return
+    
     # Salvar relatório
     report_file = f"migration_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
     with open(report_file, 'w', encoding='utf-8') as f:
@@ -194,10 +296,10 @@ def main():
         f.write(f"Data: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
         f.write("=" * 80 + "\n\n")
         
-        f.write(f"Arquivos Skeleton migrados: {stats['skeleton_files']}\n")
-        f.write(f"Arquivos NotificationCenter migrados: {stats['notification_files']}\n")
+        for set_name, set_stats in stats['by_set'].items():
+            f.write(f"Arquivos {set_name} migrados: {set_stats['files']}\n")
         f.write(f"Total de arquivos modificados: {stats['total_files_modified']}\n")
-        f.write(f"Total de mudanças: {stats['skeleton_changes'] + stats['notification_changes']}\n\n")
+        f.write(f"Total de mudanças: {total_changes}\n\n")
         
         f.write("ARQUIVOS MODIFICADOS:\n")
         f.write("=" * 80 + "\n\n")
@@ -208,7 +310,8 @@ def main():
                 f.write(f"  - {change}\n")
     
     print(f"📄 Relatório salvo em: {report_file}")
-    print(f"💾 Backups salvos em: backups_component_migration/")
+    print(f"💾 Backups na execução {backup.run_id} ({args.backup_store}/)")
+    print(f"   Para desfazer: python scripts/backup_store.py rollback {backup.run_id}")
     print()
     print("✅ Migração concluída com sucesso!")
     print()
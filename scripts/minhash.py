@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Similaridade de conteúdo por MinHash + LSH
+
+Cada arquivo vira um conjunto de shingles (sequências de SHINGLE_SIZE tokens,
+sem comentários) e uma assinatura MinHash de NUM_PERM valores. A fração de
+posições iguais entre duas assinaturas estima o índice de Jaccard dos
+conjuntos. O LSH (assinatura dividida em bandas) agrupa em baldes os módulos
+de conteúdo parecido; o agrupamento blocked de create-similarity-matrix.py
+usa esses baldes como blocos de candidatos, sem comparar todos contra todos.
+O modo greedy e a matriz de similarity_engine.py comparam todos os pares.
+
+As assinaturas são calculadas em paralelo e guardadas em cache pelo hash do
+conteúdo do arquivo.
+"""
+
+import hashlib
+import os
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence, Set
+
+from file_cache import FileCache, content_hash, make_cache_key
+from js_lexer import tokenize
+from parallel import run_sharded
+from source_files import open_bytes
+
+try:
+    import numpy as np
+except ImportError:  # opcional: sem NumPy a assinatura é calculada em Python puro
+    np = None
+
+# Versão do cálculo da assinatura: incrementar invalida o cache
+MINHASH_VERSION = 1
+
+NUM_PERM = 128
+SHINGLE_SIZE = 5
+# 32 bandas de 4 linhas: pares com Jaccard ~0.4 ou mais quase sempre viram candidatos
+LSH_BANDS = 32
+
+CACHE_PATH = ".analysis-cache/minhash.json"
+
+# Uma função de hash de 64 bits combinada (XOR) com NUM_PERM máscaras fixas
+_MASKS = tuple(
+    int.from_bytes(hashlib.blake2b(f"minhash-{i}".encode(), digest_size=8).digest(), 'little')
+    for i in range(NUM_PERM)
+)
+
+Signature = List[int]
+
+
+def shingle_hashes(text: str) -> Set[int]:
+    """Hashes de 64 bits dos shingles de tokens do arquivo"""
+    values = [tok.value for tok in tokenize(text)]
+    if not values:
+        return set()
+    size = min(SHINGLE_SIZE, len(values))
+    return {
+        int.from_bytes(hashlib.blake2b('\0'.join(values[i:i + size]).encode('utf-8'),
+                                       digest_size=8).digest(), 'little')
+        for i in range(len(values) - size + 1)
+    }
+
+
+def signature(hashes: Set[int]) -> Optional[Signature]:
+    """Assinatura MinHash de um conjunto de hashes (None se vazio)"""
+    if not hashes:
+        return None
+    if np is not None:
+        values = np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+        masks = np.array(_MASKS, dtype=np.uint64)
+        return [int(v) for v in np.bitwise_xor.outer(values, masks).min(axis=0)]
+    return [min(h ^ mask for h in hashes) for mask in _MASKS]
+
+
+def estimated_jaccard(signature1: Sequence[int], signature2: Sequence[int]) -> float:
+    """Fração de posições iguais entre duas assinaturas (estimativa de Jaccard)"""
+    matches = sum(1 for a, b in zip(signature1, signature2) if a == b)
+    return matches / len(signature1)
+
+
+def lsh_buckets(signatures: Sequence[Optional[Signature]], bands: int = LSH_BANDS) -> List[List[int]]:
+    """
+    Baldes de LSH com mais de um módulo (índices na ordem de entrada)
+
+    Módulos com a mesma banda da assinatura caem no mesmo balde; só pares
+    dentro de um balde precisam ser comparados.
+    """
+    rows = NUM_PERM // bands
+    buckets = defaultdict(list)
+    for index, sig in enumerate(signatures):
+        if sig is None:
+            continue
+        for band in range(bands):
+            buckets[(band, tuple(sig[band * rows:(band + 1) * rows]))].append(index)
+    return [indices for indices in buckets.values() if len(indices) > 1]
+
+
+def compute_signatures_for(items):
+    """
+    Assinaturas de uma fatia de arquivos (worker)
+
+    Cada item é (arquivo, entrada antiga do cache); se o hash não mudou, a
+    assinatura antiga é reaproveitada.
+
+    Returns:
+        [(arquivo, hash, assinatura), ...]; arquivos ilegíveis ficam de fora
+    """
+    results = []
+    for filepath, cached in items:
+        try:
+            with open_bytes(filepath) as data:
+                digest = content_hash(data)
+                if cached and cached['hash'] == digest:
+                    results.append((filepath, digest, cached['value']))
+                    continue
+                text = data[:].decode('utf-8')
+        except (OSError, UnicodeDecodeError):
+            continue
+        results.append((filepath, digest, signature(shingle_hashes(text))))
+    return results
+
+
+def compute_signatures(paths: Iterable[str], jobs: int = 1,
+                       cache_path: str = CACHE_PATH) -> Dict[str, Optional[Signature]]:
+    """
+    Assinaturas MinHash dos arquivos, reaproveitando o cache por conteúdo
+
+    O cache não é podado: ele é compartilhado entre relatórios diferentes.
+
+    Returns:
+        {arquivo: assinatura}; arquivos inexistentes não aparecem e arquivos
+        sem tokens ficam com None
+    """
+    cache = FileCache(cache_path, make_cache_key(
+        str(MINHASH_VERSION), str(NUM_PERM), str(SHINGLE_SIZE)
+    )).load()
+
+    signatures = {}
+    pending = []
+    file_stats = {}
+    for filepath in dict.fromkeys(paths):
+        try:
+            st = os.stat(filepath)
+        except OSError:
+            continue
+        file_stats[filepath] = st
+        entry = cache.lookup(filepath, st)
+        if entry is not None:
+            signatures[filepath] = entry['value']
+        else:
+            pending.append((filepath, cache.stale(filepath)))
+
+    for results in run_sharded(compute_signatures_for, pending, jobs):
+        for filepath, digest, sig in results:
+            cache.store(filepath, file_stats[filepath], digest, sig)
+            signatures[filepath] = sig
+
+    cache.save()
+    return signatures
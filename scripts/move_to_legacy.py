@@ -6,6 +6,9 @@ Move componentes duplicados antigos para pasta legacy
 import os
 import shutil
 
+from backup_store import BackupStore
+from import_graph import ImportGraph
+
 # Componentes Skeleton para mover
 SKELETON_FILES = [
     "src/components/dashboard/DashboardSkeleton.tsx",
@@ -36,8 +39,30 @@ NOTIFICATION_FILES = [
     "src/components/maritime/notification-center.tsx",
 ]
 
-def move_to_legacy(files, component_type):
-    """Move arquivos para pasta legacy"""
+def report_importers(graph, files):
+    """Mostra quem ainda importa cada arquivo antes de movê-lo"""
+    remaining = 0
+    for filepath in files:
+        importers = graph.importers_of(filepath)
+        if not importers:
+            continue
+        remaining += len(importers)
+        print(f"  ⚠️  {filepath}: {len(importers)} importadores")
+        for importer in importers[:5]:
+            print(f"     - {importer}")
+        if len(importers) > 5:
+            print(f"     ... e mais {len(importers) - 5}")
+    return remaining
+
+def move_to_legacy(files, component_type, backup):
+    """
+    Move arquivos para pasta legacy
+    
+    Cada arquivo entra no journal da execução antes do move, assim como o
+    destino e o stub criado no lugar. O original continua vivo no destino,
+    então o blob dele é reflink ou cópia; só o destino antigo, que o move
+    substitui por rename, pode virar hard link.
+    """
     legacy_dir = "src/components/legacy"
     os.makedirs(legacy_dir, exist_ok=True)
     
@@ -48,6 +73,13 @@ def move_to_legacy(files, component_type):
             basename = os.path.basename(filepath)
             legacy_path = os.path.join(legacy_dir, f"{component_type}_{basename}")
             
+            # Backup do original e do destino, se já existir
+            backup.backup(filepath)
+            if os.path.exists(legacy_path):
+                backup.backup(legacy_path, replaced=True)
+            else:
+                backup.created(legacy_path)
+            
             # Mover arquivo
             shutil.move(filepath, legacy_path)
             
@@ -73,13 +105,23 @@ print("📦 MOVENDO COMPONENTES PARA LEGACY")
 print("=" * 80)
 print()
 
+# Importadores restantes (o stub de re-export mantém esses imports funcionando)
+print("🔎 Verificando importadores restantes...")
+graph = ImportGraph("src")
+graph.update()
+remaining = report_importers(graph, SKELETON_FILES + NOTIFICATION_FILES)
+print(f"  {remaining} imports ainda apontam para os arquivos a mover")
+print()
+
+backup = BackupStore().start_run("move_to_legacy")
+
 print("🔧 Movendo Skeletons...")
-skeleton_moved = move_to_legacy(SKELETON_FILES, "skeleton")
+skeleton_moved = move_to_legacy(SKELETON_FILES, "skeleton", backup)
 print(f"  Movidos {len(skeleton_moved)} arquivos Skeleton")
 print()
 
 print("🔧 Movendo NotificationCenters...")
-notification_moved = move_to_legacy(NOTIFICATION_FILES, "notification")
+notification_moved = move_to_legacy(NOTIFICATION_FILES, "notification", backup)
 print(f"  Movidos {len(notification_moved)} arquivos NotificationCenter")
 print()
 
@@ -88,5 +130,6 @@ print("📊 RESUMO")
 print("=" * 80)
 print(f"Total de arquivos movidos: {len(skeleton_moved) + len(notification_moved)}")
 print(f"Pasta legacy criada em: src/components/legacy/")
+print(f"Backup na execução {backup.run_id}: python scripts/backup_store.py rollback {backup.run_id}")
 print()
 print("✅ Componentes antigos movidos com sucesso!")
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Utilitários de paralelismo compartilhados pelos scripts de análise
+
+Divide uma lista de itens em fatias contíguas e processa cada fatia em um
+pool de processos, devolvendo os resultados NA ORDEM das fatias. Assim o
+merge dos resultados parciais é determinístico e idêntico a uma execução serial.
+"""
+
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, TypeVar
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+# Fatias por worker: mais fatias equilibram melhor a carga entre processos
+CHUNKS_PER_JOB = 4
+
+# run_bounded: itens por fatia e fatias em andamento por worker
+BOUNDED_CHUNK_SIZE = 64
+BOUNDED_WINDOW_PER_JOB = 2
+
+
+def resolve_jobs(jobs: Optional[int]) -> int:
+    """Normaliza o número de jobs (0 ou None = todos os núcleos)"""
+    if not jobs:
+        return os.cpu_count() or 1
+    return max(1, jobs)
+
+
+def chunked(items: Sequence[T], n_chunks: int) -> List[List[T]]:
+    """Divide os itens em até n_chunks fatias contíguas de tamanho parecido"""
+    if not items:
+        return []
+    n_chunks = max(1, min(n_chunks, len(items)))
+    size, extra = divmod(len(items), n_chunks)
+    chunks = []
+    start = 0
+    for i in range(n_chunks):
+        end = start + size + (1 if i < extra else 0)
+        chunks.append(list(items[start:end]))
+        start = end
+    return chunks
+
+
+def run_sharded(worker: Callable[[List[T]], R], items: Sequence[T], jobs: int = 1) -> Iterator[R]:
+    """
+    Executa worker(fatia) para cada fatia dos itens
+
+    Com jobs <= 1 roda tudo no processo atual em uma única fatia.
+    O worker precisa ser uma função de módulo (picklable).
+
+    Yields:
+        Resultados parciais na ordem das fatias
+    """
+    items = list(items)
+    if jobs <= 1 or len(items) < 2:
+        yield worker(items)
+        return
+
+    chunks = chunked(items, jobs * CHUNKS_PER_JOB)
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        yield from executor.map(worker, chunks)
+
+
+def run_bounded(worker: Callable[[List[T]], R], items: Iterable[T], jobs: int = 1,
+                chunk_size: int = BOUNDED_CHUNK_SIZE) -> Iterator[R]:
+    """
+    Como run_sharded, mas consome `items` sob demanda (ex.: um generator)
+
+    No máximo BOUNDED_WINDOW_PER_JOB * jobs fatias ficam em andamento ou
+    prontas esperando o consumidor; a próxima fatia só é lida e enviada
+    quando a mais antiga é entregue. A memória fica limitada à janela,
+    independente do número de itens.
+
+    Yields:
+        Resultados parciais na ordem das fatias
+    """
+    iterator = iter(items)
+    chunks = iter(lambda: list(islice(iterator, chunk_size)), [])
+    if jobs <= 1:
+        for chunk in chunks:
+            yield worker(chunk)
+        return
+
+    window = jobs * BOUNDED_WINDOW_PER_JOB
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(worker, chunk))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Código morto por alcançabilidade: o que não é carregado a partir das entradas
+
+Usa o grafo de imports de src/ (import_graph.py), que é indexado em paralelo e
+em cache por hash de conteúdo. Depois de pequenas edições, só os arquivos
+alterados são relidos. As arestas incluem imports estáticos, re-exports
+(export ... from), import("...") (inclusive dentro de lazy(() => ...)),
+require e new URL("...", import.meta.url). O alias @/ e os arquivos index
+são resolvidos como no TypeScript.
+
+A busca parte dos pontos de entrada (src/main.tsx) e das tabelas de rotas.
+Em uma tabela de rotas, cada `path: "pages/X"` é um módulo carregado pelo
+loader (import(`@/${module.path}`)). Arquivos que só são casados por
+import.meta.glob ou pelo prefixo de um import com template literal não contam
+como alcançados: vão para a categoria incerta.
+
+Categorias (mesmo formato de dead_code_analysis.json e dead_code_categorized.json):
+    A (deletável)   backups/temporários, arquivos quase vazios inalcançáveis,
+                    testes com imports locais quebrados ou desabilitados
+    B (arquivável)  módulos inalcançáveis (inclusive os da pasta legacy)
+    C (incerto)     inalcançáveis que podem ser carregados dinamicamente
+
+Testes, stories e declarações (.d.ts) não são carregados pelo app e nunca
+são contados como inalcançáveis.
+
+Uso:
+    python scripts/reachability.py
+    python scripts/reachability.py --jobs 0 --entry src/main.tsx --route-table src/modules/registry.ts
+    python scripts/reachability.py --why src/components/legacy/skeleton_SkeletonCard.tsx
+"""
+
+import argparse
+import json
+import os
+import re
+import time
+from collections import deque
+from typing import Dict, Iterable, List, Optional
+
+from import_graph import ImportGraph
+from instrumentation import Profiler, add_profile_arguments
+from parallel import resolve_jobs
+from source_files import DECLARATION_SUFFIXES, iter_source_files
+from ts_imports import ALIAS_PREFIX
+
+ENTRY_POINTS = ('src/main.tsx',)
+ROUTE_TABLES = ('src/modules/registry.ts',)
+
+ANALYSIS_REPORT = "dead_code_analysis.json"
+CATEGORIZED_REPORT = "dead_code_categorized.json"
+
+# Entradas de uma tabela de rotas: path: "pages/X" (caminhos de URL começam com /)
+ROUTE_PATH_RE = re.compile(r'''\bpath\s*:\s*(["'])([^"'\n/][^"'\n]*)\1''')
+
+# Testes, mocks e stories: carregados pelo runner, não pelo app
+TEST_FILE_RE = re.compile(r'(?:^|/)(?:tests?|__tests__|__mocks__|mocks)/|\.(?:test|spec|stories)\.[jt]sx?$')
+DISABLED_TEST_RE = re.compile(r'[.-](?:old|skip|disabled)\.(?:test|spec)\.[jt]sx?$')
+
+BACKUP_SUFFIXES = ('.backup', '.bak', '.old', '.orig', '.tmp', '.swp', '~')
+NEAR_EMPTY_BYTES = 100
+LEGACY_DIR = 'components/legacy/'
+
+REASON_BACKUP = 'Arquivo temporário/backup'
+REASON_NEAR_EMPTY = 'Arquivo quase vazio'
+REASON_ORPHAN_TEST = 'Teste órfão/desabilitado'
+REASON_LEGACY = 'Já em pasta legacy'
+REASON_NO_IMPORTERS = 'Inalcançável: não importado por nenhum módulo'
+REASON_DEAD_IMPORTERS = 'Inalcançável: importado só por módulos inalcançáveis'
+
+# chave de dead_code_categorized.json -> chave de dead_code_analysis.json
+CATEGORIES = {
+    'A_DELETABLE': 'category_a_deletable',
+    'B_ARCHIVABLE': 'category_b_archivable',
+    'C_UNCERTAIN': 'category_c_uncertain',
+}
+
+
+def route_targets(graph: ImportGraph, table: str) -> List[str]:
+    """Arquivos citados pelas entradas `path:` de uma tabela de rotas"""
+    try:
+        with open(table, 'r', encoding='utf-8') as f:
+            text = f.read()
+    except OSError as e:
+        print(f"  ⚠️  Tabela de rotas ignorada ({table}): {e}")
+        return []
+    targets = []
+    for match in ROUTE_PATH_RE.finditer(text):
+        target = graph.resolve(ALIAS_PREFIX + match.group(2))
+        if target is not None and target not in targets:
+            targets.append(target)
+    return targets
+
+
+def walk(graph: ImportGraph, roots: Iterable[str], route_tables: Iterable[str] = ()) -> Dict[str, Optional[str]]:
+    """
+    Busca em largura a partir das raízes
+
+    Cada tabela de rotas alcançada (ou passada como raiz) também liga os
+    módulos das suas entradas `path:`.
+
+    Returns:
+        {arquivo alcançado: arquivo pelo qual foi alcançado (None nas raízes)}
+    """
+    routes = {table: None for table in route_tables}
+    reached: Dict[str, Optional[str]] = {}
+    queue = deque()
+    for root in roots:
+        if root in graph.specifiers and root not in reached:
+            reached[root] = None
+            queue.append(root)
+
+    while queue:
+        filepath = queue.popleft()
+        targets = graph.imports.get(filepath, [])
+        if filepath in routes:
+            targets = targets + route_targets(graph, filepath)
+        for target in targets:
+            if target not in reached:
+                reached[target] = filepath
+                queue.append(target)
+    return reached
+
+
+def import_chain(reached: Dict[str, Optional[str]], filepath: str) -> List[str]:
+    """Caminho de imports de uma raiz até o arquivo"""
+    chain = []
+    while filepath is not None:
+        chain.append(filepath)
+        filepath = reached[filepath]
+    return chain[::-1]
+
+
+def is_test_file(filepath: str) -> bool:
+    return bool(TEST_FILE_RE.search(filepath))
+
+
+def broken_specifiers(graph: ImportGraph, filepath: str) -> List[str]:
+    """Especificadores locais que não correspondem a nenhum arquivo (nem asset)"""
+    src_root = graph.src_root
+    return [
+        specifier for specifier in graph.specifiers[filepath]
+        if graph.modules.get(specifier) is None
+        and not os.path.exists(os.path.join(src_root, specifier[len(ALIAS_PREFIX):]))
+    ]
+
+
+def dynamic_candidates(graph: ImportGraph) -> Dict[str, str]:
+    """Arquivos casados por import.meta.glob ou prefixos de import dinâmico -> motivo"""
+    candidates: Dict[str, str] = {}
+    for filepath, patterns in graph.patterns.items():
+        for pattern in patterns.get('globs', []):
+            for target in graph.glob_targets(pattern):
+                candidates.setdefault(target, f"Só carregado por import.meta.glob(\"{pattern}\") em {filepath}")
+        for prefix in patterns.get('templates', []):
+            for target in graph.prefix_targets(prefix):
+                candidates.setdefault(target, f"Possível import dinâmico `{prefix}${{...}}` em {filepath}")
+    return candidates
+
+
+def categorize(graph: ImportGraph, reached: Dict[str, Optional[str]]) -> Dict[str, List[dict]]:
+    """Arquivos inalcançáveis ou descartáveis, nas categorias A/B/C"""
+    categories: Dict[str, List[dict]] = {name: [] for name in CATEGORIES}
+
+    def add(category: str, filepath: str, reason: str):
+        try:
+            size = os.path.getsize(filepath)
+        except OSError:
+            return
+        categories[category].append({'path': filepath, 'size': size, 'reason': reason})
+
+    # Backups costumam estar no .gitignore, mas ainda ocupam a árvore
+    for path in iter_source_files(graph.src_root, BACKUP_SUFFIXES, use_gitignore=False):
+        add('A_DELETABLE', path.as_posix(), REASON_BACKUP)
+
+    candidates = dynamic_candidates(graph)
+    legacy_prefix = f"{graph.src_root}/{LEGACY_DIR}"
+    for filepath in graph.specifiers:
+        if filepath in reached or filepath.endswith(DECLARATION_SUFFIXES):
+            continue
+        if is_test_file(filepath):
+            if DISABLED_TEST_RE.search(filepath) or broken_specifiers(graph, filepath):
+                add('A_DELETABLE', filepath, REASON_ORPHAN_TEST)
+            continue
+
+        if filepath.startswith(legacy_prefix):
+            add('B_ARCHIVABLE', filepath, REASON_LEGACY)
+        elif os.path.getsize(filepath) < NEAR_EMPTY_BYTES:
+            add('A_DELETABLE', filepath, REASON_NEAR_EMPTY)
+        elif filepath in candidates:
+            add('C_UNCERTAIN', filepath, candidates[filepath])
+        elif graph.importers.get(filepath):
+            add('B_ARCHIVABLE', filepath, REASON_DEAD_IMPORTERS)
+        else:
+            add('B_ARCHIVABLE', filepath, REASON_NO_IMPORTERS)
+    return categories
+
+
+def write_reports(categories: Dict[str, List[dict]], analysis_path: str, categorized_path: str) -> None:
+    """Grava as categorias nos dois formatos de relatório existentes"""
+    analysis = {
+        CATEGORIES[name]: [{'path': e['path'], 'reason': e['reason'], 'size': e['size']} for e in entries]
+        for name, entries in categories.items()
+    }
+    with open(analysis_path, 'w') as f:
+        json.dump(analysis, f, indent=2)
+    with open(categorized_path, 'w') as f:
+        json.dump(categories, f, indent=2)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Código morto de src/ por alcançabilidade a partir das entradas")
+    parser.add_argument('--src', default="src", help="Diretório raiz (padrão: src)")
+    parser.add_argument('--entry', action='append', metavar='ARQUIVO',
+                        help=f"Ponto de entrada (repetível; padrão: {', '.join(ENTRY_POINTS)})")
+    parser.add_argument('--route-table', action='append', metavar='ARQUIVO',
+                        help=f"Tabela de rotas com entradas path: \"pages/X\" (repetível; padrão: "
+                             f"{', '.join(ROUTE_TABLES)})")
+    parser.add_argument(
+        '--jobs', '-j', type=int, default=1,
+        help="Processos paralelos para reindexar (0 = todos os núcleos, padrão: 1)"
+    )
+    parser.add_argument('--rebuild', action='store_true', help="Descarta o cache e reindexa tudo")
+    parser.add_argument('--analysis-out', default=ANALYSIS_REPORT,
+                        help=f"Relatório por categoria (padrão: {ANALYSIS_REPORT})")
+    parser.add_argument('--categorized-out', default=CATEGORIZED_REPORT,
+                        help=f"Relatório A/B/C (padrão: {CATEGORIZED_REPORT})")
+    parser.add_argument('--why', action='append', metavar='ARQUIVO',
+                        help="Mostra por qual cadeia de imports o arquivo é alcançado (não grava relatórios)")
+    add_profile_arguments(parser)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    profiler = Profiler.from_args(args, 'reachability')
+    graph = ImportGraph(args.src)
+    entries = args.entry or list(ENTRY_POINTS)
+    route_tables = args.route_table or list(ROUTE_TABLES)
+
+    start = time.perf_counter()
+    profiler.mark('índice de imports')
+    reused, reparsed = graph.update(resolve_jobs(args.jobs), rebuild=args.rebuild)
+    profiler.count(reparsed)
+    print(f"🗂️  Índice de imports: {len(graph.specifiers)} arquivos "
+          f"({reused} reaproveitados, {reparsed} relidos)")
+
+    profiler.mark('alcançabilidade')
+    for root in entries + route_tables:
+        if root not in graph.specifiers:
+            print(f"  ⚠️  Entrada fora do índice: {root}")
+    reached = walk(graph, entries + route_tables, route_tables)
+    profiler.count(len(reached))
+
+    if args.why:
+        for target in args.why:
+            filepath = graph.resolve(target) or target
+            if filepath in reached:
+                print(f"\n🔗 {filepath}:")
+                for step in import_chain(reached, filepath):
+                    print(f"   {step}")
+            else:
+                print(f"\n🚫 {filepath} não é alcançado a partir das entradas")
+        profiler.finish()
+        return
+
+    profiler.mark('classificação')
+    categories = categorize(graph, reached)
+    profiler.count(len(graph.specifiers))
+
+    profiler.mark('relatórios')
+    write_reports(categories, args.analysis_out, args.categorized_out)
+    elapsed = time.perf_counter() - start
+
+    print(f"🧭 Alcançados: {len(reached)} de {len(graph.specifiers)} arquivos "
+          f"(entradas: {', '.join(entries)}; rotas: {', '.join(route_tables)})")
+    for name, items in categories.items():
+        total = sum(item['size'] for item in items)
+        print(f"   {name:<13} {len(items):>5} arquivos ({total / 1024:.1f} KB)")
+    print(f"💾 Relatórios: {args.analysis_out}, {args.categorized_out} ({elapsed * 1000:.0f} ms)")
+    profiler.finish()
+
+
+if __name__ == "__main__":
+    main()
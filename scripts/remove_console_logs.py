@@ -3,156 +3,258 @@
 Script para remover console.logs do código de produção de forma inteligente
 Mantém console.error em blocos catch críticos
 """
+import argparse
 import os
-import re
-from pathlib import Path
 from collections import defaultdict
+from functools import partial
+from pathlib import Path
+from typing import NamedTuple, Optional, Tuple
+
+from instrumentation import Profiler, add_profile_arguments
+from js_lexer import NAME, ScopeTracker, find_closing, statement_end, tokenize
+from parallel import resolve_jobs, run_sharded
+from source_diff import add_dry_run_arguments, diff_writer_from_args, render_diff
+from source_files import iter_source_files, open_bytes, write_text_atomic
 
 PROJECT_ROOT = Path("/home/ubuntu/github_repos/travel-hr-buddy")
 SRC_DIR = PROJECT_ROOT / "src"
 
-# Estatísticas de remoção
-removal_stats = {
-    'removed': defaultdict(int),
-    'kept': defaultdict(int),
-    'files_modified': set(),
-    'by_type': defaultdict(int)
-}
+# Tipos de console.* tratados pelo removedor
+CONSOLE_TYPES = frozenset({
+    'log', 'error', 'warn', 'info', 'debug', 'trace', 'table', 'dir',
+    'group', 'groupEnd', 'groupCollapsed'
+})
 
-def should_keep_console(line, lines, line_idx, console_type):
+def should_keep_console(console_type, in_catch):
     """
     Determina se um console.* deve ser mantido
     - Mantém console.error em blocos catch
     - Mantém console.warn em blocos catch
     - Remove todos os console.log, console.info, console.debug, console.table, etc.
     """
-    # Sempre remover estes tipos
-    if console_type in ['log', 'info', 'debug', 'table', 'dir', 'trace', 'group', 'groupEnd', 'groupCollapsed']:
-        return False
-    
-    # Para console.error e console.warn, verificar contexto
+    # Para console.error e console.warn, manter apenas dentro de catch/finally
     if console_type in ['error', 'warn']:
-        # Procurar por 'catch' nas linhas anteriores (contexto de ~15 linhas)
-        start_idx = max(0, line_idx - 15)
-        context_lines = lines[start_idx:line_idx + 1]
-        
-        # Verificar se está em bloco catch ou finally
-        for ctx_line in context_lines:
-            if re.search(r'\bcatch\s*\(', ctx_line) or re.search(r'\bfinally\s*\{', ctx_line):
-                return True
-        
-        # Se não está em catch/finally, remover
-        return False
+        return in_catch
     
     # Por padrão, remover
     return False
 
-def remove_console_from_file(file_path):
-    """Remove console.* de um arquivo de forma inteligente"""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-        
-        modified = False
-        new_lines = []
-        i = 0
+def _removal_span(text, start, end, last_end):
+    """
+    Calcula o trecho a apagar para um statement console.* em [start, end)
+
+    Se o statement ocupa linhas inteiras (só indentação antes e nada ou um
+    comentário // depois), remove as linhas completas; senão remove apenas o
+    statement e os espaços que o seguem na mesma linha.
+    """
+    line_start = text.rfind('\n', 0, start) + 1
+    line_end = text.find('\n', end)
+    if line_end == -1:
+        line_end = len(text)
+    before = text[line_start:start]
+    after = text[end:line_end].strip()
+    
+    if line_start >= last_end and not before.strip() and (not after or after.startswith('//')):
+        return line_start, min(line_end + 1, len(text))
+    
+    while end < len(text) and text[end] in ' \t':
+        end += 1
+    return start, end
+
+def remove_console_statements(text):
+    """
+    Remove os console.* de um código-fonte em uma única passada
+
+    Usa o tokenizador para ignorar strings, templates e comentários, saber
+    se cada chamada está dentro de um bloco catch/finally e onde a chamada
+    termina (inclusive em várias linhas). Chamadas usadas como expressão
+    (ex.: if (x) console.log(), a && console.log()) não são tocadas.
+
+    Returns:
+        (novo conteúdo, {'removed'|'kept'|'skipped': {tipo: quantidade}})
+    """
+    counts = {'removed': defaultdict(int), 'kept': defaultdict(int), 'skipped': defaultdict(int)}
+    if 'console.' not in text:
+        return text, counts
+    
+    tokens = tokenize(text)
+    scopes = ScopeTracker()
+    spans = []
+    last_end = 0
+    i = 0
+    n = len(tokens)
+    
+    while i < n:
+        tok = tokens[i]
         
-        while i < len(lines):
-            line = lines[i]
-            original_line = line
-            
-            # Procurar por console.*
-            console_match = re.search(r'console\.(log|error|warn|info|debug|trace|table|dir|group|groupEnd|groupCollapsed)', line)
+        # console . <tipo> ( ... )  — e não obj.console.log
+        if (tok.kind == NAME and tok.value == 'console' and i + 3 < n
+                and tokens[i + 1].value == '.' and tokens[i + 2].value in CONSOLE_TYPES
+                and tokens[i + 3].value == '('
+                and not (scopes.prev is not None and scopes.prev.value in ('.', '?.'))):
+            console_type = tokens[i + 2].value
+            close = find_closing(tokens, i + 3)
             
-            if console_match:
-                console_type = console_match.group(1)
-                
-                if should_keep_console(line, lines, i, console_type):
-                    # Manter a linha
-                    new_lines.append(line)
-                    removal_stats['kept'][console_type] += 1
+            if close != -1:
+                if should_keep_console(console_type, scopes.in_catch):
+                    counts['kept'][console_type] += 1
                 else:
-                    # Remover a linha
-                    # Verificar se a linha inteira é apenas o console.*
-                    stripped = line.strip()
-                    
-                    # Se a linha é apenas console.*, remover completamente
-                    if re.match(r'^\s*console\.' + console_type, stripped):
-                        # Verificar se tem ponto e vírgula no final
-                        if stripped.endswith(';'):
-                            # Pular esta linha completamente
-                            modified = True
-                            removal_stats['removed'][console_type] += 1
-                            removal_stats['by_type'][console_type] += 1
-                            i += 1
-                            continue
-                        else:
-                            # Pode ser multi-linha, tentar encontrar o fechamento
-                            paren_count = line.count('(') - line.count(')')
-                            if paren_count > 0:
-                                # Multi-linha, continuar até fechar
-                                i += 1
-                                while i < len(lines) and paren_count > 0:
-                                    paren_count += lines[i].count('(') - lines[i].count(')')
-                                    i += 1
-                                modified = True
-                                removal_stats['removed'][console_type] += 1
-                                removal_stats['by_type'][console_type] += 1
-                                continue
-                            else:
-                                # Linha simples sem ponto e vírgula
-                                modified = True
-                                removal_stats['removed'][console_type] += 1
-                                removal_stats['by_type'][console_type] += 1
-                                i += 1
-                                continue
+                    last = statement_end(text, tokens, close) if scopes.at_statement_start(text, tok) else -1
+                    if last == -1:
+                        counts['skipped'][console_type] += 1
                     else:
-                        # console.* está inline com outro código, tentar remover apenas o console.*
-                        # Exemplo: const x = 5; console.log(x); return x;
-                        # Remover apenas a parte do console.log
-                        new_line = re.sub(
-                            r'console\.' + console_type + r'\([^)]*\);?\s*',
-                            '',
-                            line
-                        )
-                        
-                        # Se removeu algo e a linha não ficou vazia
-                        if new_line != line and new_line.strip():
-                            new_lines.append(new_line)
-                            modified = True
-                            removal_stats['removed'][console_type] += 1
-                            removal_stats['by_type'][console_type] += 1
-                        elif new_line.strip():
-                            new_lines.append(new_line)
-                            modified = True
-                            removal_stats['removed'][console_type] += 1
-                            removal_stats['by_type'][console_type] += 1
-                        else:
-                            # Linha ficou vazia, não adicionar
-                            modified = True
-                            removal_stats['removed'][console_type] += 1
-                            removal_stats['by_type'][console_type] += 1
-                        
-                        i += 1
+                        span = _removal_span(text, tok.start, tokens[last].end, last_end)
+                        spans.append(span)
+                        last_end = span[1]
+                        counts['removed'][console_type] += 1
+                        # Pular a chamada inteira; o token anterior continua o mesmo
+                        i = last + 1
                         continue
-            
-            new_lines.append(line)
-            i += 1
-        
-        # Se modificou, salvar arquivo
-        if modified:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.writelines(new_lines)
-            removal_stats['files_modified'].add(str(file_path.relative_to(PROJECT_ROOT)))
-            return True
         
-        return False
+        scopes.feed(tok)
+        i += 1
+    
+    if not spans:
+        return text, counts
+    
+    parts = []
+    pos = 0
+    for start, end in spans:
+        parts.append(text[pos:start])
+        pos = end
+    parts.append(text[pos:])
+    return ''.join(parts), counts
+
+class RemovalResult(NamedTuple):
+    """
+    Resultado imutável da remoção em um arquivo
+
+    As contagens são pares (tipo, quantidade) na ordem em que os tipos
+    aparecem no arquivo; somadas na ordem da varredura, reproduzem a ordem de
+    inserção (e os desempates dos relatórios) da execução serial.
+    """
+    rel_path: str
+    removed: Tuple[Tuple[str, int], ...] = ()
+    kept: Tuple[Tuple[str, int], ...] = ()
+    skipped: Tuple[Tuple[str, int], ...] = ()
+    modified: bool = False
+    content: Optional[str] = None   # novo conteúdo, se modificado
+    error: Optional[str] = None
+    diff: Optional[str] = None      # diff renderizado (--dry-run)
+
+def new_removal_stats():
+    return {
+        'removed': defaultdict(int),
+        'kept': defaultdict(int),
+        'skipped': defaultdict(int),
+        'files_modified': set(),
+        'by_type': defaultdict(int)
+    }
+
+# Estatísticas da API serial (remove_console_from_file)
+removal_stats = new_removal_stats()
+
+def process_file(file_path, diff_format=None):
+    """
+    Calcula a remoção de console.* de um arquivo, sem gravar nada
+
+    Args:
+        diff_format: se informado ('unified' ou 'json'), o resultado traz o diff renderizado
+
+    Returns:
+        RemovalResult (com o novo conteúdo, se houver mudança)
+    """
+    rel_path = str(file_path.relative_to(PROJECT_ROOT))
+    try:
+        # Arquivos sem console. são descartados nos bytes, sem decodificar;
+        # decodificar os bytes preserva as quebras de linha originais (CRLF/LF)
+        with open_bytes(file_path) as data:
+            if data.find(b'console.') == -1:
+                return RemovalResult(rel_path)
+            content = data[:].decode('utf-8')
         
+        new_content, counts = remove_console_statements(content)
+        modified = new_content != content
+        return RemovalResult(
+            rel_path,
+            removed=tuple(counts['removed'].items()),
+            kept=tuple(counts['kept'].items()),
+            skipped=tuple(counts['skipped'].items()),
+            modified=modified,
+            content=new_content if modified else None,
+            diff=render_diff(Path(rel_path).as_posix(), content, new_content, diff_format)
+            if modified and diff_format else None,
+        )
     except Exception as e:
-        print(f"❌ Erro ao processar {file_path}: {e}")
-        return False
+        return RemovalResult(rel_path, error=f"❌ Erro ao processar {file_path}: {e}")
+
+def write_result(file_path, result):
+    """Grava o novo conteúdo de forma atômica (temporário + rename)"""
+    if not result.modified:
+        return result
+    try:
+        write_text_atomic(file_path, result.content)
+    except OSError as e:
+        return result._replace(modified=False, error=f"❌ Erro ao processar {file_path}: {e}")
+    return result
+
+def remove_console_files(file_paths, diff_format=None):
+    """
+    Processa e grava uma fatia de arquivos (worker)
+
+    Com diff_format (--dry-run) nada é gravado e cada resultado traz o diff.
+
+    Returns:
+        [RemovalResult, ...] na ordem dos arquivos, sem o conteúdo (já gravado)
+    """
+    if diff_format:
+        return [process_file(file_path, diff_format)._replace(content=None) for file_path in file_paths]
+    return [
+        write_result(file_path, process_file(file_path))._replace(content=None)
+        for file_path in file_paths
+    ]
+
+def merge_result(stats, result):
+    """Soma o resultado de um arquivo nas estatísticas"""
+    for category in ('removed', 'kept', 'skipped'):
+        for console_type, count in getattr(result, category):
+            stats[category][console_type] += count
+    for console_type, count in result.removed:
+        stats['by_type'][console_type] += count
+    if result.modified:
+        stats['files_modified'].add(result.rel_path)
+
+def remove_console_from_file(file_path):
+    """Remove console.* de um arquivo de forma inteligente (API serial, usa removal_stats)"""
+    result = write_result(file_path, process_file(file_path))
+    if result.error:
+        print(result.error)
+    merge_result(removal_stats, result)
+    return result.modified
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Remove console.* do código de produção em src/")
+    parser.add_argument(
+        '--jobs', '-j', type=int, default=1,
+        help="Processos paralelos (0 = todos os núcleos, padrão: 1)"
+    )
+    add_dry_run_arguments(parser)
+    add_profile_arguments(parser)
+    return parser.parse_args()
 
 def main():
+    args = parse_args()
+    diff_writer = diff_writer_from_args(args)
+    try:
+        run(args, diff_writer)
+    finally:
+        # Devolve o stdout mesmo se o dry-run falhar no meio
+        if diff_writer:
+            diff_writer.close()
+
+def run(args, diff_writer):
+    """Remove (ou, no --dry-run, só calcula o diff de) console.* em src/"""
+    profiler = Profiler.from_args(args, 'remove_console_logs')
     print("🚀 Removendo console.logs do código de produção...\n")
     
     # Diretórios prioritários
@@ -161,49 +263,66 @@ def main():
         'hooks', 'services', 'store', 'contexts', 'middleware'
     ]
     
-    files_processed = 0
+    # Acumulador desta execução, somado só dos RemovalResult dos workers (o
+    # removal_stats do módulo é da API serial remove_console_from_file)
+    totals = new_removal_stats()
+    profiler.mark("varredura e remoção")
     
-    for ext in ['**/*.ts', '**/*.tsx', '**/*.js', '**/*.jsx']:
-        for file_path in SRC_DIR.glob(ext):
-            # Pular node_modules e arquivos de teste se necessário
-            if 'node_modules' in str(file_path):
-                continue
-            
-            # Processar apenas diretórios prioritários ou processar tudo
-            rel_path = file_path.relative_to(SRC_DIR)
-            if len(rel_path.parts) > 0:
-                main_dir = rel_path.parts[0]
-                # Processar todos os arquivos em src/
-                remove_console_from_file(file_path)
-                files_processed += 1
+    # Varredura única de src/ (node_modules e .gitignore já podados); cada
+    # worker grava seus arquivos e os resultados são somados na ordem da varredura
+    files = list(iter_source_files(SRC_DIR))
+    worker = partial(remove_console_files, diff_format=args.diff_format if args.dry_run else None)
+    for results in run_sharded(worker, files, resolve_jobs(args.jobs)):
+        for result in results:
+            if result.error:
+                print(result.error)
+            merge_result(totals, result)
+            if diff_writer:
+                diff_writer.write(result.diff)
+    files_processed = len(files)
+    profiler.count(files_processed)
     
+    profiler.mark("relatórios")
     # Imprimir estatísticas
     print("\n" + "=" * 80)
     print("📊 RELATÓRIO DE REMOÇÃO DE CONSOLE.*")
     print("=" * 80)
     
-    total_removed = sum(removal_stats['removed'].values())
-    total_kept = sum(removal_stats['kept'].values())
+    total_removed = sum(totals['removed'].values())
+    total_kept = sum(totals['kept'].values())
+    total_skipped = sum(totals['skipped'].values())
     
     print(f"\n✅ Total removido: {total_removed}")
     print(f"🔒 Total mantido (console.error/warn em catch): {total_kept}")
-    print(f"📝 Arquivos modificados: {len(removal_stats['files_modified'])}")
+    print(f"⚠️  Não removidos (usados como expressão): {total_skipped}")
+    print(f"📝 Arquivos modificados: {len(totals['files_modified'])}")
     print(f"📄 Arquivos processados: {files_processed}")
     
     print("\n📈 Removidos por tipo:")
-    for console_type, count in sorted(removal_stats['removed'].items(), key=lambda x: x[1], reverse=True):
+    for console_type, count in sorted(totals['removed'].items(), key=lambda x: x[1], reverse=True):
         print(f"   console.{console_type}: {count}")
     
     print("\n🔒 Mantidos por tipo (em blocos catch):")
-    for console_type, count in sorted(removal_stats['kept'].items(), key=lambda x: x[1], reverse=True):
+    for console_type, count in sorted(totals['kept'].items(), key=lambda x: x[1], reverse=True):
         print(f"   console.{console_type}: {count}")
     
+    if totals['skipped']:
+        print("\n⚠️  Não removidos por tipo (revisar manualmente):")
+        for console_type, count in sorted(totals['skipped'].items(), key=lambda x: x[1], reverse=True):
+            print(f"   console.{console_type}: {count}")
+    
+    if diff_writer:
+        print(f"\n🔍 Dry-run: nada foi gravado; diff de {diff_writer.files} arquivos em "
+              f"{'stdout' if args.diff_output == '-' else args.diff_output}")
+        profiler.finish()
+        return
+    
     # Salvar lista de arquivos modificados
     modified_files_path = PROJECT_ROOT / "modified_files_console_removal.txt"
     with open(modified_files_path, 'w', encoding='utf-8') as f:
         f.write("ARQUIVOS MODIFICADOS - REMOÇÃO DE CONSOLE.*\n")
         f.write("=" * 80 + "\n\n")
-        for file_path in sorted(removal_stats['files_modified']):
+        for file_path in sorted(totals['files_modified']):
             f.write(f"{file_path}\n")
     
     print(f"\n✅ Lista de arquivos modificados salva em: {modified_files_path}")
@@ -215,18 +334,24 @@ def main():
         f.write("=" * 80 + "\n\n")
         f.write(f"Total removido: {total_removed}\n")
         f.write(f"Total mantido: {total_kept}\n")
-        f.write(f"Arquivos modificados: {len(removal_stats['files_modified'])}\n")
+        f.write(f"Total não removido (expressão): {total_skipped}\n")
+        f.write(f"Arquivos modificados: {len(totals['files_modified'])}\n")
         f.write(f"Arquivos processados: {files_processed}\n\n")
         
         f.write("REMOVIDOS POR TIPO:\n")
-        for console_type, count in sorted(removal_stats['removed'].items(), key=lambda x: x[1], reverse=True):
+        for console_type, count in sorted(totals['removed'].items(), key=lambda x: x[1], reverse=True):
             f.write(f"  console.{console_type}: {count}\n")
         
         f.write("\nMANTIDOS POR TIPO:\n")
-        for console_type, count in sorted(removal_stats['kept'].items(), key=lambda x: x[1], reverse=True):
+        for console_type, count in sorted(totals['kept'].items(), key=lambda x: x[1], reverse=True):
+            f.write(f"  console.{console_type}: {count}\n")
+        
+        f.write("\nNÃO REMOVIDOS (EXPRESSÃO) POR TIPO:\n")
+        for console_type, count in sorted(totals['skipped'].items(), key=lambda x: x[1], reverse=True):
             f.write(f"  console.{console_type}: {count}\n")
     
     print(f"✅ Estatísticas detalhadas salvas em: {stats_path}\n")
+    profiler.finish()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Matriz de similaridade vetorizada (NumPy)
+
+Reproduz exatamente calculate_similarity de create-similarity-matrix.py para
+todos os pares de uma vez: os tamanhos viram um vetor, os diretórios viram
+ids de prefixo por nível e a matriz é calculada com broadcasting, em blocos
+de linhas para manter a memória limitada em n grande.
+
+Saídas:
+    .npy  matriz densa n×n (float64), gravada bloco a bloco via memmap
+    .npz  esparsa: por linha, os top-k pares acima do limiar
+
+Uso:
+    python scripts/similarity_engine.py dashboard_analysis_report.json --out dashboards.npy
+    python scripts/similarity_engine.py dashboard_analysis_report.json --out dashboards.npz --top-k 10 --content
+"""
+
+import argparse
+import json
+import time
+from typing import Dict, Iterator, List, Tuple
+
+from minhash import compute_signatures
+
+try:
+    import numpy as np
+except ImportError:  # dependência opcional: só este módulo precisa dela
+    np = None
+
+# Orçamento de memória por bloco de linhas (comparação de prefixos + scores)
+DEFAULT_MEMORY_MB = 64
+
+
+def require_numpy():
+    if np is None:
+        raise ImportError("numpy é necessário para a matriz vetorizada: pip install numpy")
+
+
+class ModuleArrays:
+    """
+    Módulos codificados em arrays
+
+    - lines: linhas de código (0 quando ausente)
+    - has_lines: 'lines' presente e > 0 (condição do fator de tamanho)
+    - has_path: 'path' presente (condição do fator de caminho)
+    - depth: níveis de diretório do caminho
+    - prefixes: id do prefixo de diretório em cada nível (-1 além da profundidade);
+      prefixos iguais no nível k implicam todos os níveis anteriores iguais
+    - signatures / has_signature: assinaturas MinHash (fator de conteúdo), se houver
+    """
+
+    def __init__(self, modules: List[dict]):
+        require_numpy()
+        self.paths = [module.get('path', '') for module in modules]
+        count = len(modules)
+
+        self.lines = np.zeros(count, dtype=np.float64)
+        self.has_lines = np.zeros(count, dtype=bool)
+        self.has_path = np.zeros(count, dtype=bool)
+        self.depth = np.zeros(count, dtype=np.int64)
+
+        directories = []
+        for index, module in enumerate(modules):
+            if 'lines' in module and module['lines'] > 0:
+                self.lines[index] = module['lines']
+                self.has_lines[index] = True
+            if 'path' in module:
+                self.has_path[index] = True
+                directories.append(module['path'].split('/')[:-1])
+            else:
+                directories.append([])
+            self.depth[index] = len(directories[-1])
+
+        # Assinaturas MinHash (module['minhash']), todas com o mesmo tamanho
+        width = max((len(module.get('minhash') or ()) for module in modules), default=0)
+        self.signatures = np.zeros((count, width), dtype=np.uint64)
+        self.has_signature = np.zeros(count, dtype=bool)
+        for index, module in enumerate(modules):
+            if module.get('minhash'):
+                self.signatures[index] = module['minhash']
+                self.has_signature[index] = True
+
+        max_depth = int(self.depth.max()) if count else 0
+        self.prefixes = np.full((count, max(max_depth, 1)), -1, dtype=np.int64)
+        prefix_ids: Dict[Tuple[str, ...], int] = {}
+        for index, parts in enumerate(directories):
+            for level in range(len(parts)):
+                key = tuple(parts[:level + 1])
+                self.prefixes[index, level] = prefix_ids.setdefault(key, len(prefix_ids))
+
+    def __len__(self):
+        return len(self.paths)
+
+
+def block_rows(arrays: ModuleArrays, memory_mb: int = DEFAULT_MEMORY_MB) -> int:
+    """Linhas por bloco para caber no orçamento de memória"""
+    per_row = max(len(arrays), 1) * ((arrays.prefixes.shape[1] + arrays.signatures.shape[1]) * 2 + 8 * 8)
+    return max(1, (memory_mb * 1024 * 1024) // per_row)
+
+
+def similarity_block(arrays: ModuleArrays, start: int, stop: int) -> 'np.ndarray':
+    """
+    Scores das linhas start:stop contra todos os módulos
+
+    Mesma sequência de operações de calculate_similarity (soma a partir de
+    0.0 e divisão pelo número de fatores), então os valores são idênticos.
+    """
+    rows = slice(start, stop)
+
+    # Fator 1: razão de tamanho
+    lines_r = arrays.lines[rows, None]
+    lines_c = arrays.lines[None, :]
+    has_size = arrays.has_lines[rows, None] & arrays.has_lines[None, :]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        size = (np.minimum(lines_r, lines_c) / np.maximum(lines_r, lines_c)) * 100
+
+    # Fator 2: níveis de diretório em comum / maior profundidade
+    has_path = arrays.has_path[rows, None] & arrays.has_path[None, :]
+    prefixes_r = arrays.prefixes[rows]
+    common = ((prefixes_r[:, None, :] == arrays.prefixes[None, :, :]) & (prefixes_r[:, None, :] >= 0)).sum(axis=2)
+    denominator = np.maximum(arrays.depth[rows, None], arrays.depth[None, :])
+    if np.any(has_path & (denominator == 0)):
+        # Mesmo comportamento da função escalar (dois caminhos sem diretório)
+        raise ZeroDivisionError("division by zero")
+    with np.errstate(divide='ignore', invalid='ignore'):
+        path = (common / denominator) * 100
+
+    score = np.where(has_size, size, 0.0) + np.where(has_path, path, 0.0)
+    factors = has_size.astype(np.int64) + has_path.astype(np.int64)
+
+    # Fator 3: Jaccard estimado (posições iguais das assinaturas MinHash)
+    if arrays.has_signature.any():
+        has_content = arrays.has_signature[rows, None] & arrays.has_signature[None, :]
+        matches = (arrays.signatures[rows][:, None, :] == arrays.signatures[None, :, :]).sum(axis=2)
+        content = (matches / arrays.signatures.shape[1]) * 100
+        score = score + np.where(has_content, content, 0.0)
+        factors = factors + has_content.astype(np.int64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(factors > 0, score / factors, 0.0)
+
+
+def iter_similarity_blocks(arrays: ModuleArrays, memory_mb: int = DEFAULT_MEMORY_MB) -> Iterator[Tuple[int, 'np.ndarray']]:
+    """Yields (primeira linha, bloco de scores) cobrindo a matriz inteira"""
+    step = block_rows(arrays, memory_mb)
+    for start in range(0, len(arrays), step):
+        stop = min(start + step, len(arrays))
+        yield start, similarity_block(arrays, start, stop)
+
+
+def save_dense(arrays: ModuleArrays, out_path: str, memory_mb: int = DEFAULT_MEMORY_MB) -> None:
+    """Grava a matriz n×n em .npy, bloco a bloco (sem montá-la em memória)"""
+    count = len(arrays)
+    matrix = np.lib.format.open_memmap(out_path, mode='w+', dtype=np.float64, shape=(count, count))
+    for start, block in iter_similarity_blocks(arrays, memory_mb):
+        matrix[start:start + len(block)] = block
+    matrix.flush()
+    del matrix
+
+
+def top_k_pairs(arrays: ModuleArrays, k: int, threshold: float,
+                memory_mb: int = DEFAULT_MEMORY_MB) -> Tuple['np.ndarray', 'np.ndarray', 'np.ndarray']:
+    """
+    Por linha, os k maiores scores >= threshold (sem a diagonal)
+
+    Empates são resolvidos pelo índice da coluna, então o resultado é determinístico.
+
+    Returns:
+        (linhas, colunas, scores) ordenados por linha e score decrescente
+    """
+    rows_out, cols_out, scores_out = [], [], []
+    for start, block in iter_similarity_blocks(arrays, memory_mb):
+        block = block.copy()
+        local = np.arange(len(block))
+        block[local, start + local] = -np.inf
+        for offset, row in enumerate(block):
+            candidates = np.flatnonzero(row >= threshold)
+            if not len(candidates):
+                continue
+            order = np.lexsort((candidates, -row[candidates]))[:k]
+            chosen = candidates[order]
+            rows_out.append(np.full(len(chosen), start + offset, dtype=np.int64))
+            cols_out.append(chosen.astype(np.int64))
+            scores_out.append(row[chosen])
+    if not rows_out:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty.copy(), np.zeros(0, dtype=np.float64)
+    return np.concatenate(rows_out), np.concatenate(cols_out), np.concatenate(scores_out)
+
+
+def save_top_k(arrays: ModuleArrays, out_path: str, k: int, threshold: float,
+               memory_mb: int = DEFAULT_MEMORY_MB) -> int:
+    """Grava os top-k pares por linha em .npz; retorna o número de pares"""
+    rows, cols, scores = top_k_pairs(arrays, k, threshold, memory_mb)
+    np.savez_compressed(
+        out_path, rows=rows, cols=cols, scores=scores,
+        paths=np.array(arrays.paths), k=k, threshold=threshold
+    )
+    return len(rows)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Matriz de similaridade vetorizada a partir de um relatório JSON")
+    parser.add_argument('report', help="Relatório com a lista de módulos (ex.: dashboard_analysis_report.json)")
+    parser.add_argument('--key', default='files', help="Chave da lista de módulos no relatório (padrão: files)")
+    parser.add_argument('--out', required=True, help="Arquivo de saída: .npy (denso) ou .npz (com --top-k)")
+    parser.add_argument('--top-k', type=int, help="Grava só os k pares mais similares de cada módulo")
+    parser.add_argument('--threshold', type=float, default=50.0,
+                        help="Score mínimo no modo --top-k (padrão: 50)")
+    parser.add_argument('--content', action='store_true',
+                        help="Inclui o fator de conteúdo (assinaturas MinHash, com cache)")
+    parser.add_argument('--memory-mb', type=int, default=DEFAULT_MEMORY_MB,
+                        help=f"Memória por bloco de linhas (padrão: {DEFAULT_MEMORY_MB} MB)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    with open(args.report, 'r') as f:
+        modules = json.load(f).get(args.key, [])
+
+    start = time.perf_counter()
+    if args.content:
+        signatures = compute_signatures(module['path'] for module in modules if 'path' in module)
+        for module in modules:
+            if signatures.get(module.get('path')):
+                module['minhash'] = signatures[module['path']]
+    arrays = ModuleArrays(modules)
+    if args.top_k:
+        pairs = save_top_k(arrays, args.out, args.top_k, args.threshold, args.memory_mb)
+        print(f"✓ {pairs} pares (top-{args.top_k}, score >= {args.threshold}) de {len(arrays)} módulos")
+    else:
+        save_dense(arrays, args.out, args.memory_mb)
+        print(f"✓ Matriz {len(arrays)}×{len(arrays)} calculada")
+    print(f"✓ Salvo em {args.out} ({time.perf_counter() - start:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
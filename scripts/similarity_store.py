@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Store binário de similaridade (CSR) com consulta dos vizinhos de um módulo
+
+Os scores par a par (similarity_engine) ficam gravados como uma matriz
+esparsa em formato CSR, em arquivos .npy que podem ser abertos com memmap:
+
+    paths.npy     tabela de caminhos, ordenada (busca binária sem carregar tudo)
+    indptr.npy    início dos vizinhos de cada módulo (n + 1)
+    indices.npy   módulo vizinho
+    scores.npy    score do par (float32)
+    meta.json     versão, contagens e parâmetros da geração
+
+Os vizinhos de cada linha estão em ordem decrescente de score, então o
+top-k de um módulo é só a fatia indptr[i]:indptr[i] + k. A consulta não lê
+os relatórios JSON nem a matriz inteira.
+
+Uso:
+    python scripts/similarity_store.py build --content
+    python scripts/similarity_store.py query InteropDashboard.tsx --top-k 10
+"""
+
+import argparse
+import json
+import os
+import shutil
+import time
+from typing import Dict, Iterable, List, Tuple
+
+from minhash import compute_signatures
+from parallel import resolve_jobs
+from similarity_engine import DEFAULT_MEMORY_MB, ModuleArrays, require_numpy, top_k_pairs
+
+try:
+    import numpy as np
+except ImportError:  # dependência opcional: require_numpy avisa na hora de usar
+    np = None
+
+# Versão do formato: incrementar obriga a regerar o store
+STORE_VERSION = 1
+
+STORE_DIR = ".analysis-cache/similarity_store"
+REPORTS = ('dashboard_analysis_report.json', 'command_center_analysis_report.json')
+
+# Pares abaixo do score mínimo e além do limite de vizinhos por módulo não são gravados
+DEFAULT_MIN_SCORE = 25.0
+DEFAULT_MAX_NEIGHBORS = 50
+
+_ARRAYS = ('paths', 'indptr', 'indices', 'scores')
+
+
+def collect_modules(reports: Iterable[str] = REPORTS, key: str = 'files') -> List[dict]:
+    """Módulos de todos os relatórios, na ordem em que aparecem"""
+    modules = []
+    for report in reports:
+        with open(report, 'r') as f:
+            modules.extend(json.load(f).get(key, []))
+    return modules
+
+
+def save_store(modules: List[dict], store_dir: str = STORE_DIR, min_score: float = DEFAULT_MIN_SCORE,
+               max_neighbors: int = DEFAULT_MAX_NEIGHBORS, memory_mb: int = DEFAULT_MEMORY_MB) -> dict:
+    """
+    Calcula os scores e grava o store em store_dir
+
+    O store é montado em um diretório temporário e trocado no final, então
+    uma consulta nunca vê um store pela metade.
+
+    Returns:
+        Metadados gravados em meta.json
+    """
+    require_numpy()
+    # Linhas ordenadas por caminho (busca binária na consulta); caminho repetido conta uma vez
+    unique: Dict[str, dict] = {}
+    for module in modules:
+        if 'path' in module:
+            unique.setdefault(module['path'], module)
+    modules = [unique[path] for path in sorted(unique)]
+    arrays = ModuleArrays(modules)
+    rows, cols, scores = top_k_pairs(arrays, max_neighbors, min_score, memory_mb)
+
+    indptr = np.zeros(len(arrays) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=len(arrays)), out=indptr[1:])
+    data = {
+        'paths': np.array(arrays.paths, dtype=str) if modules else np.zeros(0, dtype='<U1'),
+        'indptr': indptr,
+        'indices': cols.astype(np.int32),
+        'scores': scores.astype(np.float32),
+    }
+    meta = {
+        'version': STORE_VERSION,
+        'modules': len(arrays),
+        'pairs': int(len(cols)),
+        'min_score': min_score,
+        'max_neighbors': max_neighbors,
+        'content': bool(arrays.has_signature.any()),
+    }
+
+    tmp_dir = f"{store_dir}.tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    for name in _ARRAYS:
+        np.save(os.path.join(tmp_dir, f"{name}.npy"), data[name])
+    with open(os.path.join(tmp_dir, 'meta.json'), 'w') as f:
+        json.dump(meta, f, indent=2)
+
+    old_dir = f"{store_dir}.old"
+    shutil.rmtree(old_dir, ignore_errors=True)
+    if os.path.exists(store_dir):
+        os.replace(store_dir, old_dir)
+    os.replace(tmp_dir, store_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+    return meta
+
+
+class SimilarityStore:
+    """Store aberto com memmap: só as páginas consultadas são lidas do disco"""
+
+    def __init__(self, store_dir: str = STORE_DIR):
+        require_numpy()
+        with open(os.path.join(store_dir, 'meta.json'), 'r') as f:
+            self.meta = json.load(f)
+        if self.meta.get('version') != STORE_VERSION:
+            raise ValueError(f"Store em {store_dir} tem versão {self.meta.get('version')}, "
+                             f"esperada {STORE_VERSION}: rode 'build' de novo")
+        for name in _ARRAYS:
+            setattr(self, name, np.load(os.path.join(store_dir, f"{name}.npy"), mmap_mode='r'))
+        if len(self.paths) != self.meta['modules'] or len(self.indices) != self.meta['pairs']:
+            raise ValueError(f"Store em {store_dir} inconsistente com meta.json: rode 'build' de novo")
+
+    def __len__(self):
+        return len(self.paths)
+
+    def locate(self, name: str) -> List[int]:
+        """
+        Índices dos módulos com esse caminho (busca binária) ou, se não houver,
+        dos módulos cujo caminho termina em /name
+        """
+        index = int(np.searchsorted(self.paths, name))
+        if index < len(self.paths) and self.paths[index] == name:
+            return [index]
+        return [int(i) for i in np.flatnonzero(np.char.endswith(self.paths, '/' + name))]
+
+    def neighbors(self, index: int, k: int = 10) -> List[Tuple[str, float]]:
+        """Os k módulos mais similares (caminho, score), em ordem decrescente"""
+        start = int(self.indptr[index])
+        stop = min(int(self.indptr[index + 1]), start + k)
+        return [
+            (str(self.paths[other]), float(score))
+            for other, score in zip(self.indices[start:stop], self.scores[start:stop])
+        ]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Store de similaridade entre módulos e consulta de vizinhos")
+    parser.add_argument('command', choices=['build', 'query'],
+                        help="build = calcula e grava o store; query = vizinhos de um módulo")
+    parser.add_argument('module', nargs='?', help="Para query: caminho ou nome do arquivo")
+    parser.add_argument('--store', default=STORE_DIR, help=f"Diretório do store (padrão: {STORE_DIR})")
+    parser.add_argument('--top-k', type=int, default=10, help="Vizinhos exibidos (padrão: 10)")
+    parser.add_argument('--reports', nargs='+', default=list(REPORTS),
+                        help="Relatórios com a lista de módulos (padrão: dashboards e command centers)")
+    parser.add_argument('--content', action='store_true',
+                        help="Inclui o fator de conteúdo (assinaturas MinHash, com cache)")
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help="Processos paralelos para as assinaturas (0 = todos os núcleos, padrão: 1)")
+    parser.add_argument('--min-score', type=float, default=DEFAULT_MIN_SCORE,
+                        help=f"Score mínimo gravado (padrão: {DEFAULT_MIN_SCORE:.0f})")
+    parser.add_argument('--max-neighbors', type=int, default=DEFAULT_MAX_NEIGHBORS,
+                        help=f"Vizinhos gravados por módulo (padrão: {DEFAULT_MAX_NEIGHBORS})")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    start = time.perf_counter()
+
+    if args.command == 'build':
+        modules = collect_modules(args.reports)
+        if args.content:
+            signatures = compute_signatures((m['path'] for m in modules), resolve_jobs(args.jobs))
+            for module in modules:
+                if signatures.get(module['path']):
+                    module['minhash'] = signatures[module['path']]
+        meta = save_store(modules, args.store, args.min_score, args.max_neighbors)
+        print(f"✓ {meta['pairs']} pares de {meta['modules']} módulos (score >= {args.min_score}, "
+              f"até {args.max_neighbors} por módulo)")
+        print(f"✓ Store salvo em {args.store} ({time.perf_counter() - start:.2f}s)")
+        return
+
+    if not args.module:
+        print("❌ Informe o caminho ou nome do módulo")
+        return
+    if not os.path.exists(os.path.join(args.store, 'meta.json')):
+        print(f"⚠️  Store não encontrado em {args.store}: rode 'build' primeiro")
+        return
+    store = SimilarityStore(args.store)
+    matches = store.locate(args.module)
+    if not matches:
+        print(f"❌ {args.module} não está no store ({len(store)} módulos)")
+        return
+    for index in matches:
+        neighbors = store.neighbors(index, args.top_k)
+        print(f"\n🔎 {store.paths[index]}: {len(neighbors)} vizinhos")
+        for path, score in neighbors:
+            print(f"   {score:6.1f}  {path}")
+    print(f"\n({(time.perf_counter() - start) * 1000:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Diffs em memória para o modo --dry-run dos scripts que reescrevem src/
+
+Os workers calculam o novo conteúdo, renderizam o diff (render_diff) e
+devolvem só o texto; o processo principal grava os diffs na ordem dos
+arquivos com DiffWriter. Nada é gravado em src/.
+
+Formatos:
+    unified   diff unificado (a/ e b/, aplicável com git apply ou patch -p1)
+    json      lista JSON de patches: {"path", "hunks": [{"old_start",
+              "old_count", "new_start", "new_count", "removed", "added"}]},
+              com as linhas completas (incluindo a quebra de linha)
+"""
+
+import difflib
+import json
+import sys
+from typing import Optional
+
+DIFF_FORMATS = ('unified', 'json')
+
+# Linhas de contexto em volta de cada trecho do diff unificado
+CONTEXT_LINES = 3
+
+NO_NEWLINE = "\\ No newline at end of file\n"
+
+
+def unified_diff(rel_path: str, old: str, new: str, context: int = CONTEXT_LINES) -> str:
+    """Diff unificado no formato do git (marca arquivos sem quebra de linha no final)"""
+    parts = []
+    diff = difflib.unified_diff(
+        old.splitlines(True), new.splitlines(True), f"a/{rel_path}", f"b/{rel_path}", n=context
+    )
+    for line in diff:
+        parts.append(line)
+        if not line.endswith('\n'):
+            parts.append('\n')
+            parts.append(NO_NEWLINE)
+    return ''.join(parts)
+
+
+def json_patch(rel_path: str, old: str, new: str) -> dict:
+    """Trechos alterados (linhas numeradas a partir de 1) de um arquivo"""
+    old_lines = old.splitlines(True)
+    new_lines = new.splitlines(True)
+    matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+    hunks = [
+        {
+            'old_start': i1 + 1, 'old_count': i2 - i1,
+            'new_start': j1 + 1, 'new_count': j2 - j1,
+            'removed': old_lines[i1:i2], 'added': new_lines[j1:j2],
+        }
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes() if tag != 'equal'
+    ]
+    return {'path': rel_path, 'hunks': hunks}
+
+
+def render_diff(rel_path: str, old: str, new: str, fmt: str = 'unified') -> str:
+    """Diff de um arquivo já renderizado (texto unificado ou um objeto JSON)"""
+    if fmt == 'json':
+        return json.dumps(json_patch(rel_path, old, new), ensure_ascii=False)
+    return unified_diff(rel_path, old, new)
+
+
+class DiffWriter:
+    """
+    Grava os diffs renderizados, em ordem, em um arquivo ou no stdout ('-')
+
+    Com o diff no stdout, os prints de progresso do script passam para o
+    stderr até close(). No formato json os patches formam uma única lista
+    JSON, gravada aos poucos (um patch por vez).
+
+    Use como context manager (ou feche em um finally): assim o stdout volta
+    mesmo se o dry-run falhar no meio.
+    """
+
+    def __init__(self, path: str = '-', fmt: str = 'unified'):
+        self.path = path
+        self.fmt = fmt
+        self.files = 0
+        if path == '-':
+            self._out = sys.stdout
+            sys.stdout = sys.stderr
+        else:
+            self._out = open(path, 'w', encoding='utf-8', newline='')
+        if fmt == 'json':
+            self._out.write('[')
+
+    def write(self, rendered: Optional[str]) -> None:
+        if self._out is None:
+            raise ValueError("DiffWriter já foi fechado")
+        if not rendered:
+            return
+        if self.fmt == 'json':
+            self._out.write(',\n' if self.files else '\n')
+        self._out.write(rendered)
+        self.files += 1
+
+    def close(self) -> None:
+        """Fecha a lista JSON e devolve o stdout (pode ser chamado mais de uma vez)"""
+        if self._out is None:
+            return
+        out, self._out = self._out, None
+        try:
+            if self.fmt == 'json':
+                out.write('\n]\n' if self.files else ']\n')
+        finally:
+            if self.path == '-':
+                out.flush()
+                sys.stdout = out
+            else:
+                out.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+def add_dry_run_arguments(parser) -> None:
+    """Opções --dry-run, --diff-format e --diff-output"""
+    parser.add_argument(
+        '--dry-run', action='store_true',
+        help="Não grava nada em src/: calcula as mudanças em memória e emite o diff"
+    )
+    parser.add_argument(
+        '--diff-format', choices=DIFF_FORMATS, default='unified',
+        help="Formato do diff no --dry-run: unified (padrão) ou json (lista de patches)"
+    )
+    parser.add_argument(
+        '--diff-output', default='-', metavar='ARQUIVO',
+        help="Onde gravar o diff do --dry-run (padrão: stdout; o progresso vai para o stderr)"
+    )
+
+
+def diff_writer_from_args(args) -> Optional[DiffWriter]:
+    """DiffWriter das opções de add_dry_run_arguments, ou None sem --dry-run"""
+    if not args.dry_run:
+        return None
+    return DiffWriter(args.diff_output, args.diff_format)
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Descoberta de arquivos-fonte compartilhada pelos scripts de varredura
+
+Percorre a árvore UMA única vez com os.scandir, poda diretórios ignorados
+antes de descer neles, respeita .gitignore e entrega os arquivos sob demanda
+(generator), para que o processamento comece no primeiro arquivo encontrado.
+"""
+
+import mmap
+import os
+import re
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+
+# Filtros de extensão únicos para todos os scripts
+SOURCE_EXTENSIONS = ('.ts', '.tsx', '.js', '.jsx')
+TS_EXTENSIONS = ('.ts', '.tsx')
+DECLARATION_SUFFIXES = ('.d.ts',)
+
+# Diretórios nunca percorridos (comparação pelo nome exato do diretório)
+IGNORED_DIRS = frozenset({'node_modules', 'dist', 'build', '.git'})
+
+# A partir deste tamanho o arquivo é mapeado em memória em vez de lido; abaixo
+# dele o custo fixo do mmap supera o de um read() simples
+MMAP_THRESHOLD = 64 * 1024
+
+
+def _translate_gitignore_pattern(pattern: str) -> str:
+    """Converte um padrão do .gitignore em regex sobre o caminho relativo"""
+    anchored = '/' in pattern.rstrip('/')
+    pattern = pattern.strip('/')
+
+    parts = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith('**/', i):
+            parts.append('(?:.*/)?')
+            i += 3
+        elif pattern.startswith('/**', i) and i + 3 == len(pattern):
+            parts.append('/.*')
+            i += 3
+        elif pattern[i] == '*':
+            parts.append('[^/]*')
+            i += 1
+        elif pattern[i] == '?':
+            parts.append('[^/]')
+            i += 1
+        elif pattern[i] == '[':
+            end = pattern.find(']', i + 1)
+            if end == -1:
+                parts.append(re.escape('['))
+                i += 1
+            else:
+                body = pattern[i + 1:end]
+                if body.startswith('!'):
+                    body = '^' + body[1:]
+                parts.append(f'[{body}]')
+                i = end + 1
+        elif pattern[i] == '\\' and i + 1 < len(pattern):
+            parts.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            parts.append(re.escape(pattern[i]))
+            i += 1
+
+    prefix = '' if anchored else '(?:.*/)?'
+    return f'^{prefix}{"".join(parts)}$'
+
+
+class GitignoreRules:
+    """Regras de um arquivo .gitignore (a última regra que casar vence)"""
+
+    def __init__(self, lines: Iterable[str]):
+        self.rules: List[Tuple[re.Pattern, bool, bool]] = []
+        for raw in lines:
+            line = raw.rstrip('\n').rstrip()
+            if not line or line.startswith('#'):
+                continue
+            negate = line.startswith('!')
+            if negate:
+                line = line[1:]
+            elif line.startswith('\\'):
+                line = line[1:]
+            dir_only = line.endswith('/')
+            self.rules.append((re.compile(_translate_gitignore_pattern(line)), negate, dir_only))
+
+    @classmethod
+    def from_directory(cls, directory: str) -> Optional['GitignoreRules']:
+        """Carrega <directory>/.gitignore, se existir"""
+        try:
+            with open(os.path.join(directory, '.gitignore'), 'r', encoding='utf-8') as f:
+                rules = cls(f)
+        except OSError:
+            return None
+        return rules if rules.rules else None
+
+    def match(self, rel_path: str, is_dir: bool) -> Optional[bool]:
+        """True = ignorado, False = reincluído (!), None = nenhuma regra casou"""
+        result = None
+        for regex, negate, dir_only in self.rules:
+            if dir_only and not is_dir:
+                continue
+            if regex.match(rel_path):
+                result = not negate
+        return result
+
+
+# (regras, prefixo a adicionar, caracteres a remover) para obter o caminho
+# relativo ao diretório do .gitignore a partir do caminho relativo à raiz
+_RuleScope = Tuple[GitignoreRules, str, int]
+
+
+def _ancestor_gitignores(root: str) -> List[_RuleScope]:
+    """Carrega os .gitignore dos diretórios acima da raiz até o topo do repositório"""
+    scopes = []
+    current = os.path.dirname(root)
+    rel = os.path.basename(root)
+    while True:
+        rules = GitignoreRules.from_directory(current)
+        if rules:
+            scopes.append((rules, rel + '/', 0))
+        if os.path.isdir(os.path.join(current, '.git')):
+            break
+        parent = os.path.dirname(current)
+        if parent == current:
+            break
+        rel = f'{os.path.basename(current)}/{rel}'
+        current = parent
+    # Do mais externo para o mais interno: regras internas têm precedência
+    scopes.reverse()
+    return scopes
+
+
+def _is_ignored(scopes: List[_RuleScope], rel_path: str, is_dir: bool) -> bool:
+    ignored = False
+    for rules, prefix, strip in scopes:
+        result = rules.match(prefix + rel_path[strip:], is_dir)
+        if result is not None:
+            ignored = result
+    return ignored
+
+
+def iter_source_files(
+    root,
+    extensions: Tuple[str, ...] = SOURCE_EXTENSIONS,
+    exclude_suffixes: Tuple[str, ...] = (),
+    ignored_dirs: frozenset = IGNORED_DIRS,
+    use_gitignore: bool = True,
+) -> Iterator[Path]:
+    """
+    Percorre `root` uma única vez e entrega os arquivos com as extensões pedidas
+
+    Diretórios em `ignored_dirs` ou ignorados pelo .gitignore são podados antes
+    da descida. A ordem é determinística (entradas ordenadas por nome).
+
+    Yields:
+        Caminhos no mesmo formato de `root` (ex.: src/components/X.tsx)
+    """
+    root = os.fspath(root)
+    scopes = _ancestor_gitignores(os.path.abspath(root)) if use_gitignore else []
+    yield from _walk(root, '', scopes, extensions, exclude_suffixes, ignored_dirs, use_gitignore)
+
+
+def _walk(directory, rel_dir, scopes, extensions, exclude_suffixes, ignored_dirs, use_gitignore):
+    if use_gitignore:
+        local = GitignoreRules.from_directory(directory)
+        if local:
+            scopes = scopes + [(local, '', len(rel_dir) + 1 if rel_dir else 0)]
+
+    try:
+        with os.scandir(directory) as it:
+            entries = sorted(it, key=lambda e: e.name)
+    except OSError:
+        return
+
+    for entry in entries:
+        name = entry.name
+        rel_path = f'{rel_dir}/{name}' if rel_dir else name
+        if entry.is_dir(follow_symlinks=False):
+            if name in ignored_dirs:
+                continue
+            if scopes and _is_ignored(scopes, rel_path, True):
+                continue
+            yield from _walk(entry.path, rel_path, scopes, extensions,
+                             exclude_suffixes, ignored_dirs, use_gitignore)
+        elif name.endswith(extensions) and not name.endswith(exclude_suffixes):
+            if scopes and _is_ignored(scopes, rel_path, False):
+                continue
+            yield Path(entry.path)
+
+
+@contextmanager
+def open_bytes(path) -> Iterator[Union[bytes, mmap.mmap]]:
+    """
+    Conteúdo binário do arquivo, sem decodificar
+
+    Arquivos grandes são mapeados em memória (mmap); os pequenos são lidos
+    de uma vez. Os dois suportam find(), fatias e hashlib, então quem chama
+    pode descartar arquivos sem ocorrências antes de qualquer decode.
+    """
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < MMAP_THRESHOLD:
+            yield f.read()
+            return
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            yield mapped
+        finally:
+            mapped.close()
+
+
+class LineCounter:
+    """
+    Converte offsets em números de linha sob demanda
+
+    Conta quebras de linha apenas até cada offset consultado, continuando de
+    onde parou (consultas em ordem crescente custam O(tamanho do arquivo) no total).
+    """
+
+    def __init__(self, content: Union[str, bytes]):
+        self.content = content
+        self.newline = '\n' if isinstance(content, str) else b'\n'
+        self.pos = 0
+        self.line = 1
+
+    def line_at(self, offset: int) -> int:
+        if offset < self.pos:
+            self.pos = 0
+            self.line = 1
+        self.line += self.content.count(self.newline, self.pos, offset)
+        self.pos = offset
+        return self.line
+
+
+def write_text_atomic(path, content: str, encoding: str = 'utf-8') -> None:
+    """
+    Grava um arquivo de texto de forma atômica (temporário + rename)
+
+    O temporário fica no mesmo diretório (mesmo sistema de arquivos), então
+    quem lê nunca vê o arquivo pela metade. As quebras de linha são gravadas
+    como estão e as permissões do arquivo original são mantidas.
+    """
+    path = os.fspath(path)
+    try:
+        mode = os.stat(path).st_mode & 0o7777
+    except OSError:
+        mode = 0o644
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', prefix='.tmp-', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding=encoding, newline='') as f:
+            f.write(content)
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Testes de regressão do removedor de console.* (remove_console_logs + js_lexer)
+
+Cada caso é um par (entrada, saída esperada). Mudanças em tokenize,
+ScopeTracker ou statement_end que alterem um desses resultados podem
+corromper arquivos de src/.
+
+Uso:
+    python -m pytest -q scripts/test_remove_console_logs.py
+"""
+
+import pytest
+
+from remove_console_logs import remove_console_statements
+
+# (id, entrada, saída esperada)
+CASES = [
+    # Statements inteiros: a linha sai junto
+    ('statement',
+     "function f() {\n  console.log('a');\n  return 1;\n}\n",
+     "function f() {\n  return 1;\n}\n"),
+    ('sem-ponto-e-virgula',
+     "run()\nconsole.log(a)\nnext()\n",
+     "run()\nnext()\n"),
+    ('mesma-linha',
+     "a(); console.log(1); b();\n",
+     "a(); b();\n"),
+    ('comentario-no-fim',
+     "  console.log(x); // debug\nrun();\n",
+     "run();\n"),
+    ('crlf',
+     "a();\r\nconsole.log(1);\r\nb();\r\n",
+     "a();\r\nb();\r\n"),
+    ('case',
+     "switch (x) {\n  case 1:\n    console.log(1);\n    break;\n}\n",
+     "switch (x) {\n  case 1:\n    break;\n}\n"),
+
+    # catch/finally: error e warn ficam, o resto sai
+    ('catch-finally',
+     "try {\n  run();\n  console.error('x');\n} catch (e) {\n  console.error('falhou', e);\n"
+     "  console.log('debug');\n} finally {\n  console.warn('fim');\n}\n",
+     "try {\n  run();\n} catch (e) {\n  console.error('falhou', e);\n} finally {\n"
+     "  console.warn('fim');\n}\n"),
+    ('callback-dentro-do-catch',
+     "try { a(); } catch (e) {\n  items.forEach((i) => {\n    console.error(i);\n  });\n}\n",
+     "try { a(); } catch (e) {\n  items.forEach((i) => {\n    console.error(i);\n  });\n}\n"),
+    ('promise-catch',
+     "load().catch((e) => {\n  console.error(e);\n  console.log(e);\n});\n",
+     "load().catch((e) => {\n  console.error(e);\n});\n"),
+    ('depois-do-catch',
+     "try { a(); } catch (e) {\n  console.error(e);\n}\nconsole.error('fora');\n",
+     "try { a(); } catch (e) {\n  console.error(e);\n}\n"),
+
+    # Posição de expressão: nada muda
+    ('if-sem-chaves',
+     "if (debug) console.log('x');\nelse run();\n",
+     None),
+    ('if-sem-chaves-quebra-de-linha',
+     "if (debug)\n  console.log('x');\nrun();\n",
+     None),
+    ('for-sem-chaves',
+     "for (;;) console.log(1);\n",
+     None),
+    ('corpo-de-arrow',
+     "const log = () => console.log('x');\n",
+     None),
+    ('e-logico',
+     "debug && console.log('x');\n",
+     None),
+    ('ternario',
+     "x = a ? console.log(1) : 2;\n",
+     None),
+    ('return',
+     "function f() {\n  return console.log('x');\n}\n",
+     None),
+    ('encadeado',
+     "console.log('a').then(x);\n",
+     None),
+    ('asi-parentese',
+     "const a = 1\nconsole.log(a)\n(b || c).run()\n",
+     None),
+    ('asi-colchete',
+     "console.log(a)\n[1, 2].forEach(run)\n",
+     None),
+
+    # Argumentos em várias linhas e templates
+    ('varias-linhas',
+     "function f() {\n  console.log(\n    'a',\n    { b: 1, c: [2, 3] }\n  );\n  done();\n}\n",
+     "function f() {\n  done();\n}\n"),
+    ('template',
+     "console.log(`valor: ${fn(')')} }`);\nrun();\n",
+     "run();\n"),
+    ('template-aninhado',
+     "console.debug(`a ${`b ${c(\")\")}`}`);\nrun();\n",
+     "run();\n"),
+    ('regex-com-parentese',
+     "const re = /\\)/;\nconsole.info(re, ')');\nrun();\n",
+     "const re = /\\)/;\nrun();\n"),
+
+    # JSX
+    ('jsx-filho',
+     "return (\n  <div>\n    {console.log('render')}\n    <span>{x}</span>\n  </div>\n);\n",
+     "return (\n  <div>\n    {}\n    <span>{x}</span>\n  </div>\n);\n"),
+    ('jsx-atributo',
+     "<div title={console.log('x')} />;\n",
+     None),
+    ('jsx-handler',
+     "<button onClick={() => {\n  console.log('clique');\n}} />;\n",
+     "<button onClick={() => {\n}} />;\n"),
+
+    # Não são chamadas de console
+    ('strings-e-comentarios',
+     "const s = 'console.log(1)';\n// console.log(2)\n/* console.log(3) */\n",
+     None),
+    ('membro',
+     "window.console.log('x');\nthis.console.log('y');\n",
+     None),
+]
+
+
+@pytest.mark.parametrize('source, expected', [(src, exp) for _, src, exp in CASES],
+                         ids=[case_id for case_id, _, _ in CASES])
+def test_remove_console_statements(source, expected):
+    result, _ = remove_console_statements(source)
+    assert result == (source if expected is None else expected)
+
+
+def test_counts():
+    """Removidos, mantidos e pulados são contados por tipo"""
+    source = ("try { a(); } catch (e) {\n  console.error(e);\n}\n"
+              "console.log(1);\nif (x) console.debug(2);\n")
+    _, counts = remove_console_statements(source)
+    assert dict(counts['removed']) == {'log': 1}
+    assert dict(counts['kept']) == {'error': 1}
+    assert dict(counts['skipped']) == {'debug': 1}
+
+
+def test_idempotent():
+    """Uma segunda passada não muda mais nada"""
+    for _, source, _ in CASES:
+        once, _ = remove_console_statements(source)
+        twice, _ = remove_console_statements(once)
+        assert twice == once
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Especificadores de import/export em arquivos TS/JS
+
+Extrai os módulos citados em cláusulas `from "..."` e resolve os caminhos
+locais para uma forma canônica com o alias do projeto (@/ = src/), de modo
+que `./SkeletonPro` dentro de src/components/ui e `@/components/ui/SkeletonPro`
+tenham a mesma chave.
+
+Também reconhece as referências que o bundler resolve em tempo de build:
+padrões de import.meta.glob("...") e imports dinâmicos com template literal
+(import(`./widgets/${name}`)), dos quais só o prefixo fixo é conhecido.
+"""
+
+import os
+import posixpath
+import re
+from typing import Dict, List, Optional
+
+# Alias configurado no tsconfig/vite: @/ aponta para src/
+ALIAS_PREFIX = '@/'
+
+# import ... from "x" / export ... from 'x' (grupo 1 = aspas, grupo 2 = especificador)
+FROM_SPECIFIER_RE = re.compile(r'''\bfrom\s*(["'])([^"'\n]+)\1''')
+
+# Qualquer referência a módulo: from "x", import "x", import("x"), require("x"),
+# new URL("x", import.meta.url) (workers)
+IMPORT_SPECIFIER_RE = re.compile(
+    r'''(?:\bfrom\s*|\bimport\s*\(?\s*|\brequire\s*\(\s*|\bnew\s+URL\s*\(\s*)(["'])([^"'\n]+)\1'''
+)
+
+# import.meta.glob("../pages/**/*.tsx") (grupo 2 = padrão)
+GLOB_IMPORT_RE = re.compile(r'''\bimport\.meta\.glob(?:<[^>\n]*>)?\s*\(\s*(["'])([^"'\n]+)\1''')
+
+# import(`./widgets/${name}`) (grupo 1 = prefixo fixo antes da primeira interpolação)
+TEMPLATE_IMPORT_RE = re.compile(r'''\bimport\s*\(\s*`([^`$\n]*)\$\{''')
+
+
+def is_relative(specifier: str) -> bool:
+    return specifier in ('.', '..') or specifier.startswith(('./', '../'))
+
+
+def importer_directory(filepath, src_root='src') -> str:
+    """Diretório do arquivo relativo a src/, em formato posix ('' na raiz)"""
+    rel_dir = os.path.relpath(os.path.dirname(os.path.abspath(filepath)), os.path.abspath(src_root))
+    rel_dir = rel_dir.replace(os.sep, '/')
+    return '' if rel_dir == '.' else rel_dir
+
+
+def canonical_specifier(specifier: str, importer_dir: str = '') -> Optional[str]:
+    """
+    Forma canônica (@/...) de um especificador local
+
+    Relativos são resolvidos a partir de `importer_dir` (relativo a src/).
+    Pacotes (react, lucide-react...) e caminhos que saem de src/ retornam None.
+    """
+    if specifier.startswith(ALIAS_PREFIX):
+        path = posixpath.normpath(specifier[len(ALIAS_PREFIX):])
+    elif is_relative(specifier):
+        path = posixpath.normpath(posixpath.join(importer_dir, specifier))
+    else:
+        return None
+
+    if path == '.' or path == '..' or path.startswith('../'):
+        return None
+    return ALIAS_PREFIX + path
+
+
+def extract_local_specifiers(text: str, importer_dir: str = '') -> List[str]:
+    """Especificadores locais canônicos citados no arquivo (sem repetição, em ordem)"""
+    found = {}
+    for match in IMPORT_SPECIFIER_RE.finditer(text):
+        key = canonical_specifier(match.group(2), importer_dir)
+        if key is not None:
+            found.setdefault(key, None)
+    return list(found)
+
+
+def extract_dynamic_patterns(text: str, importer_dir: str = '') -> Dict[str, List[str]]:
+    """
+    Padrões de import.meta.glob e prefixos de imports com template literal
+
+    Ambos na forma canônica (@/...). Prefixos que cobrem src/ inteiro (ex.:
+    import(`@/${path}`)) são descartados: não dizem nada sobre arquivo algum.
+
+    Returns:
+        {'globs': [...], 'templates': [...]}, só com as chaves não vazias
+    """
+    found: Dict[str, Dict[str, None]] = {'globs': {}, 'templates': {}}
+    for match in GLOB_IMPORT_RE.finditer(text):
+        key = canonical_specifier(match.group(2), importer_dir)
+        if key is not None:
+            found['globs'].setdefault(key, None)
+    for match in TEMPLATE_IMPORT_RE.finditer(text):
+        key = canonical_specifier(match.group(1), importer_dir)
+        if key is not None:
+            # "./icon-" vira "@/dir/icon-": o prefixo vale como texto, não como diretório
+            if match.group(1).endswith('/'):
+                key += '/'
+            found['templates'].setdefault(key, None)
+    return {name: list(values) for name, values in found.items() if values}
+
+
+def glob_regex(pattern: str) -> re.Pattern:
+    """Regex de um padrão do import.meta.glob (**/ casa zero ou mais diretórios, {a,b} alternativas)"""
+    parts = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith('**/', i):
+            parts.append('(?:.*/)?')
+            i += 3
+        elif pattern.startswith('**', i):
+            parts.append('.*')
+            i += 2
+        elif pattern[i] == '*':
+            parts.append('[^/]*')
+            i += 1
+        elif pattern[i] == '?':
+            parts.append('[^/]')
+            i += 1
+        elif pattern[i] == '{' and '}' in pattern[i:]:
+            end = pattern.index('}', i)
+            parts.append('(?:' + '|'.join(re.escape(alt) for alt in pattern[i + 1:end].split(',')) + ')')
+            i = end + 1
+        else:
+            parts.append(re.escape(pattern[i]))
+            i += 1
+    return re.compile(''.join(parts) + r'\Z')